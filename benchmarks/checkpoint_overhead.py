@@ -0,0 +1,183 @@
+"""Measure per-node checkpoint overhead for the scan pipeline shape.
+
+Runs a graph with the same node topology and realistic state payloads as the
+scan workflow (eight taxonomy reports, fifty sources each), with LLM-backed
+nodes replaced by stubs, so the measured time is framework plus checkpoint
+cost only. Usage::
+
+    python benchmarks/checkpoint_overhead.py --repeats 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from langgraph.checkpoint.memory import InMemorySaver  # noqa: E402
+from langgraph.graph import END, START, StateGraph  # noqa: E402
+from langgraph.types import Send  # noqa: E402
+
+from agent.checkpointing import build_sqlite_checkpointer  # noqa: E402
+from prompts.risk_taxonomy import RISK_TAXONOMY  # noqa: E402
+from schemas import State  # noqa: E402
+
+SOURCES_PER_TAXONOMY = 50
+DRAFTS = 24
+
+
+def _sources(taxonomy: str) -> list[dict[str, str]]:
+    return [
+        {
+            "title": f"{taxonomy} headline {i}",
+            "url": f"https://news.example.com/{taxonomy.lower().replace(' ', '-')}/{i}",
+            "snippet": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+            "published": "2026-02-01",
+        }
+        for i in range(SOURCES_PER_TAXONOMY)
+    ]
+
+
+def _web_search(state: dict[str, Any]) -> dict[str, Any]:
+    taxonomy = state["taxonomy"]
+    return {
+        "taxonomy_reports": [
+            {
+                "taxonomy": taxonomy,
+                "queries": [f"{taxonomy} query {i}" for i in range(5)],
+                "sources": _sources(taxonomy),
+                "brief_md": f"## {taxonomy}\n\n" + "- development [1]\n" * 10,
+                "generated_at": "2026-02-01T00:00:00+00:00",
+            }
+        ]
+    }
+
+
+def _verify(state: State) -> dict[str, Any]:
+    verified = []
+    for report in state.get("taxonomy_reports") or []:
+        sources = [{**s, "reliability": "High"} for s in report["sources"]]
+        verified.append({**report, "sources": sources, "reliable_sources": sources})
+    return {"verified_taxonomy_reports": verified}
+
+
+def _compare(state: State) -> dict[str, Any]:
+    return {
+        "event_clusters": [
+            {"title": f"Event {i}", "taxonomy": ["Geopolitical"], "summary": "s", "evidence_urls": []}
+            for i in range(12)
+        ]
+    }
+
+
+def _summarize(_state: State) -> dict[str, Any]:
+    return {
+        "draft_risks": [
+            {
+                "title": f"Risk {i}",
+                "category": ["Geopolitical"],
+                "narrative": "Narrative text [1]. " * 20,
+                "portfolio_relevance": "Medium",
+                "portfolio_relevance_rationale": "r",
+                "sources": ["1. https://news.example.com/a"],
+                "reasoning_trace": "1. **Plan**: p",
+                "audit_log": [],
+            }
+            for i in range(DRAFTS)
+        ]
+    }
+
+
+def _assess(state: dict[str, Any]) -> dict[str, Any]:
+    return {"finalized_risks": [state["risk_candidate"]]}
+
+
+def build_benchmark_graph(checkpointer: Any) -> Any:
+    builder = StateGraph(State)
+    builder.add_node("initiate_web_search", lambda _state: {"taxonomy_reports": []})
+    builder.add_node("web_search", _web_search)
+    builder.add_node("verify_sources", _verify)
+    builder.add_node("compare_events", _compare)
+    builder.add_node("summarize_events", _summarize)
+    builder.add_node("assess_portfolio_relevance", _assess)
+    builder.add_node("render_report", lambda _state: {"attempts": 1})
+
+    builder.add_edge(START, "initiate_web_search")
+    builder.add_conditional_edges(
+        "initiate_web_search",
+        lambda _state: [Send("web_search", {"taxonomy": t}) for t in RISK_TAXONOMY],
+        ["web_search"],
+    )
+    builder.add_edge("web_search", "verify_sources")
+    builder.add_edge("verify_sources", "compare_events")
+    builder.add_edge("compare_events", "summarize_events")
+    builder.add_conditional_edges(
+        "summarize_events",
+        lambda state: [
+            Send("assess_portfolio_relevance", {"risk_candidate": d})
+            for d in state.get("draft_risks") or []
+        ],
+        ["assess_portfolio_relevance"],
+    )
+    builder.add_edge("assess_portfolio_relevance", "render_report")
+    builder.add_edge("render_report", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def _time_run(graph: Any, thread_id: str) -> dict[str, float]:
+    """Return wall-clock milliseconds attributed to each node for one run."""
+    config = {"configurable": {"thread_id": thread_id}}
+    per_node: dict[str, float] = defaultdict(float)
+    last = time.perf_counter()
+    for update in graph.stream({"messages": []}, config, stream_mode="updates"):
+        now = time.perf_counter()
+        for node in update:
+            per_node[node] += (now - last) * 1000
+        last = now
+    return per_node
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        savers = {
+            "none": lambda: None,
+            "memory": InMemorySaver,
+            "sqlite": lambda: build_sqlite_checkpointer(str(Path(tmp) / "bench.sqlite")),
+        }
+        results: dict[str, dict[str, list[float]]] = {}
+        for label, factory in savers.items():
+            graph = build_benchmark_graph(factory())
+            samples: dict[str, list[float]] = defaultdict(list)
+            for i in range(args.repeats):
+                for node, ms in _time_run(graph, f"{label}-{i}").items():
+                    samples[node].append(ms)
+            results[label] = samples
+
+    nodes = list(results["none"])
+    print(f"{'node':<28}" + "".join(f"{label:>12}" for label in results) + f"{'sqlite Δ':>12}")  # noqa: T201
+    for node in nodes:
+        medians = {label: statistics.median(results[label].get(node) or [0.0]) for label in results}
+        delta = medians["sqlite"] - medians["none"]
+        print(  # noqa: T201
+            f"{node:<28}"
+            + "".join(f"{medians[label]:>10.2f}ms" for label in results)
+            + f"{delta:>10.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
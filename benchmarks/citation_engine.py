@@ -0,0 +1,141 @@
+"""Compare multi-pass citation handling with the single-pass citation engine.
+
+Builds a synthetic register of heavily cited risks and times one relevance
+round per risk (citation selection, renumbering and step counting) using the
+previous regex-per-call implementation and ``agent.tools.citation_engine``.
+Usage::
+
+    python benchmarks/citation_engine.py --risks 500 --repeats 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from agent.tools.citation_engine import ParsedRisk, count_numbered_steps  # noqa: E402
+
+
+def _legacy_indices(text: str) -> list[int]:
+    return sorted({int(m) for m in re.findall(r"\[(\d+)\]", text or "")})
+
+
+def _legacy_select(narrative: str, reasoning: str, pool: list[str]) -> list[str]:
+    indices = sorted(set(_legacy_indices(narrative) + _legacy_indices(reasoning)))
+    indexed: dict[int, str] = {}
+    fallback: list[str] = []
+    for entry in pool:
+        head, _, tail = entry.partition(".")
+        if tail and head.strip().isdigit():
+            indexed[int(head.strip())] = tail.strip()
+            fallback.append(tail.strip())
+        else:
+            fallback.append(entry.strip())
+    selected = []
+    for idx in indices:
+        if idx in indexed:
+            selected.append(f"{idx}. {indexed[idx]}")
+        elif 1 <= idx <= len(fallback):
+            selected.append(f"{idx}. {fallback[idx - 1]}")
+    return selected
+
+
+def _legacy_normalize(risk: dict[str, Any]) -> dict[str, Any]:
+    entries = []
+    for pos, entry in enumerate(risk.get("sources") or [], start=1):
+        match = re.match(r"^(\d+)\.\s*(.+)$", entry.strip())
+        if match:
+            entries.append((int(match.group(1)), match.group(2).strip()))
+        else:
+            entries.append((pos, entry.strip()))
+    old_to_new = {old: new for new, (old, _) in enumerate(entries, start=1)}
+
+    def _rewrite(text: str) -> str:
+        return re.sub(
+            r"\[(\d+)\]",
+            lambda m: f"[{old_to_new[int(m.group(1))]}]"
+            if int(m.group(1)) in old_to_new
+            else m.group(0),
+            text,
+        )
+
+    return {
+        **risk,
+        "narrative": _rewrite(risk["narrative"]),
+        "reasoning_trace": _rewrite(risk["reasoning_trace"]),
+        "sources": [f"{i}. {text}" for i, (_, text) in enumerate(entries, start=1)],
+    }
+
+
+def _legacy_round(risk: dict[str, Any]) -> int:
+    selected = _legacy_select(risk["narrative"], risk["reasoning_trace"], risk["sources"])
+    normalized = _legacy_normalize({**risk, "sources": selected})
+    steps = sum(
+        1 for line in normalized["reasoning_trace"].splitlines() if re.match(r"^\s*\d+\.\s", line)
+    )
+    return steps + len(normalized["sources"])
+
+
+def _engine_round(risk: dict[str, Any]) -> int:
+    normalized, _dangling = ParsedRisk(risk).select_and_normalize(risk["sources"])
+    return count_numbered_steps(normalized["reasoning_trace"]) + len(normalized["sources"])
+
+
+def build_register(count: int, pool_size: int = 40, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    filler = "Escalating tariffs and sanctions weigh on supply chains and credit spreads"
+    register = []
+    for i in range(count):
+        pool = [f"{n}. Source {n} - https://example{n}.com/article/{i}" for n in range(1, pool_size + 1)]
+        cites = lambda: " ".join(f"[{rng.randint(1, pool_size + 2)}]" for _ in range(3))  # noqa: E731
+        narrative = " ".join(f"{filler} {cites()}." for _ in range(12))
+        reasoning = "\n".join(f"{step}. **Step {step}**: {filler} {cites()}." for step in range(1, 7))
+        register.append(
+            {
+                "title": f"Risk {i}",
+                "narrative": narrative,
+                "reasoning_trace": reasoning,
+                "sources": pool,
+            }
+        )
+    return register
+
+
+def _time(fn: Callable[[dict[str, Any]], int], register: list[dict[str, Any]], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for risk in register:
+            fn(risk)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--risks", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    register = build_register(args.risks)
+    legacy = _time(_legacy_round, register, args.repeats)
+    engine = _time(_engine_round, register, args.repeats)
+    print(f"risks: {args.risks}, median of {args.repeats} runs")  # noqa: T201
+    print(f"{'legacy multi-pass':<20}{legacy:>10.1f} ms")  # noqa: T201
+    print(f"{'citation engine':<20}{engine:>10.1f} ms")  # noqa: T201
+    print(f"{'speedup':<20}{legacy / engine:>10.2f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
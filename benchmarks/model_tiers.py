@@ -0,0 +1,113 @@
+"""Compare latency and output agreement of the fast/balanced/strong model tiers.
+
+Replays a recorded corpus through the two mechanical steps that run on the
+fast tier by default:
+
+- routing: each ``{"query", "route"}`` line of a router decision log (see
+  ``ERF_ROUTER_LOG``) is classified by the router prompt; agreement is the
+  share of routes matching the recorded one;
+- query generation: each taxonomy gets a search query plan; agreement is
+  the mean term overlap (Jaccard) with the strong tier's plan.
+
+Needs the provider API key; every call is a live model call. Usage::
+
+    python benchmarks/model_tiers.py .router/decisions.jsonl --limit 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from agent.agents.router_agent import RouterAgent  # noqa: E402
+from agent.agents.web_search_agent import WebSearchAgent  # noqa: E402
+from agent.agents.workflow_shared import _provider_llm_factory, _today_iso_utc  # noqa: E402
+from agent.routing import read_decisions  # noqa: E402
+from models import MODEL_TIERS, LLM_PROVIDER, tier_model  # noqa: E402
+from prompts.risk_taxonomy import RISK_TAXONOMY  # noqa: E402
+
+_TERM_RE = re.compile(r"[a-z0-9]+")
+
+
+def _terms(queries: list[str]) -> set[str]:
+    return {term for query in queries for term in _TERM_RE.findall(query.lower())}
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+def _timed(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> tuple[Any, float]:
+    start = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, (time.perf_counter() - start) * 1000
+
+
+def _latency(timings: list[float]) -> str:
+    if not timings:
+        return "-"
+    p90 = sorted(timings)[int(0.9 * (len(timings) - 1))]
+    return f"{statistics.median(timings):>8.0f} / {p90:>6.0f} ms"
+
+
+def run_tier(model: str, examples: list[tuple[str, str]], taxonomies: list[str]) -> dict[str, Any]:
+    router = RouterAgent(model=model, llm_factory=_provider_llm_factory)
+    searcher = WebSearchAgent(model=model, llm_factory=_provider_llm_factory)
+    route_ms, agreed = [], 0
+    for query, route in examples:
+        predicted, ms = _timed(router._llm_route, {}, query)
+        route_ms.append(ms)
+        agreed += int(predicted == route)
+    query_ms, plans = [], {}
+    for taxonomy in taxonomies:
+        plan, ms = _timed(
+            searcher.query_agent, {}, taxonomy=taxonomy, today_iso=_today_iso_utc(), max_queries=5
+        )
+        query_ms.append(ms)
+        plans[taxonomy] = list(plan.get("queries") or [])
+    return {
+        "route_ms": route_ms,
+        "route_agreement": agreed / len(examples) if examples else None,
+        "query_ms": query_ms,
+        "plans": plans,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("decisions", help="router decision log (JSONL)")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--tiers", nargs="+", default=list(MODEL_TIERS[LLM_PROVIDER]))
+    args = parser.parse_args()
+
+    examples = read_decisions(args.decisions)[: args.limit]
+    results = {tier: run_tier(tier_model(tier), examples, RISK_TAXONOMY) for tier in args.tiers}
+    reference = results.get("strong") or results[args.tiers[-1]]
+
+    print(f"provider: {LLM_PROVIDER}, routes: {len(examples)}, taxonomies: {len(RISK_TAXONOMY)}")  # noqa: T201
+    print(f"{'tier':<10}{'model':<16}{'route median/p90':>22}{'agree':>8}{'queries median/p90':>24}{'overlap':>9}")  # noqa: T201
+    for tier, result in results.items():
+        overlap = statistics.mean(
+            _jaccard(_terms(plan), _terms(reference["plans"].get(taxonomy, [])))
+            for taxonomy, plan in result["plans"].items()
+        )
+        agreement = result["route_agreement"]
+        print(  # noqa: T201
+            f"{tier:<10}{tier_model(tier):<16}{_latency(result['route_ms']):>22}"
+            f"{'-' if agreement is None else f'{agreement:.0%}':>8}"
+            f"{_latency(result['query_ms']):>24}{overlap:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Compare prompt tokens of the verbose and compact source-block layouts.
+
+Encodes the source blocks of each scan stage (taxonomy brief, verification,
+event comparison, event-to-risk drafting) in both layouts, either from a
+recorded scan state (a JSON dump of the graph state with ``taxonomy_reports``,
+``verified_taxonomy_reports``, ``source_store`` and ``event_clusters``) or
+from a synthetic one, and reports the tokens each layout costs. Tokens are
+counted with tiktoken's ``o200k_base`` when it is available, otherwise
+estimated as characters / 4.
+
+``--live`` also runs verification and event comparison once per layout and
+reports how often the verifier's reliability labels agree and the overlap
+(Jaccard) of the cited evidence URLs; every call is a live model call.
+Usage::
+
+    python benchmarks/source_blocks.py --taxonomies 8 --sources 20
+    python benchmarks/source_blocks.py --recorded .recordings/scan_state.json --live
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from agent.tools.compare_input_formatting_tool import CompareInputFormattingTool  # noqa: E402
+from agent.tools.event_to_risk_source_tool import EventToRiskSourceTool  # noqa: E402
+from agent.tools.source_block_encoder import LAYOUTS, SourceBlockStyle  # noqa: E402
+from agent.tools.source_store_tool import report_sources  # noqa: E402
+from agent.tools.source_verification_formatting_tool import (  # noqa: E402
+    SourceVerificationFormattingTool,
+)
+from agent.tools.taxonomy_brief_formatting_tool import TaxonomyBriefFormattingTool  # noqa: E402
+
+
+def _token_counter() -> tuple[str, Callable[[str], int]]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+    except (ImportError, OSError):  # not installed, or the encoding cannot be downloaded
+        return "chars/4", lambda text: (len(text) + 3) // 4
+    return "o200k_base", lambda text: len(encoding.encode(text))
+
+
+def build_state(rng: random.Random, taxonomies: int = 8, sources: int = 20) -> dict[str, Any]:
+    sites = [("reuters.com", "Reuters"), ("ft.com", "Financial Times"), ("apnews.com", "AP News")]
+    reports, events = [], []
+    for t in range(taxonomies):
+        report_sources_ = []
+        for s in range(sources):
+            domain, site = rng.choice(sites)
+            report_sources_.append(
+                {
+                    "title": f"  Tariff escalation hits sector {t}-{s} supply chains | {site}",
+                    "url": f"https://www.{domain}/markets/2026/10/{rng.randint(1, 28):02d}/story-{t}-{s}",
+                    "published": "2026-10-17" if rng.random() < 0.7 else "",
+                    "reliability": rng.choice(["High", "Medium", ""]),
+                    "snippet": (
+                        "Oct 17, 2026 — "
+                        + "Officials said new tariffs would weigh on exporters and credit spreads. " * 8
+                        + "Read more"
+                    )
+                    if rng.random() < 0.9
+                    else "",
+                }
+            )
+        reports.append({"taxonomy": f"Taxonomy {t}", "sources": report_sources_, "reliable_sources": report_sources_})
+        events.append({"title": f"Event {t}", "evidence_urls": [s["url"] for s in report_sources_[:6]]})
+    return {
+        "taxonomy_reports": reports,
+        "verified_taxonomy_reports": reports,
+        "source_store": {},
+        "event_clusters": events,
+    }
+
+
+def stage_blocks(state: dict[str, Any], style: SourceBlockStyle) -> dict[str, list[str]]:
+    """Source blocks a scan sends per stage, in ``style``."""
+    reports = list(state.get("taxonomy_reports") or [])
+    verified = list(state.get("verified_taxonomy_reports") or reports)
+    store = state.get("source_store") or {}
+    brief_tool = TaxonomyBriefFormattingTool()
+    verify_tool = SourceVerificationFormattingTool()
+    return {
+        "brief": [
+            brief_tool.run(mode="sources_block", sources=report_sources(r, store), style=style)
+            for r in reports
+        ],
+        "verify": [verify_tool.run(sources=report_sources(r, store), style=style) for r in reports],
+        "compare": [CompareInputFormattingTool().run(reports=verified, source_store=store, style=style)],
+        "summarize": [
+            EventToRiskSourceTool().run(
+                reports=verified,
+                events=list(state.get("event_clusters") or []),
+                source_store=store,
+                style=style,
+            )["sources_block"]
+        ],
+    }
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+
+def live_quality(state: dict[str, Any]) -> dict[str, float]:
+    """Verifier label agreement and compare-events evidence overlap, compact vs verbose."""
+    from agent.agents.compare_events_agent import CompareEventsAgent
+    from agent.agents.verify_sources_agent import VerifySourcesAgent
+    from agent.agents.workflow_shared import _provider_llm_factory
+    from models import resolve_model
+
+    runs: dict[str, dict[str, Any]] = {}
+    for layout in LAYOUTS:
+        os.environ["ERF_SOURCE_BLOCK_LAYOUT"] = layout
+        verified = VerifySourcesAgent(resolve_model("verify_sources_agent"), _provider_llm_factory)(state)
+        events = CompareEventsAgent(resolve_model("compare_events_agent"), _provider_llm_factory)(
+            {**state, "verified_taxonomy_reports": verified}
+        )
+        runs[layout] = {
+            "labels": {
+                str(s.get("url")): str(s.get("reliability") or "")
+                for report in verified
+                for s in report.get("reliable_sources") or []
+            },
+            "evidence": {url for event in events for url in event.get("evidence_urls") or []},
+        }
+    verbose, compact = runs["verbose"], runs["compact"]
+    urls = set(verbose["labels"]) | set(compact["labels"])
+    agreed = sum(verbose["labels"].get(url) == compact["labels"].get(url) for url in urls)
+    return {
+        "label_agreement": agreed / len(urls) if urls else 1.0,
+        "evidence_jaccard": _jaccard(verbose["evidence"], compact["evidence"]),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--taxonomies", type=int, default=8)
+    parser.add_argument("--sources", type=int, default=20)
+    parser.add_argument("--recorded", help="JSON dump of a scan state")
+    parser.add_argument("--title-chars", type=int, default=120)
+    parser.add_argument("--snippet-chars", type=int, default=280)
+    parser.add_argument("--live", action="store_true", help="also compare model outputs (live API)")
+    args = parser.parse_args()
+
+    state = (
+        json.loads(Path(args.recorded).read_text(encoding="utf-8"))
+        if args.recorded
+        else build_state(random.Random(7), args.taxonomies, args.sources)
+    )
+    tokenizer, count = _token_counter()
+    blocks = {
+        layout: stage_blocks(state, SourceBlockStyle(layout, args.title_chars, args.snippet_chars))
+        for layout in LAYOUTS
+    }
+    print(f"tokenizer: {tokenizer}")  # noqa: T201
+    print(f"{'stage':<12}{'verbose':>10}{'compact':>10}{'saved':>8}")  # noqa: T201
+    totals = dict.fromkeys(LAYOUTS, 0)
+    for stage in blocks["verbose"]:
+        tokens = {layout: sum(map(count, blocks[layout][stage])) for layout in LAYOUTS}
+        for layout in LAYOUTS:
+            totals[layout] += tokens[layout]
+        saved = 1 - tokens["compact"] / tokens["verbose"] if tokens["verbose"] else 0.0
+        print(f"{stage:<12}{tokens['verbose']:>10}{tokens['compact']:>10}{saved:>8.0%}")  # noqa: T201
+    saved = 1 - totals["compact"] / totals["verbose"] if totals["verbose"] else 0.0
+    print(f"{'total':<12}{totals['verbose']:>10}{totals['compact']:>10}{saved:>8.0%}")  # noqa: T201
+    if args.live:
+        quality = live_quality(state)
+        print(f"verifier label agreement: {quality['label_agreement']:.0%}")  # noqa: T201
+        print(f"evidence URL overlap (Jaccard): {quality['evidence_jaccard']:.2f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
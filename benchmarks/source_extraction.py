@@ -0,0 +1,138 @@
+"""Compare the recursive source walk with the schema-aware source extractor.
+
+Times source extraction on large Responses-API messages, either recorded
+ones (JSON or JSONL files of ``{"content": ..., "additional_kwargs": ...}``
+message dicts) or synthetic ones with many cited text blocks, reasoning
+items and a long ``web_search_call`` source list. Usage::
+
+    python benchmarks/source_extraction.py --messages 200 --repeats 5
+    python benchmarks/source_extraction.py --recorded .recordings/search_responses.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT, ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from agent.tools.web_search_execution_tool import _find_sources  # noqa: E402
+
+
+def _legacy_find_sources(obj: Any) -> list[dict[str, Any]]:
+    if isinstance(obj, list):
+        out: list[dict[str, Any]] = []
+        for item in obj:
+            out.extend(_legacy_find_sources(item))
+        return out
+    if isinstance(obj, dict):
+        out = []
+        sources = obj.get("sources")
+        if isinstance(sources, list) and all(isinstance(source, dict) for source in sources):
+            out.extend(sources)
+        for value in obj.values():
+            out.extend(_legacy_find_sources(value))
+        return out
+    return []
+
+
+def _legacy_extract(message: Any) -> list[dict[str, Any]]:
+    return _legacy_find_sources(getattr(message, "content", message))
+
+
+def build_message(rng: random.Random, sources: int = 60, blocks: int = 40) -> SimpleNamespace:
+    urls = [f"https://news{n}.example.com/story/{rng.randint(0, 10**6)}" for n in range(sources)]
+    filler = "Escalating tariffs and sanctions weigh on supply chains and credit spreads. "
+    content: list[dict[str, Any]] = [
+        {
+            "type": "reasoning",
+            "id": "rs_1",
+            "summary": [{"type": "summary_text", "text": filler * 20} for _ in range(5)],
+        },
+        {
+            "type": "web_search_call",
+            "id": "ws_1",
+            "status": "completed",
+            "action": {
+                "type": "search",
+                "query": "tariffs",
+                "sources": [{"type": "url", "url": url} for url in urls],
+            },
+        },
+    ]
+    for i in range(blocks):
+        cited = rng.sample(urls, 4)
+        content.append(
+            {
+                "type": "text",
+                "id": f"msg_{i}",
+                "text": filler * 8,
+                "annotations": [
+                    {"type": "url_citation", "url": url, "title": f"Story {i}", "start_index": 0, "end_index": 10}
+                    for url in cited
+                ],
+            }
+        )
+    return SimpleNamespace(content=content, additional_kwargs={})
+
+
+def load_recorded(paths: list[str]) -> list[SimpleNamespace]:
+    messages = []
+    for path in paths:
+        text = Path(path).read_text(encoding="utf-8")
+        records = (
+            [json.loads(line) for line in text.splitlines() if line.strip()]
+            if path.endswith(".jsonl")
+            else json.loads(text)
+        )
+        for record in records if isinstance(records, list) else [records]:
+            messages.append(
+                SimpleNamespace(
+                    content=record.get("content", record),
+                    additional_kwargs=record.get("additional_kwargs") or {},
+                )
+            )
+    return messages
+
+
+def _time(fn: Callable[[Any], list[dict[str, Any]]], messages: list[Any], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for message in messages:
+            fn(message)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--recorded", nargs="*", default=[])
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    messages = load_recorded(args.recorded) or [build_message(rng) for _ in range(args.messages)]
+    legacy_urls = sum(len({s.get("url") for s in _legacy_extract(m)}) for m in messages)
+    schema_urls = sum(len({s.get("url") for s in _find_sources(m)}) for m in messages)
+    legacy = _time(_legacy_extract, messages, args.repeats)
+    schema = _time(_find_sources, messages, args.repeats)
+    print(f"messages: {len(messages)}, median of {args.repeats} runs")  # noqa: T201
+    print(f"{'recursive walk':<20}{legacy:>10.1f} ms{legacy_urls:>8} urls")  # noqa: T201
+    print(f"{'schema-aware':<20}{schema:>10.1f} ms{schema_urls:>8} urls")  # noqa: T201
+    print(f"{'speedup':<20}{legacy / schema:>10.2f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from schemas import *
 import re
+from typing import Iterator
 
 def last_human_content(messages: List[BaseMessage]) -> str:
     """
@@ -11,48 +12,83 @@ def last_human_content(messages: List[BaseMessage]) -> str:
             return cast(str, m.content)
     return ""
 
+def iter_risk_md(
+    r: RiskDraft,
+    i: int,
+    include_sources: bool = True,
+    include_signposts: bool = False,
+) -> Iterator[str]:
+    """
+    Yields the markdown lines of one risk: the shared template behind the
+    scan, update and signpost registers.
+    """
+    categories = r.get("category") or []
+    if not isinstance(categories, list):
+        categories = [categories]
+
+    yield f"## Risk {i}: {r.get('title', '')}"
+    yield f"**Categories:** {', '.join(str(c) for c in categories)}"
+    yield ""
+    yield "**Narrative**"
+    yield str(r.get("narrative") or "").strip()
+
+    # Reasoning Trace
+    if r.get("reasoning_trace"):
+        yield f"\n**Analyst Reasoning:**\n{r['reasoning_trace']}\n"
+    else:
+        yield ""
+
+    yield _format_sources_section(r.get("sources") or []) if include_sources else ""
+    if include_signposts:
+        yield format_signposts_md(r.get("signposts") or [])
+
+    # Audit Trail as a narrative blockquote
+    if r.get("audit_log"):
+        audit_text = " ".join(str(item) for item in r["audit_log"])
+        yield f"\n> **Governance History:**\n> {audit_text}\n"
+    else:
+        yield ""
+    yield ""
+    yield "---"
+    yield ""
+
+
 def format_risk_md(r: RiskDraft, i: int) -> str:
     """
     Formats a single risk draft as markdown, including audit trail and reasoning trace.
     """
-    categories = r["category"] if isinstance(r["category"], list) else [r["category"]]
-    categories_str = ", ".join(categories)
-    
-    # Format Audit Trail as a narrative blockquote
-    audit_section = ""
-    if r.get("audit_log"):
-        audit_text = " ".join(r["audit_log"])
-        audit_section += f"\n> **Governance History:**\n> {audit_text}\n"
-    
-    # Format Reasoning Trace
-    reasoning_section = ""
-    if r.get("reasoning_trace"):
-        reasoning_section += f"\n**Analyst Reasoning:**\n{r['reasoning_trace']}\n"
-
-    sources_section = _format_sources_section(r.get("sources") or [])
-
-    return "\n".join([
-        f"## Risk {i}: {r['title']}",
-        f"**Categories:** {categories_str}",
-        "",
-        "**Narrative**",
-        r["narrative"].strip(),
-        reasoning_section,
-        sources_section,
-        audit_section,
-        "",
-        "---",
-        ""
-    ])
+    return "\n".join(iter_risk_md(r, i))
+
+
+def iter_risk_register_md(
+    risks: List[RiskDraft],
+    heading: str = "# Risk Register\n",
+    include_sources: bool = True,
+    include_signposts: bool = False,
+) -> Iterator[str]:
+    """
+    Yields a register as markdown chunks: the heading, then one chunk per
+    risk, so callers can stream large registers. Joining the chunks with
+    newlines gives the full document.
+    """
+    if heading:
+        yield heading
+    for i, r in enumerate(risks, start=1):
+        yield "\n".join(
+            iter_risk_md(
+                r,
+                i,
+                include_sources=include_sources,
+                include_signposts=include_signposts,
+            )
+        )
+
 
 def format_all_risks_md(risks: List[RiskDraft]) -> str:
     """
     Formats all risk drafts as markdown.
     """
-    md = ["# Risk Register\n"]
-    for i, r in enumerate(risks, start=1):
-        md.append(format_risk_md(r, i))
-    return "\n".join(md)
+    return "\n".join(iter_risk_register_md(risks))
 
 
 def _format_sources_section(sources: List[str]) -> str:
@@ -128,55 +164,186 @@ def dedupe_risks(risks: List[RiskDraft]) -> List[RiskDraft]:
         deduped.append(risk)
     return deduped
 
-def normalize_citations_and_sources(risk: RiskDraft) -> RiskDraft:
+_SIMILARITY_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SIMILARITY_CITATION_RE = re.compile(r"\[\d+\]")
+_SIMILARITY_STOPWORDS = frozenset(
     """
-    Reindex sources contiguously and rewrite bracket citations to match.
-    This prevents mismatches like [3] referencing a source listed as 1.
-    """
-    sources = risk.get("sources") or []
-    if not sources:
-        return risk
+    a an and are as at be been but by could for from has have if in into is it its
+    may might of on or over such that the their there these this to under was were
+    which while will with would than then also more most amid after before about
+    """.split()
+)
 
-    entries = []
-    for pos, entry in enumerate(sources, start=1):
-        old_index = pos
-        text = entry
-        if isinstance(entry, str):
-            stripped = entry.strip()
-            match = re.match(r"^(\d+)\.\s*(.+)$", stripped)
-            if match:
-                old_index = int(match.group(1))
-                text = match.group(2).strip()
-            else:
-                text = stripped
-        entries.append({"old_index": old_index, "text": str(text).strip()})
-
-    if not entries:
-        return risk
 
-    old_to_new = {e["old_index"]: idx for idx, e in enumerate(entries, start=1)}
+_STEM_SUFFIXES = ("ings", "ing", "ions", "ion", "ed", "es", "s", "e")
+
+
+def _light_stem(token: str) -> str:
+    # Cheap suffix folding so "tariffs"/"tariff" and "escalating"/"escalation" match.
+    for suffix in _STEM_SUFFIXES:
+        if len(token) - len(suffix) >= 4 and token.endswith(suffix) and not token.endswith("ss"):
+            return token[: -len(suffix)]
+    return token
+
+
+def similarity_terms(text: str) -> List[str]:
+    """Stemmed, stopword-free terms of ``text`` in order, repeats included."""
+    text = _SIMILARITY_CITATION_RE.sub(" ", (text or "").lower())
+    return [
+        _light_stem(token)
+        for token in _SIMILARITY_TOKEN_RE.findall(text)
+        if token not in _SIMILARITY_STOPWORDS and len(token) >= 2
+    ]
+
+
+def _similarity_tokens(text: str) -> frozenset:
+    return frozenset(similarity_terms(text))
+
 
-    def _rewrite(text: str) -> str:
-        if not text:
-            return text
-        def repl(match: re.Match[str]) -> str:
-            idx = int(match.group(1))
-            new_idx = old_to_new.get(idx)
-            return f"[{new_idx}]" if new_idx is not None else match.group(0)
-        return re.sub(r"\[(\d+)\]", repl, text)
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
 
-    narrative = _rewrite(risk.get("narrative", ""))
-    reasoning = _rewrite(risk.get("reasoning_trace", ""))
 
-    new_sources = [f"{i}. {e['text']}" for i, e in enumerate(entries, start=1) if e["text"]]
+def _category_blocks(risk: RiskDraft) -> List[str]:
+    categories = risk.get("category")
+    if not isinstance(categories, list):
+        categories = [categories] if categories else []
+    blocks = [str(c).strip().lower() for c in categories if str(c).strip()]
+    return blocks or [""]
+
+
+def _source_text(entry: Any) -> str:
+    text = str(entry).strip()
+    match = re.match(r"^\d+\.\s*(.+)$", text)
+    return match.group(1).strip() if match else text
+
+
+def merge_risk_drafts(primary: RiskDraft, duplicate: RiskDraft) -> RiskDraft:
+    """
+    Merge a near-duplicate into the primary risk.
+    Keeps the primary's text and citations, appends the duplicate's new sources
+    after the primary's numbering and cites them in a reasoning step (so later
+    citation selection keeps them), and unions categories and audit logs.
+    """
+    sources = list(primary.get("sources") or [])
+    known = {_source_text(s) for s in sources}
+    next_index = len(sources) + 1
+    added: List[int] = []
+    for entry in duplicate.get("sources") or []:
+        text = _source_text(entry)
+        if text and text not in known:
+            known.add(text)
+            sources.append(f"{next_index}. {text}")
+            added.append(next_index)
+            next_index += 1
+
+    reasoning = str(primary.get("reasoning_trace") or "")
+    if added:
+        # Imported lazily: agent.tools imports this module.
+        from agent.tools.citation_engine import count_numbered_steps
+
+        citations = " ".join(f"[{index}]" for index in added)
+        step = (
+            f"{count_numbered_steps(reasoning) + 1}. **Merged Duplicate**: "
+            f"'{duplicate.get('title', '')}' reports the same risk {citations}."
+        )
+        reasoning = f"{reasoning}\n{step}".strip() if reasoning else step
+
+    categories = []
+    for risk in (primary, duplicate):
+        values = risk.get("category")
+        for c in values if isinstance(values, list) else [values]:
+            if c and c not in categories:
+                categories.append(c)
+
+    audit_log = list(primary.get("audit_log") or [])
+    for entry in duplicate.get("audit_log") or []:
+        if entry not in audit_log:
+            audit_log.append(entry)
+    audit_log.append(f"Merged near-duplicate draft: '{duplicate.get('title', '')}'.")
 
     return {
-        **risk,
-        "narrative": narrative,
+        **primary,
+        "category": categories[:3],
+        "sources": sources,
         "reasoning_trace": reasoning,
-        "sources": new_sources,
+        "audit_log": audit_log,
     }
 
+
+def near_dedupe_risks(
+    risks: List[RiskDraft],
+    threshold: float = 0.5,
+    title_threshold: float = 0.4,
+) -> List[RiskDraft]:
+    """
+    Collapse paraphrased duplicates that exact fingerprinting misses.
+    Risks are compared only within shared categories (blocking). A pair is a
+    duplicate when the token-set Jaccard similarity of title+narrative reaches
+    `threshold` and their titles overlap by at least `title_threshold`, so
+    distinct paths drawn from the same event (same background, different
+    title) are kept apart. Duplicates are merged into the first occurrence.
+    """
+    kept: List[RiskDraft] = []
+    signatures: List[tuple] = []
+    blocks: Dict[str, List[int]] = {}
+    for risk in risks or []:
+        title_tokens = _similarity_tokens(str(risk.get("title", "")))
+        body_tokens = title_tokens | _similarity_tokens(str(risk.get("narrative", "")))
+        risk_blocks = _category_blocks(risk)
+
+        match = None
+        candidates = sorted({i for block in risk_blocks for i in blocks.get(block, [])})
+        for i in candidates:
+            kept_title, kept_body = signatures[i]
+            if _jaccard(title_tokens, kept_title) < title_threshold:
+                continue
+            if _jaccard(body_tokens, kept_body) >= threshold:
+                match = i
+                break
+
+        if match is None:
+            for block in risk_blocks:
+                blocks.setdefault(block, []).append(len(kept))
+            kept.append(risk)
+            signatures.append((title_tokens, body_tokens))
+        else:
+            kept[match] = merge_risk_drafts(kept[match], risk)
+    return kept
+
+
+WEAK_RELEVANCE_NOTE = (
+    "Portfolio relevance remains weak after review; treat as lower priority "
+    "for this portfolio."
+)
+
+
+def append_weak_relevance_note(narrative: str) -> str:
+    """
+    Appends the weak-relevance note to a narrative once.
+    """
+    if WEAK_RELEVANCE_NOTE.lower() in narrative.lower():
+        return narrative
+    if narrative.endswith("."):
+        return f"{narrative} {WEAK_RELEVANCE_NOTE}"
+    return f"{narrative}. {WEAK_RELEVANCE_NOTE}"
+
+
+def normalize_citations_and_sources(risk: RiskDraft) -> RiskDraft:
+    """
+    Reindex sources contiguously and rewrite bracket citations to match.
+    This prevents mismatches like [3] referencing a source listed as 1.
+    """
+    if not risk.get("sources"):
+        return risk
+
+    # Imported lazily: agent.tools imports this module.
+    from agent.tools.citation_engine import normalize_risk_citations
+
+    return normalize_risk_citations(risk)
+
 def format_signposts_md(signposts: List[Signpost]) -> str:
     lines = ["**Signposts (3)**"]
     for sp in signposts:
@@ -187,21 +354,31 @@ def format_conversation(messages: List[Any]) -> str:
     """
     Formats the conversation history from messages into a string.
     """
-    conversation = "Conversation history:\n\n"
+    lines = ["Conversation history:\n\n"]
     for message in messages:
         if isinstance(message, HumanMessage):
-            conversation += f"User: {message.content}\n"
+            lines.append(f"User: {message.content}\n")
         elif isinstance(message, AIMessage):
-            conversation += f"Assistant: {message.content}\n"
-    return conversation
+            lines.append(f"Assistant: {message.content}\n")
+    return "".join(lines)
 
 
-def format_taxonomy_reports_md(reports: List[TaxonomyWebReport]) -> str:
+def format_taxonomy_reports_md(
+    reports: List[TaxonomyWebReport],
+    source_store: Optional[Dict[str, WebSearchResult]] = None,
+    max_sources: Optional[int] = None,
+) -> str:
     """
     Formats per-taxonomy web briefs as markdown, including an explicit source list.
+    Reports that reference sources by id are resolved against source_store.
+    Each list is capped at max_sources (default: the run's brief_max_sources).
     """
     if not reports:
         return ""
+    if max_sources is None:
+        from agent.configuration import current_configuration
+
+        max_sources = current_configuration().brief_max_sources
 
     chunks: List[str] = ["# Horizon Scan — Web Briefs by Taxonomy\n"]
 
@@ -216,10 +393,14 @@ def format_taxonomy_reports_md(reports: List[TaxonomyWebReport]) -> str:
             taxonomy = (r.get("taxonomy") or "").strip() or "Unknown taxonomy"
             chunks.append(f"## {taxonomy}\n\n- No brief generated.")
 
-        sources = r.get("sources") or []
+        if "source_ids" in r:
+            store = source_store or {}
+            sources = [store[sid] for sid in r.get("source_ids") or [] if sid in store]
+        else:
+            sources = r.get("sources") or []
         if sources:
             lines = ["", "**Sources**"]
-            for i, s in enumerate(sources[:20], start=1):
+            for i, s in enumerate(sources[:max_sources], start=1):
                 published = f" ({s['published']})" if s.get("published") else ""
                 title = s.get("title") or s.get("url") or "Untitled"
                 url = s.get("url") or ""
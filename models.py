@@ -1,20 +1,48 @@
+import os
 from functools import lru_cache
-from typing import Any
+from typing import Any, Mapping
 
 from langchain_openai import ChatOpenAI
 
-LLM_PROVIDER = "deepseek"  # openai or deepseek
+# openai or deepseek; a run can override it with llm_provider (agent.configuration).
+LLM_PROVIDER = os.environ.get("ERF_LLM_PROVIDER", "deepseek")
 OPENAI_MODEL = "gpt-4o-mini"
 DEEPSEEK_MODEL = "deepseek-chat"
 
 OPENAI_WEB_SEARCH_TOOL = {"type": "web_search"}
 
+# Model per tier and provider. "balanced" is the model every agent used
+# before tiering; mechanical steps (routing, query generation, source
+# verification) run on "fast". DeepSeek has a single structured-output chat
+# model, so its tiers only differ when overridden.
+MODEL_TIERS = {
+    "openai": {"fast": "gpt-4.1-nano", "balanced": OPENAI_MODEL, "strong": "gpt-4.1"},
+    "deepseek": {"fast": DEEPSEEK_MODEL, "balanced": DEEPSEEK_MODEL, "strong": DEEPSEEK_MODEL},
+}
+DEFAULT_TIER = "balanced"
 
-def _validate_provider() -> None:
-    if LLM_PROVIDER not in {"openai", "deepseek"}:
+# Keyed by registry name, or "<registry name>.<attribute>" for one of an
+# agent's BaseAgents; unlisted agents use DEFAULT_TIER.
+AGENT_MODEL_TIERS = {
+    "router_agent": "fast",
+    "web_search_agent.query_agent": "fast",
+    "web_search_agent.plan_agent": "fast",
+    "verify_sources_agent": "fast",
+}
+
+
+def _validate_provider(provider: str | None = None) -> str:
+    provider = provider or LLM_PROVIDER
+    if provider not in MODEL_TIERS:
         raise ValueError(
-            f"Unsupported LLM_PROVIDER={LLM_PROVIDER!r}. Use 'openai' or 'deepseek'."
+            f"Unsupported LLM_PROVIDER={provider!r}. Use 'openai' or 'deepseek'."
         )
+    return provider
+
+
+def provider_for_model(model: str) -> str:
+    """Provider serving ``model``; DeepSeek models are all named ``deepseek-*``."""
+    return "deepseek" if model.startswith("deepseek") else "openai"
 
 
 @lru_cache(maxsize=1)
@@ -26,3 +54,36 @@ def get_web_search_llm() -> Any:
         tool_choice="required",
         include=["web_search_call.action.sources"],
     )
+
+
+def agent_tier(key: str, overrides: Mapping[str, str] | None = None) -> str:
+    """Tier (or explicit model name) for ``key``, e.g. ``web_search_agent.query_agent``."""
+    overrides = overrides or {}
+    agent = key.split(".", 1)[0]
+    for table in (overrides, AGENT_MODEL_TIERS):
+        for candidate in (key, agent):
+            if candidate in table:
+                return table[candidate]
+    return DEFAULT_TIER
+
+
+def tier_model(
+    tier: str, overrides: Mapping[str, str] | None = None, provider: str | None = None
+) -> str:
+    """Model name for ``tier``; names that are not tiers are returned unchanged.
+
+    Precedence: ``overrides`` (run config), ``ERF_MODEL_<TIER>``, MODEL_TIERS
+    of ``provider`` (default LLM_PROVIDER).
+    """
+    tiers = MODEL_TIERS[_validate_provider(provider)]
+    if tier not in tiers:
+        return tier
+    return (overrides or {}).get(tier) or os.environ.get(f"ERF_MODEL_{tier.upper()}") or tiers[tier]
+
+
+def resolve_model(key: str, configurable: Mapping[str, Any] | None = None) -> str:
+    """Model for an agent key under the run's ``llm_provider``,
+    ``agent_model_tiers`` and ``model_tiers``."""
+    configurable = configurable or {}
+    tier = agent_tier(key, configurable.get("agent_model_tiers"))
+    return tier_model(tier, configurable.get("model_tiers"), configurable.get("llm_provider"))
@@ -1,10 +1,45 @@
 from typing import Any, Dict
 
-from agent.agents.registry import relevance_agent
+from agent.agents.registry import add_signposts_agent, relevance_agent
+from agent.configuration import current_configuration
+from agent.streaming import stream_writer
+from agent.tools.refinement_merge_tool import draft_position
+from helper_functions import iter_risk_md
 from schemas import RiskExecutionState
 
 
+def _pipeline_signposts(assessed: Dict[str, Any], state: RiskExecutionState) -> Dict[str, Any]:
+    """Signpost a risk as soon as it clears relevance and stream it on its own.
+
+    The register number is only known once every draft is assessed, so the
+    chunk is labelled with the draft number; render_report streams the final
+    numbers as ``register_index`` events.
+    """
+    signposted = add_signposts_agent.signpost(assessed, state.get("user_query", ""))
+    risk_id = state.get("risk_id", "")
+    position = draft_position(risk_id)
+    lines = list(iter_risk_md(signposted, position, include_sources=False, include_signposts=True))
+    lines[0] = f"## Draft {position}: {signposted.get('title', '')}"
+    stream_writer()(
+        {
+            "type": "markdown",
+            "stream": "signposted_risk",
+            "risk_id": risk_id,
+            "draft": position,
+            "chunk": "\n".join(lines),
+        }
+    )
+    return signposted
+
+
 def assess_portfolio_relevance_node(state: RiskExecutionState) -> Dict[str, Any]:
     """Controller node: delegate per-risk portfolio relevance assessment."""
     assessed = relevance_agent(state["risk_candidate"])
+    if state.get("risk_id"):
+        assessed = {**assessed, "risk_id": state["risk_id"]}
+    configuration = current_configuration()
+    # Refinement rewrites the narrative after this point; render_report then
+    # signposts the merged register instead.
+    if configuration.pipeline_signposts and not configuration.enable_refinement:
+        assessed = _pipeline_signposts(assessed, state)
     return {"finalized_risks": [assessed]}
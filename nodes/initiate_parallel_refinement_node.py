@@ -1,4 +1,5 @@
 ﻿from langgraph.types import Send
+from agent.tools.refinement_merge_tool import draft_risk_id
 from schemas import *
 
 def initiate_parallel_refinement(state: State):
@@ -7,5 +8,9 @@ def initiate_parallel_refinement(state: State):
     """
     drafts = state.get("draft_risks", [])
     
-    # We use Send(node_name, state_for_node)
-    return [Send("refine_single_risk", {"risk_candidate": draft}) for draft in drafts]
+    # We use Send(node_name, state_for_node); risk_id lets the join merge the
+    # refined draft with its relevance assessment.
+    return [
+        Send("refine_single_risk", {"risk_candidate": draft, "risk_id": draft_risk_id(n)})
+        for n, draft in enumerate(drafts, start=1)
+    ]
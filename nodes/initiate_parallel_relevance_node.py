@@ -1,10 +1,46 @@
 ﻿from langgraph.types import Send
+from agent.configuration import current_configuration
+from agent.tools.draft_priority_tool import DraftPriorityTool
+from agent.tools.refinement_merge_tool import draft_risk_id
+from helper_functions import last_human_content
 from schemas import State
 
+_priority_tool = DraftPriorityTool()
+
+
+def pending_relevance_positions(state: State) -> list:
+    """
+    1-based positions of drafts still awaiting relevance assessment, highest
+    priority first. With ``relevance_first_k`` set, the first wave holds only
+    the top K drafts so a partial register can be rendered early.
+    """
+    drafts = state.get("draft_risks", []) or []
+    done = {risk.get("risk_id") for risk in state.get("finalized_risks", []) or []}
+    configuration = current_configuration()
+    ordered = _priority_tool.run(
+        drafts=drafts,
+        source_store=state.get("source_store") or {},
+        taxonomy_weights=configuration.taxonomy_weights,
+    )
+    pending = [n for n in ordered if draft_risk_id(n) not in done]
+    first_k = configuration.relevance_first_k
+    if first_k > 0 and not done:
+        pending = pending[:first_k]
+    return pending
+
 
 def initiate_parallel_relevance(state: State):
     """
-    Assign each draft risk to a portfolio relevance assessment worker.
+    Assign each pending draft risk to a portfolio relevance assessment worker,
+    in priority order so that under max_concurrency the best-evidenced,
+    highest-weight drafts are assessed first.
     """
     drafts = state.get("draft_risks", []) or []
-    return [Send("assess_portfolio_relevance", {"risk_candidate": draft}) for draft in drafts]
+    user_query = last_human_content(state.get("messages", []) or [])
+    return [
+        Send(
+            "assess_portfolio_relevance",
+            {"risk_candidate": drafts[n - 1], "risk_id": draft_risk_id(n), "user_query": user_query},
+        )
+        for n in pending_relevance_positions(state)
+    ]
@@ -5,7 +5,15 @@ from schemas import State
 
 
 def initiate_parallel_web_search(state: State):
-    """Assign each risk taxonomy to a web search worker node."""
-    _ = state
-    return [Send("web_search", {"taxonomy": taxonomy}) for taxonomy in RISK_TAXONOMY]
+    """Assign each risk taxonomy to a web search worker node, with its share
+    of the global query plan when one was made."""
+    plan = state.get("web_query_plan") or {}
+    planned = plan.get("queries") or {}
+    sends = []
+    for taxonomy in RISK_TAXONOMY:
+        payload = {"taxonomy": taxonomy}
+        if taxonomy in planned:
+            payload.update(queries=planned[taxonomy], plan_id=plan.get("plan_id", ""))
+        sends.append(Send("web_search", payload))
+    return sends
 
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from agent.agents.registry import web_search_agent
+from agent.configuration import current_configuration
+from prompts.risk_taxonomy import RISK_TAXONOMY
+from schemas import State
+
+
+def plan_web_search_node(state: State) -> Dict[str, Any]:
+    """Controller node: plan all taxonomies' queries once, deduplicated across taxonomies."""
+    _ = state
+    if not current_configuration().global_query_plan:
+        return {"web_query_plan": {}}
+    return {"web_query_plan": web_search_agent.plan_queries(list(RISK_TAXONOMY))}
@@ -7,4 +7,6 @@ from schemas import RiskExecutionState
 def refine_single_risk_node(state: RiskExecutionState) -> Dict[str, Any]:
     """Controller node: delegate single-risk governance refinement loop."""
     refined = refine_risk_agent(state["risk_candidate"])
-    return {"finalized_risks": [refined]}
+    if state.get("risk_id"):
+        refined = {**refined, "risk_id": state["risk_id"]}
+    return {"refined_risks": [refined]}
@@ -1,11 +1,16 @@
+from agent.configuration import current_configuration
 from schemas import State
 
 
+def refinement_enabled() -> bool:
+    """Whether this run refines drafts alongside relevance assessment."""
+    return current_configuration().enable_refinement
+
+
 def refinement_join_router(state: State) -> str:
     """Barrier: proceed only after all draft risks have been refined."""
     drafts = state.get("draft_risks", []) or []
-    finalized = state.get("finalized_risks", []) or []
-    if drafts and len(finalized) >= len(drafts):
+    refined = state.get("refined_risks", []) or []
+    if drafts and len(refined) >= len(drafts):
         return "render_report"
     return "end"
-
@@ -1,16 +1,34 @@
+from agent.configuration import current_configuration
 from schemas import State
+from nodes.refinement_join_node import refinement_enabled, refinement_join_router
 
 
-def relevance_join_router(state: State) -> str:
-    """Barrier: proceed only after all draft risks have relevance validation."""
+def relevance_join_router(state: State):
+    """Barrier: proceed only after all draft risks have relevance validation
+    and, when refinement is enabled, have been refined as well.
+
+    In first-K mode (``relevance_first_k``) the first wave covers only the top
+    K drafts; once it lands, a partial register is rendered while the
+    remaining drafts are assessed."""
     drafts = state.get("draft_risks", []) or []
     finalized = state.get("finalized_risks", []) or []
-    if drafts and len(finalized) >= len(drafts):
-        return "render_report"
-    return "end"
+    if not drafts:
+        return "end"
+    if len(finalized) < len(drafts):
+        if finalized and current_configuration().relevance_first_k > 0:
+            return ["render_partial_report", "initiate_relevance"]
+        return "end"
+    if refinement_enabled():
+        return refinement_join_router(state)
+    return "render_report"
 
 
-def relevance_router(state: State) -> str:
-    """Route to relevance assessment if drafts exist, else render directly."""
+def relevance_router(state: State):
+    """Route drafts to relevance assessment (and refinement, when enabled, in
+    parallel), else render directly."""
     drafts = state.get("draft_risks", []) or []
-    return "initiate_relevance" if drafts else "render_report"
+    if not drafts:
+        return "render_report"
+    if refinement_enabled():
+        return ["initiate_relevance", "initiate_refinement"]
+    return "initiate_relevance"
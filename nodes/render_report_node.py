@@ -1,10 +1,43 @@
 from langchain_core.messages import AIMessage
 
-from agent.agents.registry import render_report_agent
+from agent.agents.registry import add_signposts_agent, render_report_agent
+from agent.configuration import current_configuration
+from agent.streaming import stream_writer
 from schemas import State
 
 
+def _stream_register_indices(risks):
+    """Tell clients which register number each pipelined draft ended up with."""
+    writer = stream_writer()
+    for index, risk in enumerate(risks, start=1):
+        if risk.get("risk_id"):
+            writer(
+                {
+                    "type": "register_index",
+                    "stream": "signposted_risk",
+                    "risk_id": risk["risk_id"],
+                    "index": index,
+                }
+            )
+
+
 def render_report_node(state: State):
-    """Controller node: delegate markdown rendering of final risk register."""
-    final_md = render_report_agent(state)
-    return {"messages": [AIMessage(content=final_md)]}
+    """Controller node: render the final risk register and make it the current register."""
+    risks = render_report_agent.final_risks(state)
+    configuration = current_configuration()
+    if configuration.pipeline_signposts and risks:
+        if configuration.enable_refinement:
+            # Signposts must follow the refined narrative, so they wait for the merge.
+            risks = add_signposts_agent(
+                {"risk": {"risks": risks}, "messages": state.get("messages", [])}
+            )["risk"]["risks"]
+        else:
+            _stream_register_indices(risks)
+    final_md = render_report_agent.render(risks)
+    return {"messages": [AIMessage(content=final_md)], "risk": {"risks": risks}}
+
+
+def render_partial_report_node(state: State):
+    """Controller node: stream the register of risks assessed so far (first-K mode)."""
+    render_report_agent(state, stream_name="partial_register")
+    return {}
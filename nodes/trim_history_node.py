@@ -0,0 +1,14 @@
+from typing import Any, Dict
+
+from agent.configuration import current_configuration
+from agent.history import plan_history_update
+from schemas import State
+
+
+def trim_history_node(state: State) -> Dict[str, Any]:
+    """Bound message history: summarize old turns and drop superseded registers."""
+    return plan_history_update(
+        list(state.get("messages", []) or []),
+        state.get("conversation_summary", "") or "",
+        current_configuration().history_turns,
+    )
@@ -3,10 +3,12 @@ from __future__ import annotations
 from typing import Any, Dict
 
 from agent.agents.registry import verify_sources_agent
+from agent.tools.source_store_tool import compact_reports
 from schemas import State
 
 
 def verify_sources_node(state: State) -> Dict[str, Any]:
     """Controller node: delegate source reliability verification."""
     verified_reports = verify_sources_agent(state)
-    return {"verified_taxonomy_reports": verified_reports}
+    reports, store = compact_reports(verified_reports)
+    return {"verified_taxonomy_reports": reports, "source_store": store}
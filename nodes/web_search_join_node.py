@@ -1,7 +1,14 @@
+from agent.agents.registry import web_search_agent
 from prompts.risk_taxonomy import RISK_TAXONOMY
 from schemas import State
 
 
+def web_search_join_node(state: State):
+    """Fan-in: the taxonomy workers are done, so their shared search results can go."""
+    web_search_agent.release_plan(str((state.get("web_query_plan") or {}).get("plan_id") or ""))
+    return {}
+
+
 def web_search_join_router(state: State) -> str:
     """Barrier: proceed only after all taxonomy reports are present."""
     expected = len(RISK_TAXONOMY)
@@ -5,7 +5,57 @@
     SIGNPOST_GENERATOR_USER_MESSAGE,
 )
 
+_OUTPUT_REQUIREMENTS_HEADER = (
+    "--------------------------------------------------------------------\n"
+    "OUTPUT REQUIREMENTS (STRICT)"
+)
+
+SIGNPOST_BATCH_OUTPUT_FORMAT = """
+--------------------------------------------------------------------
+OUTPUT REQUIREMENTS (STRICT) — SEVERAL RISKS PER CALL
+--------------------------------------------------------------------
+You will receive several numbered risks. Design signposts for EACH risk
+independently, applying every rule above to each risk on its own.
+
+Return ONLY a structured object with EXACTLY one key:
+
+• "packs": a list with one object per risk, each containing EXACTLY:
+  - "risk_index": the number of the risk as shown in the input
+  - "signposts": a list of EXACTLY 3 objects, each with
+    "description" (string) and "status" ("Low" | "Rising" | "Elevated")
+
+Do NOT output any other text.
+""".strip()
+
+# The single-risk generator instructions with a multi-risk output contract,
+# so a batch of risks shares one system prompt and one call.
+SIGNPOST_BATCH_GENERATOR_SYSTEM_MESSAGE = (
+    SIGNPOST_GENERATOR_SYSTEM_MESSAGE.split(_OUTPUT_REQUIREMENTS_HEADER, 1)[0].rstrip()
+    + "\n\n"
+    + SIGNPOST_BATCH_OUTPUT_FORMAT
+)
+
+SIGNPOST_BATCH_GENERATOR_USER_MESSAGE = """
+You are generating signposts for SEVERAL finalised emerging risks. Each has
+already passed narrative-level governance review; do NOT modify any of them.
+
+--------------------------------------------------------------------
+FINAL APPROVED RISKS (NUMBERED)
+--------------------------------------------------------------------
+{risks}
+
+--------------------------------------------------------------------
+USER CONTEXT (OPTIONAL; MAY BE EMPTY)
+--------------------------------------------------------------------
+{user_context}
+
+Use the context only where relevant to a given risk.
+Return one pack of EXACTLY 3 signposts per numbered risk.
+""".strip()
+
 __all__ = [
+    "SIGNPOST_BATCH_GENERATOR_SYSTEM_MESSAGE",
+    "SIGNPOST_BATCH_GENERATOR_USER_MESSAGE",
     "SIGNPOST_GENERATOR_SYSTEM_MESSAGE",
     "SIGNPOST_GENERATOR_USER_MESSAGE",
     "SIGNPOST_EVALUATOR_SYSTEM_MESSAGE",
@@ -1,3 +1,50 @@
 ﻿from prompts._legacy_messages import RISK_UPDATER_SYSTEM_MESSAGE
 
-__all__ = ["RISK_UPDATER_SYSTEM_MESSAGE"]
+_OUTPUT_FORMAT_HEADER = (
+    "--------------------------------------------------------------------\n"
+    "OUTPUT FORMAT (STRICT)"
+)
+
+RISK_PATCH_OUTPUT_FORMAT = """
+--------------------------------------------------------------------
+OUTPUT FORMAT (STRICT) — PATCH OPERATIONS
+--------------------------------------------------------------------
+Each existing risk has an id (R1, R2, ...). Do NOT return the full register.
+Return a structured object with EXACTLY TWO keys:
+
+1) "operations"
+• A list of patch operations, ONLY for risks that actually change:
+  - {{"op": "modify", "risk_id": "R3", "fields": {{...only the changed fields...}}, "reason": "..."}}
+  - {{"op": "add", "risk_id": "", "fields": {{title, category, narrative, portfolio_relevance, portfolio_relevance_rationale, sources}}, "reason": "..."}}
+  - {{"op": "remove", "risk_id": "R5", "fields": {{}}, "reason": "..."}}
+• Risks you do not mention are kept exactly as they are.
+• When changing "sources", return the risk's full new source list and keep
+  the narrative's [n] citations consistent with it.
+• An empty list is valid when nothing warrants a change.
+
+2) "change_log"
+• Concise bullet points describing what changed and why
+• Bullets should be factual and governance-oriented
+
+Do NOT include:
+• unchanged fields or unchanged risks
+• additional commentary or extra keys
+
+--------------------------------------------------------------------
+QUALITY CONSTRAINTS
+--------------------------------------------------------------------
+• Neutral, institutional tone
+• No alarmism or speculative language
+• No false precision
+• Suitable for senior risk governance and oversight
+""".strip()
+
+# Same instructions as the full updater, with the output contract replaced by
+# patch operations so output size follows the size of the change.
+RISK_PATCH_SYSTEM_MESSAGE = (
+    RISK_UPDATER_SYSTEM_MESSAGE.split(_OUTPUT_FORMAT_HEADER, 1)[0].rstrip()
+    + "\n\n"
+    + RISK_PATCH_OUTPUT_FORMAT
+)
+
+__all__ = ["RISK_UPDATER_SYSTEM_MESSAGE", "RISK_PATCH_SYSTEM_MESSAGE"]
@@ -1,8 +1,7 @@
-from typing import Annotated, TypedDict, List, Dict, Any, Optional, Literal, cast
+from typing import Annotated, TypedDict, List, Dict, Any, Optional, Literal, NotRequired, cast
 from pydantic import Field
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, BaseMessage
 from langgraph.graph.message import add_messages
-import operator
 
 class RouterOutput(TypedDict):
     user_query_type: Literal["scan", "update", "qna"] = Field(
@@ -49,6 +48,34 @@ class RiskUpdateOutput(TypedDict):
     risks: List[RiskDraft] = Field(description="Updated risk register")
     change_log: List[str] = Field(description="Bullet list describing what changed and why")
 
+class RiskFieldUpdate(TypedDict, total=False):
+    title: str = Field(description="New title")
+    category: List[str] = Field(description="New list of 1 to 3 taxonomy categories")
+    narrative: str = Field(description="New full narrative")
+    portfolio_relevance: Literal["High", "Medium", "Low"] = Field(
+        description="New portfolio relevance rating"
+    )
+    portfolio_relevance_rationale: str = Field(description="New relevance rationale")
+    sources: List[str] = Field(
+        description="New full source list, prefixed with citation index (e.g., '1. https://...')"
+    )
+
+class RiskPatchOperation(TypedDict):
+    op: Literal["add", "modify", "remove"] = Field(description="Patch operation")
+    risk_id: str = Field(
+        description="Id of the existing risk (e.g. 'R3') for modify/remove; empty for add"
+    )
+    fields: RiskFieldUpdate = Field(
+        description="modify: only the changed fields; add: every field of the new risk; remove: empty"
+    )
+    reason: str = Field(description="Why this change is warranted")
+
+class RiskPatchOutput(TypedDict):
+    operations: List[RiskPatchOperation] = Field(
+        description="Operations to apply to the existing register; empty if nothing changes"
+    )
+    change_log: List[str] = Field(description="Bullet list describing what changed and why")
+
 class Signpost(TypedDict):
     description: str = Field(description="Observable, monitorable indicator")
     status: Literal["Low", "Rising", "Elevated"] = Field(description="Low/Rising/Elevated")
@@ -56,6 +83,13 @@ class Signpost(TypedDict):
 class SignpostPack(TypedDict):
     signposts: List[Signpost] = Field(description="Exactly 3 signposts with status")
 
+class SignpostBatchItem(TypedDict):
+    risk_index: int = Field(description="Number of the risk in the batch input")
+    signposts: List[Signpost] = Field(description="Exactly 3 signposts with status")
+
+class SignpostBatchOutput(TypedDict):
+    packs: List[SignpostBatchItem] = Field(description="One signpost pack per input risk")
+
 class SignpostEvalOutput(TypedDict):
     satisfied_with_signposts: bool = Field(description="Whether signposts are acceptable")
     feedback: str = Field(description="Actionable feedback if not acceptable")
@@ -74,6 +108,15 @@ class WebQueryPlan(TypedDict):
     queries: List[str] = Field(description="List of web search queries to run")
 
 
+class TaxonomyQueryPlan(TypedDict):
+    taxonomy: str = Field(description="Risk taxonomy category, exactly as given")
+    queries: List[str] = Field(description="Web search queries for this taxonomy")
+
+
+class GlobalQueryPlan(TypedDict):
+    plans: List[TaxonomyQueryPlan] = Field(description="One query plan per taxonomy")
+
+
 class WebBriefOutput(TypedDict):
     brief_md: str = Field(description="Markdown brief for a taxonomy")
 
@@ -99,6 +142,9 @@ class WebSearchResult(WebSearchResultBase, total=False):
     source_type: str = Field(
         description="Source type such as official, major newsroom, trade press, think tank, blog, aggregator"
     )
+    taxonomies: List[str] = Field(
+        description="Taxonomies whose searches surfaced this source"
+    )
 
 
 class SourceReliability(TypedDict):
@@ -134,16 +180,85 @@ class EventRiskDraftOutput(TypedDict):
 class TaxonomyWebReportBase(TypedDict):
     taxonomy: str = Field(description="Risk taxonomy category")
     queries: List[str] = Field(description="Queries executed for this taxonomy")
-    sources: List[WebSearchResult] = Field(description="Flattened list of search results used")
     brief_md: str = Field(description="Markdown brief summarizing what is happening now")
     generated_at: str = Field(description="ISO timestamp when generated")
 
 
 class TaxonomyWebReport(TaxonomyWebReportBase, total=False):
+    # Reports stored in State reference sources by id (see State.source_store);
+    # the inline lists are only used transiently inside agents.
+    source_ids: List[str] = Field(description="Ids of sources in State.source_store")
+    reliable_source_ids: List[str] = Field(
+        description="Subset of source_ids deemed reliable; omitted when identical"
+    )
+    sources: List[WebSearchResult] = Field(description="Flattened list of search results used")
     reliable_sources: List[WebSearchResult] = Field(
         description="Subset of sources deemed reliable"
     )
     verification_notes: str = Field(description="Brief verification summary")
+    search_stats: Dict[str, Any] = Field(
+        description="Adaptive search accounting (queries run, novelty per query)"
+    )
+
+
+def merge_source_store(
+    left: Optional[Dict[str, WebSearchResult]],
+    right: Optional[Dict[str, WebSearchResult]],
+) -> Dict[str, WebSearchResult]:
+    """
+    Reducer for State.source_store: field-level merge keyed by source id
+    (the canonical URL). Parallel branches contribute entries; later writers
+    (e.g. verification) add fields to existing entries, and taxonomy
+    memberships are unioned. Writing None resets the store.
+    """
+    if right is None:
+        return {}
+    if not left:
+        return dict(right)
+    merged = dict(left)
+    for source_id, entry in right.items():
+        existing = merged.get(source_id)
+        if not existing:
+            merged[source_id] = entry
+            continue
+        combined = {**existing, **entry}
+        if existing.get("taxonomies") or entry.get("taxonomies"):
+            combined["taxonomies"] = list(
+                dict.fromkeys([*(existing.get("taxonomies") or []), *(entry.get("taxonomies") or [])])
+            )
+        merged[source_id] = combined
+    return merged
+
+
+def append_or_reset(left: Optional[List[Any]], right: Optional[List[Any]]) -> List[Any]:
+    """Reducer that appends like operator.add; writing None resets the list."""
+    if right is None:
+        return []
+    return [*(left or []), *right]
+
+
+def merge_draft_results(
+    left: Optional[List[RiskDraft]],
+    right: Optional[List[RiskDraft]],
+) -> List[RiskDraft]:
+    """
+    Reducer for per-draft worker results: appends like operator.add, but a
+    result whose risk_id is already present is skipped, so a subgraph that
+    hands back results from an earlier wave does not duplicate them.
+    Writing None resets the list.
+    """
+    if right is None:
+        return []
+    merged = list(left or [])
+    seen = {risk.get("risk_id") for risk in merged if risk.get("risk_id")}
+    for risk in right:
+        risk_id = risk.get("risk_id")
+        if risk_id and risk_id in seen:
+            continue
+        if risk_id:
+            seen.add(risk_id)
+        merged.append(risk)
+    return merged
 
 
 class State(TypedDict, total=False):
@@ -153,22 +268,47 @@ class State(TypedDict, total=False):
     # Drafts (input) vs finalized (output)
     draft_risks: List[RiskDraft]
 
-    # operator.add ensures that when parallel nodes return a list,
-    # they are appended to this master list rather than overwriting it.
-    finalized_risks: Annotated[List[RiskDraft], operator.add]
+    # The reducer ensures that when parallel nodes return a list, it is
+    # appended to this master list rather than overwriting it.
+    finalized_risks: Annotated[List[RiskDraft], merge_draft_results]
+    # Governance-refined drafts, merged into finalized_risks by risk_id.
+    refined_risks: Annotated[List[RiskDraft], merge_draft_results]
 
     # Parallel web research (one report per taxonomy)
-    taxonomy_reports: Annotated[List[TaxonomyWebReport], operator.add]
+    taxonomy_reports: Annotated[List[TaxonomyWebReport], append_or_reset]
     verified_taxonomy_reports: List[TaxonomyWebReport]
+    # Each unique source is stored once; reports reference it by id.
+    source_store: Annotated[Dict[str, WebSearchResult], merge_source_store]
+    # Shared query plan for the web search fan-out (see plan_web_search_node).
+    web_query_plan: Dict[str, Any]
     event_clusters: List[EventCluster]
 
     messages: Annotated[List[BaseMessage], add_messages]
+    # Rolling summary of turns trimmed out of messages (see agent.history).
+    conversation_summary: str
     attempts: int
 
+# Outputs of the relevance and refinement subgraphs. They run in the same
+# superstep, so each hands back only the key it owns.
+class RelevanceSubgraphOutput(TypedDict):
+    finalized_risks: Annotated[List[RiskDraft], merge_draft_results]
+
+
+class RefinementSubgraphOutput(TypedDict):
+    refined_risks: Annotated[List[RiskDraft], merge_draft_results]
+
+
 # This is the "Sub-State" passed to each parallel worker
 class RiskExecutionState(TypedDict):
     risk_candidate: RiskDraft
+    risk_id: NotRequired[str]
+    # Latest user request, for signposting inside the worker (pipeline mode).
+    user_query: NotRequired[str]
 
 
 class TaxonomyExecutionState(TypedDict):
     taxonomy: str
+    # Planned queries (already deduplicated across taxonomies) and the id of
+    # the plan whose searches the workers share.
+    queries: NotRequired[List[str]]
+    plan_id: NotRequired[str]
@@ -1,22 +1,28 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
+
+from langchain_core.runnables.config import ContextThreadPoolExecutor
 
 from agent.agents.base_agent import BaseAgent
 from agent.agents.workflow_shared import _single_user_message_builder, _today_long
+from agent.configuration import current_configuration
+from agent.streaming import MarkdownStream
 from agent.tools.conversation_context_tool import ConversationContextTool
 from agent.tools.signposts import SignpostAssemblyTool
-from helper_functions import format_signposts_md
+from helper_functions import iter_risk_md
 from prompts.portfolio_allocation import PORTFOLIO_ALLOCATION
 from prompts.risk_taxonomy import RISK_TAXONOMY
 from prompts.signpost_prompts import (
+    SIGNPOST_BATCH_GENERATOR_SYSTEM_MESSAGE,
+    SIGNPOST_BATCH_GENERATOR_USER_MESSAGE,
     SIGNPOST_EVALUATOR_SYSTEM_MESSAGE,
     SIGNPOST_EVALUATOR_USER_MESSAGE,
     SIGNPOST_GENERATOR_SYSTEM_MESSAGE,
     SIGNPOST_GENERATOR_USER_MESSAGE,
 )
 from prompts.source_guide import SOURCE_GUIDE
-from schemas import SignpostEvalOutput, SignpostPack
+from schemas import SignpostBatchOutput, SignpostEvalOutput, SignpostPack
 
 
 class AddSignpostsAgent:
@@ -37,6 +43,20 @@ class AddSignpostsAgent:
             llm_factory=llm_factory,
             message_builder=_single_user_message_builder(SIGNPOST_GENERATOR_USER_MESSAGE),
         )
+        self.batch_generator = BaseAgent(
+            model=model,
+            skills=[self.assembly_tool],
+            output_format=SignpostBatchOutput,
+            system_template=SIGNPOST_BATCH_GENERATOR_SYSTEM_MESSAGE,
+            static_context={
+                "taxonomy": RISK_TAXONOMY,
+                "PORTFOLIO_ALLOCATION": PORTFOLIO_ALLOCATION,
+                "SOURCE_GUIDE": SOURCE_GUIDE,
+            },
+            today_provider=_today_long,
+            llm_factory=llm_factory,
+            message_builder=_single_user_message_builder(SIGNPOST_BATCH_GENERATOR_USER_MESSAGE),
+        )
         self.evaluator = BaseAgent(
             model=model,
             skills=[self.assembly_tool],
@@ -51,6 +71,89 @@ class AddSignpostsAgent:
             message_builder=_single_user_message_builder(SIGNPOST_EVALUATOR_USER_MESSAGE),
         )
 
+    def _generate_batch(
+        self, risks: list[dict[str, Any]], users_query: str
+    ) -> list[dict[str, Any] | None]:
+        """One generator call for several risks; risks it skips get ``None``."""
+        out = self.batch_generator(
+            {},
+            risks="\n\n".join(f"[{n}] {risk}" for n, risk in enumerate(risks, start=1)),
+            user_context=users_query,
+        )
+        packs: list[dict[str, Any] | None] = [None] * len(risks)
+        for item in out.get("packs") or []:
+            index = item.get("risk_index")
+            if isinstance(index, int) and 1 <= index <= len(risks) and item.get("signposts"):
+                packs[index - 1] = {"signposts": item["signposts"]}
+        return packs
+
+    def _signpost_risk(
+        self,
+        risk: dict[str, Any],
+        users_query: str,
+        current_pack: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        max_rounds_per_risk = max(1, current_configuration().signpost_max_rounds)
+        for _round in range(1, max_rounds_per_risk + 1):
+            if current_pack is None:
+                current_pack = self.generator(
+                    {},
+                    risk=risk,
+                    user_context=users_query,
+                    prior_signposts=current_pack,
+                    feedback=None,
+                )
+            eval_out = self.evaluator(
+                {},
+                taxonomy=RISK_TAXONOMY,
+                risk=risk,
+                signposts=current_pack,
+            )
+            if eval_out.get("satisfied_with_signposts"):
+                break
+            current_pack = self.generator(
+                {},
+                risk=risk,
+                user_context=users_query,
+                prior_signposts=current_pack,
+                feedback=eval_out.get("feedback"),
+            )
+
+        return self.assembly_tool.run(
+            risk=risk,
+            signposts=(current_pack or {}).get("signposts") or [],
+        )
+
+    def signpost(self, risk: dict[str, Any], users_query: str = "") -> dict[str, Any]:
+        """Signpost a single risk, e.g. as soon as it clears relevance assessment."""
+        return self._signpost_risk(risk, users_query)
+
+    def _signposted_risks(
+        self,
+        risks: list[dict[str, Any]],
+        users_query: str,
+        max_workers: int,
+        batch_size: int,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield signposted risks in register order while later ones still run."""
+        if max_workers <= 1 and batch_size <= 1:
+            for risk in risks:
+                yield self._signpost_risk(risk, users_query)
+            return
+
+        with ContextThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+            packs: list[dict[str, Any] | None] = [None] * len(risks)
+            if batch_size > 1:
+                batches = [risks[i : i + batch_size] for i in range(0, len(risks), batch_size)]
+                results = pool.map(lambda batch: self._generate_batch(batch, users_query), batches)
+                packs = [pack for batch_packs in results for pack in batch_packs]
+            # ``map`` yields in submission order, so the join keeps risk order.
+            yield from pool.map(
+                lambda risk, pack: self._signpost_risk(risk, users_query, pack),
+                risks,
+                packs,
+            )
+
     def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
         risk_register = state.get("risk") or {}
         risks = list(risk_register.get("risks") or [])
@@ -60,66 +163,30 @@ class AddSignpostsAgent:
                 "message": "No finalized risks found. Run scan/refine first.",
             }
 
-        user_context = self.context_tool.run(messages=state.get("messages", []) or [])
+        user_context = self.context_tool.run(
+            mode="last_query", messages=state.get("messages", []) or []
+        )
         users_query = user_context.get("last_user_query", "")
+        configuration = current_configuration()
         final_risks: list[dict[str, Any]] = []
-        max_rounds_per_risk = 1
+        # Each risk is emitted as soon as it and every risk before it are settled.
+        stream = MarkdownStream("signposted_register")
+        stream.write("# Final Risk Register (with Signposts)\n")
 
-        for risk in risks:
-            current_pack: dict[str, Any] | None = None
-            for _round in range(1, max_rounds_per_risk + 1):
-                if current_pack is None:
-                    current_pack = self.generator(
-                        {},
-                        risk=risk,
-                        user_context=users_query,
-                        prior_signposts=current_pack,
-                        feedback=None,
-                    )
-                eval_out = self.evaluator(
-                    {},
-                    taxonomy=RISK_TAXONOMY,
-                    risk=risk,
-                    signposts=current_pack,
-                )
-                if eval_out.get("satisfied_with_signposts"):
-                    break
-                current_pack = self.generator(
-                    {},
-                    risk=risk,
-                    user_context=users_query,
-                    prior_signposts=current_pack,
-                    feedback=eval_out.get("feedback"),
-                )
-
-            final_risk = self.assembly_tool.run(
-                risk=risk,
-                signposts=(current_pack or {}).get("signposts") or [],
-            )
+        signposted = self._signposted_risks(
+            risks,
+            users_query,
+            max_workers=configuration.signpost_max_workers,
+            batch_size=configuration.signpost_batch_size,
+        )
+        for i, final_risk in enumerate(signposted, start=1):
             final_risks.append(final_risk)
+            risk_md = iter_risk_md(
+                final_risk,
+                i,
+                include_sources=False,
+                include_signposts=True,
+            )
+            stream.write("\n".join(risk_md))
 
-        markdown = ["# Final Risk Register (with Signposts)", ""]
-        for i, risk in enumerate(final_risks, start=1):
-            categories = risk.get("category") or []
-            if not isinstance(categories, list):
-                categories = [categories]
-            markdown.append(f"## Risk {i}: {risk.get('title', '')}")
-            markdown.append(f"**Categories:** {', '.join(str(c) for c in categories)}")
-            markdown.append("")
-            markdown.append("**Narrative**")
-            markdown.append(str(risk.get("narrative") or "").strip())
-            markdown.append("")
-            if risk.get("reasoning_trace"):
-                markdown.append(f"_**Analyst Reasoning:** {risk['reasoning_trace']}_")
-                markdown.append("")
-            markdown.append(format_signposts_md(risk.get("signposts") or []))
-            if risk.get("audit_log"):
-                log_text = " ".join(str(item) for item in risk["audit_log"])
-                markdown.append("")
-                markdown.append("> **Governance History:**")
-                markdown.append(f"> {log_text}")
-            markdown.append("")
-            markdown.append("---")
-            markdown.append("")
-
-        return {"risk": {"risks": final_risks}, "message": "\n".join(markdown).strip()}
+        return {"risk": {"risks": final_risks}, "message": stream.text().strip()}
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import json
+import logging
+import threading
+from dataclasses import asdict
 from string import Formatter
-from typing import Any, Callable, Mapping, Sequence
+from typing import Any, Callable, Iterator, Mapping, Sequence, get_origin, get_type_hints
 
 from langchain_deepseek import ChatDeepSeek
 from langchain_core.messages import BaseMessage, SystemMessage
 
+from agent.configuration import current_configuration
+from agent.streaming import stream_writer
+from models import resolve_model
 from schemas import State
 
+logger = logging.getLogger(__name__)
+
 LLMFactory = Callable[[str], Any]
 MessageBuilder = Callable[
     [str, Mapping[str, Any], Mapping[str, Any]],
@@ -24,6 +33,71 @@ def _default_message_builder(
     return [SystemMessage(content=system_prompt), *history]
 
 
+def is_valid_structured_output(output_format: Any, value: Any) -> bool:
+    """Check a (possibly streamed) structured result against ``output_format``.
+
+    Pydantic models are validated fully; TypedDict schemas are checked for
+    their required keys and the container type of each top-level field.
+    """
+    if value is None:
+        return False
+    validate = getattr(output_format, "model_validate", None)
+    if validate is not None:
+        try:
+            validate(value)
+        except ValueError:
+            return False
+        return True
+    required = getattr(output_format, "__required_keys__", None)
+    if required is None:
+        return True
+    if not isinstance(value, Mapping) or not required <= value.keys():
+        return False
+    try:
+        hints = get_type_hints(output_format)
+    except (NameError, TypeError):
+        return True
+    for key, hint in hints.items():
+        if key not in value:
+            continue
+        expected = get_origin(hint) or hint
+        if expected in (str, list, dict, bool) and not isinstance(value[key], expected):
+            return False
+    return True
+
+
+def _field_types(output_format: Any) -> dict[str, Any]:
+    fields = getattr(output_format, "model_fields", None)
+    if fields is not None:
+        return {name: field.annotation for name, field in fields.items()}
+    try:
+        return get_type_hints(output_format)
+    except (NameError, TypeError):
+        return {}
+
+
+def repair_structured_output(output_format: Any, value: Any) -> Any:
+    """Best-effort fix of a streamed result that failed validation.
+
+    Models sometimes send a list or object argument as a JSON-encoded string;
+    such fields are decoded. Returns the repaired value when it validates,
+    otherwise ``None``.
+    """
+    if not isinstance(value, Mapping):
+        return None
+    repaired = dict(value)
+    for key, hint in _field_types(output_format).items():
+        field = repaired.get(key)
+        if isinstance(field, str) and (get_origin(hint) or hint) in (list, dict):
+            try:
+                repaired[key] = json.loads(field)
+            except ValueError:
+                continue
+    if repaired != value and is_valid_structured_output(output_format, repaired):
+        return repaired
+    return None
+
+
 class BaseAgent:
     """Reusable LLM-backed agent with tool binding and structured output."""
 
@@ -51,6 +125,36 @@ class BaseAgent:
         self.agent_executor = self.llm.bind_tools(self.skills).with_structured_output(
             self.output_format
         )
+        # Set by assign_model_key; when empty the agent always uses self.model.
+        self.model_key = ""
+        self._executors: dict[str, Any] = {self.model: self.agent_executor}
+        self._executors_lock = threading.Lock()
+
+    def assign_model_key(self, key: str) -> None:
+        """Resolve this agent's model from its tier key (see ``models.AGENT_MODEL_TIERS``).
+
+        The run config can then move it to another tier or model per run via
+        ``agent_model_tiers`` and ``model_tiers``.
+        """
+        self.model_key = key
+        self.model = resolve_model(key)
+
+    def _executor_for(self, model: str) -> Any:
+        with self._executors_lock:
+            executor = self._executors.get(model)
+            if executor is None:
+                executor = (
+                    self.llm_factory(model)
+                    .bind_tools(self.skills)
+                    .with_structured_output(self.output_format)
+                )
+                self._executors[model] = executor
+            return executor
+
+    def _current_executor(self) -> Any:
+        if not self.model_key:
+            return self.agent_executor
+        return self._executor_for(resolve_model(self.model_key, asdict(current_configuration())))
 
     @staticmethod
     def _default_llm_factory(model: str) -> ChatDeepSeek:
@@ -74,10 +178,64 @@ class BaseAgent:
                 f"{missing_str}"
             )
 
-    def __call__(self, state: State | Mapping[str, Any], **runtime_context: Any) -> Any:
+    def _build_messages(
+        self,
+        state: State | Mapping[str, Any] | None,
+        runtime_context: Mapping[str, Any],
+    ) -> list[BaseMessage]:
         state_copy = dict(state or {})
         merged_context = {**self.static_context, **runtime_context}
         merged_context.setdefault("today", self.today_provider())
         system_prompt = self.system_template.format(**merged_context)
-        messages = self.message_builder(system_prompt, state_copy, merged_context)
-        return self.agent_executor.invoke(messages)
+        return self.message_builder(system_prompt, state_copy, merged_context)
+
+    def __call__(self, state: State | Mapping[str, Any], **runtime_context: Any) -> Any:
+        return self._current_executor().invoke(self._build_messages(state, runtime_context))
+
+    def stream(self, state: State | Mapping[str, Any], **runtime_context: Any) -> Iterator[Any]:
+        """Yield progressively more complete structured outputs.
+
+        Structured-output parsers parse the partial JSON of each streamed
+        chunk, so string fields grow as tokens arrive. Executors without
+        ``stream`` yield their single ``invoke`` result.
+        """
+        messages = self._build_messages(state, runtime_context)
+        executor = self._current_executor()
+        stream = getattr(executor, "stream", None)
+        if stream is None:
+            yield executor.invoke(messages)
+            return
+        for partial in stream(messages):
+            if partial is not None:
+                yield partial
+
+    def invoke_streaming(
+        self,
+        state: State | Mapping[str, Any],
+        on_partial: Callable[[Any], None],
+        **runtime_context: Any,
+    ) -> Any:
+        """Stream partial outputs to ``on_partial`` and return the final one.
+
+        The last streamed object is validated against ``output_format`` and,
+        failing that, repaired. Only if both fail does the call fall back to
+        a regular ``invoke``. The fallback is logged and announced with a
+        ``{"type": "structured_output_retry"}`` custom event, and its result
+        goes to ``on_partial`` too, so what was streamed is replaced.
+        """
+        final = None
+        for partial in self.stream(state, **runtime_context):
+            final = partial
+            on_partial(partial)
+        if is_valid_structured_output(self.output_format, final):
+            return final
+        repaired = repair_structured_output(self.output_format, final)
+        if repaired is not None:
+            on_partial(repaired)
+            return repaired
+        agent = self.model_key or self.model
+        logger.warning("Streamed output of %s failed validation; re-invoking.", agent)
+        stream_writer()({"type": "structured_output_retry", "agent": agent})
+        result = self(state, **runtime_context)
+        on_partial(result)
+        return result
@@ -50,7 +50,9 @@ class BroadScanAgent:
         )
 
     def __call__(self, state: dict[str, Any]) -> list[dict[str, Any]]:
-        context = self.conversation_tool.run(messages=state.get("messages", []) or [])
+        context = self.conversation_tool.run(
+            mode="last_query", messages=state.get("messages", []) or []
+        )
         taxonomy_reports = list(state.get("taxonomy_reports", []) or [])
         briefs: list[str] = []
         for report in taxonomy_reports:
@@ -6,6 +6,8 @@ from agent.agents.base_agent import BaseAgent
 from agent.agents.workflow_shared import _single_user_message_builder, _today_long
 from agent.tools.compare_input_formatting_tool import CompareInputFormattingTool
 from agent.tools.event_evidence_filter_tool import EventEvidenceFilterTool
+from agent.tools.source_block_encoder import source_block_style
+from agent.tools.source_store_tool import report_sources
 from prompts.risk_taxonomy import RISK_TAXONOMY
 from prompts.scan_prompts import COMPARE_EVENTS_SYSTEM_MESSAGE
 from schemas import EventClusterOutput
@@ -36,11 +38,15 @@ class CompareEventsAgent:
         )
         if not reports:
             return []
-        source_block = self.format_tool.run(reports=reports)
+        source_store = state.get("source_store") or {}
+        source_block = self.format_tool.run(
+            reports=reports,
+            source_store=source_store,
+            style=source_block_style("compare_events_agent"),
+        )
         known_urls: set[str] = set()
         for report in reports:
-            sources = report.get("reliable_sources") or report.get("sources") or []
-            for source in sources:
+            for source in report_sources(report, source_store, reliable=True):
                 url = str(source.get("url") or "").strip()
                 if url:
                     known_urls.add(url)
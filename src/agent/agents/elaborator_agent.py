@@ -4,7 +4,11 @@ from typing import Any
 
 from agent.agents.base_agent import BaseAgent
 from agent.agents.workflow_shared import _single_user_message_builder, _today_long
+from agent.configuration import current_configuration
+from agent.streaming import TextDeltaStream
 from agent.tools.conversation_context_tool import ConversationContextTool
+from agent.tools.risk_retrieval_tool import RiskIndex, RiskRetrievalTool
+from helper_functions import iter_risk_md
 from prompts.reporting_prompts import ELABORATOR_SYSTEM_MESSAGE
 from schemas import ElaboratorOutput
 
@@ -12,6 +16,8 @@ from schemas import ElaboratorOutput
 class ElaboratorAgent:
     def __init__(self, model: str, llm_factory: Any) -> None:
         self.context_tool = ConversationContextTool()
+        self.retrieval_tool = RiskRetrievalTool()
+        self.risk_index = RiskIndex()
         self.base_agent = BaseAgent(
             model=model,
             skills=[self.context_tool],
@@ -24,18 +30,53 @@ class ElaboratorAgent:
             today_provider=_today_long,
             llm_factory=llm_factory,
             message_builder=_single_user_message_builder(
-                "Current risk register (if any):\n{current_register}\n\n"
+                "Relevant risks from the current register (if any):\n{current_register}\n\n"
                 "Conversation so far:\n{conversation}\n\n"
                 "User question:\n{last_query}"
             ),
         )
 
+    def _register_context(self, risks: list[dict[str, Any]], query: str, k: int) -> str:
+        if not risks:
+            return "(no risk register yet)"
+        selected = self.retrieval_tool.run(risks=risks, query=query, k=k, index=self.risk_index)
+        blocks = [
+            "\n".join(iter_risk_md(risk, position, include_signposts=bool(risk.get("signposts"))))
+            for position, risk in selected
+        ]
+        header = (
+            f"The register holds {len(risks)} risk(s); "
+            f"showing the {len(selected)} most relevant to the question, under their register numbers."
+        )
+        return "\n\n".join([header, *blocks])
+
     def __call__(self, state: dict[str, Any]) -> str:
-        context = self.context_tool.run(messages=state.get("messages", []) or [])
-        out = self.base_agent(
+        configuration = current_configuration()
+        context = self.context_tool.run(
+            messages=state.get("messages", []) or [],
+            max_turns=configuration.qna_history_turns,
+            summary=state.get("conversation_summary", ""),
+            # The retrieval block carries the relevant risks; a rendered
+            # register in the history would grow the prompt with the register.
+            register_note="its risks relevant to the question are listed above",
+        )
+        last_query = context.get("last_user_query", "")
+        risks = list((state.get("risk") or {}).get("risks") or [])
+        prompt_context = {
+            "current_register": self._register_context(
+                risks, last_query, configuration.qna_top_k
+            ),
+            "conversation": context.get("conversation", ""),
+            "last_query": last_query,
+        }
+        if not configuration.stream_tokens:
+            out = self.base_agent({}, **prompt_context)
+            return str(out.get("answer") or "").strip()
+
+        tokens = TextDeltaStream("answer")
+        out = self.base_agent.invoke_streaming(
             {},
-            current_register=state.get("risk"),
-            conversation=context.get("conversation", ""),
-            last_query=context.get("last_user_query", ""),
+            lambda partial: tokens.update(str(partial.get("answer") or "")),
+            **prompt_context,
         )
         return str(out.get("answer") or "").strip()
@@ -6,6 +6,7 @@ from langchain_core.messages import HumanMessage, SystemMessage
 
 from agent.agents.base_agent import BaseAgent
 from agent.agents.workflow_shared import _single_user_message_builder, _today_long
+from agent.configuration import current_configuration
 from agent.tools.audit_trail_tool import AuditTrailTool
 from agent.tools.citation_normalization_tool import CitationNormalizationTool
 from helper_functions import format_risk_md
@@ -71,7 +72,7 @@ class RefineRiskAgent:
 
     def __call__(self, risk_candidate: dict[str, Any]) -> dict[str, Any]:
         current = self.audit_tool.run(risk=risk_candidate)
-        max_rounds = 3
+        max_rounds = current_configuration().refinement_max_rounds
         for _round in range(1, max_rounds + 1):
             formatted_risk = format_risk_md(current, 0)
             eval_out = self.evaluator({}, taxonomy=RISK_TAXONOMY, risk_md=formatted_risk)
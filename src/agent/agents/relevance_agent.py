@@ -4,9 +4,11 @@ from typing import Any
 
 from agent.agents.base_agent import BaseAgent
 from agent.agents.workflow_shared import _single_user_message_builder, _today_long
+from agent.configuration import current_configuration
 from agent.tools.audit_trail_tool import AuditTrailTool
 from agent.tools.citation_normalization_tool import CitationNormalizationTool
 from agent.tools.citation_selection_tool import CitationSelectionTool
+from helper_functions import append_weak_relevance_note as _append_weak_relevance_note
 from helper_functions import format_risk_md
 from prompts.portfolio_allocation import PORTFOLIO_ALLOCATION
 from prompts.relevance_prompts import (
@@ -19,18 +21,6 @@ from prompts.source_guide import SOURCE_GUIDE
 from schemas import RelevanceReviewOutput, RiskDraft
 
 
-def _append_weak_relevance_note(narrative: str) -> str:
-    note = (
-        "Portfolio relevance remains weak after review; treat as lower priority "
-        "for this portfolio."
-    )
-    if note.lower() in narrative.lower():
-        return narrative
-    if narrative.endswith("."):
-        return f"{narrative} {note}"
-    return f"{narrative}. {note}"
-
-
 class RelevanceAgent:
     def __init__(self, model: str, llm_factory: Any) -> None:
         self.audit_tool = AuditTrailTool()
@@ -77,7 +67,7 @@ class RelevanceAgent:
             default_audit_log=[],
             default_reasoning_trace="Initial scan selection.",
         )
-        max_rounds = 3
+        max_rounds = current_configuration().relevance_max_rounds
         passed = False
         last_feedback = "None"
 
@@ -107,13 +97,11 @@ class RelevanceAgent:
                 "sources": assessed.get("sources") or current.get("sources") or [],
             }
 
-            selected_sources = self.citation_tool.run(
-                narrative=str(current.get("narrative") or ""),
-                reasoning=str(current.get("reasoning_trace") or ""),
+            current = self.normalization_tool.run(
+                risk=current,
                 source_pool=current.get("sources") or [],
+                flag_dangling=True,
             )
-            current["sources"] = selected_sources
-            current = self.normalization_tool.run(risk=current)
 
             review_out = self.reviewer({}, taxonomy=RISK_TAXONOMY, risk_md=format_risk_md(current, 0))
             if review_out.get("satisfied_with_relevance"):
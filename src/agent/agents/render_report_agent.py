@@ -2,16 +2,27 @@ from __future__ import annotations
 
 from typing import Any
 
+from agent.tools.refinement_merge_tool import RefinementMergeTool
 from agent.tools.risk_deduplication_tool import RiskDeduplicationTool
 from agent.tools.risk_markdown_render_tool import RiskMarkdownRenderTool
 
 
 class RenderReportAgent:
     def __init__(self) -> None:
+        self.merger = RefinementMergeTool()
         self.deduper = RiskDeduplicationTool()
         self.renderer = RiskMarkdownRenderTool()
 
-    def __call__(self, state: dict[str, Any]) -> str:
-        finalized = list(state.get("finalized_risks", []) or [])
-        deduped = self.deduper.run(risks=finalized)
-        return self.renderer.run(risks=deduped, dedupe=False)
+    def final_risks(self, state: dict[str, Any]) -> list[dict[str, Any]]:
+        """The register as rendered: assessed risks merged with refinements, deduplicated."""
+        finalized = self.merger.run(
+            assessed=list(state.get("finalized_risks", []) or []),
+            refined=list(state.get("refined_risks", []) or []),
+        )
+        return self.deduper.run(risks=finalized)
+
+    def render(self, risks: list[dict[str, Any]], stream_name: str = "risk_register") -> str:
+        return self.renderer.run(risks=risks, dedupe=False, stream_name=stream_name)
+
+    def __call__(self, state: dict[str, Any], stream_name: str = "risk_register") -> str:
+        return self.render(self.final_risks(state), stream_name)
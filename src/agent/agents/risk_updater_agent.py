@@ -4,19 +4,23 @@ from typing import Any
 
 from agent.agents.base_agent import BaseAgent
 from agent.agents.workflow_shared import _single_user_message_builder, _today_long
+from agent.configuration import current_configuration
+from agent.streaming import MarkdownStream
 from agent.tools.conversation_context_tool import ConversationContextTool
+from agent.tools.risk_patch_tool import RiskPatchTool
 from agent.tools.update_render_tool import UpdateRenderTool
 from prompts.portfolio_allocation import PORTFOLIO_ALLOCATION
 from prompts.risk_taxonomy import RISK_TAXONOMY
 from prompts.source_guide import SOURCE_GUIDE
-from prompts.update_prompts import RISK_UPDATER_SYSTEM_MESSAGE
-from schemas import RiskUpdateOutput
+from prompts.update_prompts import RISK_PATCH_SYSTEM_MESSAGE, RISK_UPDATER_SYSTEM_MESSAGE
+from schemas import RiskPatchOutput, RiskUpdateOutput
 
 
 class RiskUpdaterAgent:
     def __init__(self, model: str, llm_factory: Any) -> None:
         self.context_tool = ConversationContextTool()
         self.render_tool = UpdateRenderTool()
+        self.patch_tool = RiskPatchTool()
         self.base_agent = BaseAgent(
             model=model,
             skills=[self.context_tool, self.render_tool],
@@ -35,19 +39,107 @@ class RiskUpdaterAgent:
                 "Update the register following your instructions."
             ),
         )
-
-    def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
-        context = self.context_tool.run(messages=state.get("messages", []) or [])
-        users_query = context.get("last_user_query", "")
-        existing_register = state.get("risk")
-        updated = self.base_agent(
-            {},
-            users_query=users_query,
-            existing_register=existing_register,
+        self.patch_agent = BaseAgent(
+            model=model,
+            skills=[self.context_tool, self.patch_tool],
+            output_format=RiskPatchOutput,
+            system_template=RISK_PATCH_SYSTEM_MESSAGE,
+            static_context={
+                "taxonomy": RISK_TAXONOMY,
+                "PORTFOLIO_ALLOCATION": PORTFOLIO_ALLOCATION,
+                "SOURCE_GUIDE": SOURCE_GUIDE,
+            },
+            today_provider=_today_long,
+            llm_factory=llm_factory,
+            message_builder=_single_user_message_builder(
+                "USER REQUEST:\n{users_query}\n\n"
+                "EXISTING RISK REGISTER (ids in brackets):\n{existing_register}\n\n"
+                "Return patch operations following your instructions."
+            ),
         )
-        updated_register = {"risks": updated.get("risks") or []}
+
+    def _stream_update(self, prompt_context: dict[str, Any]) -> tuple[dict[str, Any], str]:
+        stream = MarkdownStream("updated_register")
+        completed = 0
+
+        def _on_partial(partial: dict[str, Any]) -> None:
+            nonlocal completed
+            risks = list(partial.get("risks") or [])
+            # The last risk in a partial object may still be mid-generation.
+            if len(risks) - 1 <= completed:
+                return
+            completed = len(risks) - 1
+            self.render_tool.run(mode="preview", risks=risks[:completed], stream=stream)
+
+        updated = self.base_agent.invoke_streaming({}, _on_partial, **prompt_context)
         final_message = self.render_tool.run(
-            risks=updated_register["risks"],
+            risks=updated.get("risks") or [],
             change_log=updated.get("change_log") or [],
+            stream=stream,
         )
-        return {"risk": updated_register, "message": final_message}
+        return updated, final_message
+
+    def _stream_patch(
+        self, risks: list[dict[str, Any]], prompt_context: dict[str, Any]
+    ) -> tuple[dict[str, Any], MarkdownStream]:
+        stream = MarkdownStream("updated_register")
+        completed = 0
+
+        def _on_partial(partial: dict[str, Any]) -> None:
+            nonlocal completed
+            operations = list(partial.get("operations") or [])
+            # The last operation in a partial object may still be mid-generation.
+            if len(operations) - 1 <= completed:
+                return
+            completed = len(operations) - 1
+            applied = self.patch_tool.run(mode="apply", risks=risks, operations=operations[:completed])
+            self.patch_tool.run(mode="render", preview=True, stream=stream, **applied)
+
+        patch = self.patch_agent.invoke_streaming({}, _on_partial, **prompt_context)
+        return patch, stream
+
+    def _patch_update(self, state: dict[str, Any], users_query: str) -> dict[str, Any]:
+        risks = list((state.get("risk") or {}).get("risks") or [])
+        prompt_context = {
+            "users_query": users_query,
+            "existing_register": self.patch_tool.run(mode="register_block", risks=risks),
+        }
+        stream = None
+        if current_configuration().stream_tokens:
+            patch, stream = self._stream_patch(risks, prompt_context)
+        else:
+            patch = self.patch_agent({}, **prompt_context)
+        result = self.patch_tool.run(
+            mode="apply",
+            risks=risks,
+            operations=patch.get("operations") or [],
+        )
+        message = self.patch_tool.run(
+            mode="render",
+            change_log=patch.get("change_log") or [],
+            stream=stream,
+            **result,
+        )
+        return {"risk": {"risks": result["risks"]}, "message": message}
+
+    def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
+        context = self.context_tool.run(
+            mode="last_query", messages=state.get("messages", []) or []
+        )
+        configuration = current_configuration()
+        if configuration.update_mode == "patch":
+            return self._patch_update(state, context.get("last_user_query", ""))
+
+        prompt_context = {
+            "users_query": context.get("last_user_query", ""),
+            "existing_register": state.get("risk"),
+        }
+        if configuration.stream_tokens:
+            updated, final_message = self._stream_update(prompt_context)
+        else:
+            updated = self.base_agent({}, **prompt_context)
+            final_message = self.render_tool.run(
+                risks=updated.get("risks") or [],
+                change_log=updated.get("change_log") or [],
+            )
+        return {"risk": {"risks": updated.get("risks") or []}, "message": final_message}
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import random
 from typing import Any
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from agent.agents.base_agent import BaseAgent
 from agent.agents.workflow_shared import _today_long
+from agent.configuration import current_configuration
+from agent.routing import RouterMetrics, log_decision
 from agent.tools.conversation_context_tool import ConversationContextTool
+from agent.tools.route_classifier_tool import RouteClassifierTool
 from prompts.router_prompts import ROUTER_SYSTEM_MESSAGE, ROUTER_USER_MESSAGE
 from schemas import RouterOutput
 
@@ -23,9 +27,18 @@ def _router_message_builder(
     ]
 
 
+ROUTE_TARGETS = {
+    "scan": "initiate_web_search",
+    "update": "risk_updater",
+    "qna": "elaborator",
+}
+
+
 class RouterAgent:
     def __init__(self, model: str, llm_factory: Any) -> None:
         self.conversation_tool = ConversationContextTool()
+        self.classifier = RouteClassifierTool()
+        self.metrics = RouterMetrics()
         self.base_agent = BaseAgent(
             model=model,
             skills=[self.conversation_tool],
@@ -37,12 +50,32 @@ class RouterAgent:
             message_builder=_router_message_builder,
         )
 
-    def __call__(self, state: dict[str, Any]) -> str:
-        context = self.conversation_tool.run(messages=state.get("messages", []) or [])
-        output = self.base_agent(state, user_query=context.get("last_user_query", ""))
+    def _llm_route(self, state: dict[str, Any], user_query: str) -> str:
+        output = self.base_agent(state, user_query=user_query)
         user_query_type = output.get("user_query_type")
-        if user_query_type == "scan":
-            return "initiate_web_search"
-        if user_query_type == "update":
-            return "risk_updater"
-        return "elaborator"
+        return user_query_type if user_query_type in ROUTE_TARGETS else "qna"
+
+    def __call__(self, state: dict[str, Any]) -> str:
+        context = self.conversation_tool.run(
+            mode="last_query", messages=state.get("messages", []) or []
+        )
+        user_query = context.get("last_user_query", "")
+        configuration = current_configuration()
+
+        decision = {"route": None, "source": "llm"}
+        if configuration.router_fast_path:
+            decision = self.classifier.run(
+                query=user_query,
+                min_confidence=configuration.router_min_confidence,
+            )
+        fast_route = decision["route"]
+
+        llm_route = None
+        shadow_rate = configuration.router_shadow_rate
+        if fast_route is None or random.random() < shadow_rate:
+            # Deferred turns, plus a sample of fast-path turns to measure agreement.
+            llm_route = self._llm_route(state, user_query)
+            log_decision(user_query, llm_route, "llm")
+
+        self.metrics.record(decision["source"], fast_route, llm_route)
+        return ROUTE_TARGETS[fast_route or llm_route or "qna"]
@@ -9,6 +9,7 @@ from agent.tools.citation_normalization_tool import CitationNormalizationTool
 from agent.tools.citation_selection_tool import CitationSelectionTool
 from agent.tools.event_to_risk_source_tool import EventToRiskSourceTool
 from agent.tools.risk_deduplication_tool import RiskDeduplicationTool
+from agent.tools.source_block_encoder import source_block_style
 from prompts.portfolio_allocation import PORTFOLIO_ALLOCATION
 from prompts.risk_taxonomy import RISK_TAXONOMY
 from prompts.scan_prompts import (
@@ -53,7 +54,12 @@ class SummarizeEventsAgent:
         if not events:
             return []
 
-        source_meta = self.source_tool.run(reports=reports, events=events)
+        source_meta = self.source_tool.run(
+            reports=reports,
+            events=events,
+            source_store=state.get("source_store") or {},
+            style=source_block_style("summarize_events_agent"),
+        )
         out = self.base_agent(
             {},
             events_json=json.dumps(events, indent=2),
@@ -75,11 +81,6 @@ class SummarizeEventsAgent:
             if not portfolio_relevance_rationale:
                 portfolio_relevance_rationale = "Relevance not specified; requires review."
 
-            sources = self.citation_tool.run(
-                narrative=str(risk.get("narrative") or "").strip(),
-                reasoning=str(risk.get("reasoning_trace") or "").strip(),
-                source_pool=all_urls,
-            )
             normalized = self.normalization_tool.run(
                 risk={
                     "title": str(risk.get("title") or "").strip(),
@@ -89,9 +90,12 @@ class SummarizeEventsAgent:
                     "audit_log": [],
                     "portfolio_relevance": portfolio_relevance,
                     "portfolio_relevance_rationale": portfolio_relevance_rationale,
-                    "sources": sources,
-                }
+                },
+                source_pool=all_urls,
+                source_map=source_meta.get("source_map"),
+                flag_dangling=True,
             )
             cleaned.append(normalized)
 
-        return self.deduper.run(risks=cleaned)
+        # Paraphrases of one event across clusters are merged only here, at drafting.
+        return self.deduper.run(risks=cleaned, near_duplicates=True)
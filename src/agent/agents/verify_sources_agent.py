@@ -4,7 +4,10 @@ from typing import Any
 
 from agent.agents.base_agent import BaseAgent
 from agent.agents.workflow_shared import _single_user_message_builder, _today_long
+from agent.tools.source_block_cache import source_numbers
+from agent.tools.source_block_encoder import source_block_style
 from agent.tools.source_reliability_merge_tool import SourceReliabilityMergeTool
+from agent.tools.source_store_tool import report_sources, source_id
 from agent.tools.source_verification_formatting_tool import (
     SourceVerificationFormattingTool,
 )
@@ -31,9 +34,15 @@ class VerifySourcesAgent:
 
     def __call__(self, state: dict[str, Any]) -> list[dict[str, Any]]:
         reports = list(state.get("taxonomy_reports", []) or [])
+        source_store = state.get("source_store") or {}
         verified_reports: list[dict[str, Any]] = []
+        # Assessments keyed by canonical URL, shared across taxonomies so a
+        # source surfaced by several searches is only sent to the LLM once.
+        assessed: dict[str, dict[str, Any]] = {}
+        style = source_block_style("verify_sources_agent")
+        numbers = source_numbers(reports, source_store)
         for report in reports:
-            sources = list(report.get("sources") or [])
+            sources = report_sources(report, source_store)
             if not sources:
                 verified_reports.append(
                     {
@@ -43,16 +52,28 @@ class VerifySourcesAgent:
                     }
                 )
                 continue
-            source_block = self.format_tool.run(sources=sources)
-            out = self.base_agent(
-                {},
-                taxonomy=str(report.get("taxonomy") or "").strip(),
-                source_block=source_block,
-            )
+            pending = [source for source in sources if source_id(source) not in assessed]
+            if pending:
+                source_block = self.format_tool.run(
+                    sources=pending, numbers=numbers, style=style
+                )
+                out = self.base_agent(
+                    {},
+                    taxonomy=str(report.get("taxonomy") or "").strip(),
+                    source_block=source_block,
+                )
+                for assessment in out.get("sources") or []:
+                    assessed[source_id(assessment)] = assessment
+                for source in pending:
+                    assessed.setdefault(source_id(source), {})
             merged = self.merge_tool.run(
                 report=report,
                 sources=sources,
-                assessments=out.get("sources") or [],
+                assessments=[
+                    {**assessed[source_id(source)], "url": source.get("url")}
+                    for source in sources
+                    if assessed.get(source_id(source))
+                ],
             )
             verified_reports.append(merged)
         return verified_reports
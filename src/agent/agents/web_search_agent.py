@@ -2,37 +2,84 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from typing import Any
+from urllib.parse import urlsplit
+from uuid import uuid4
 
 from agent.agents.base_agent import BaseAgent
 from agent.agents.workflow_shared import _single_user_message_builder, _today_long
+from agent.configuration import SearchBudget, current_configuration, search_budget_for
+from agent.query_plan_cache import QueryPlanCache, prompt_version
+from agent.tools.published_dates import filter_recent
+from agent.tools.query_plan_tool import QueryPlanTool, SharedSearchCache
+from agent.tools.source_block_encoder import source_block_style
+from agent.tools.source_dedup_index import SourceDedupIndex
 from agent.tools.taxonomy_brief_formatting_tool import TaxonomyBriefFormattingTool
+from agent.tools.url_canonicalization import canonicalize_url
 from agent.tools.web_search_execution_tool import WebSearchExecutionTool
-from schemas import WebBriefOutput, WebQueryPlan
+from schemas import GlobalQueryPlan, WebBriefOutput, WebQueryPlan
+
+QUERY_SYSTEM_MESSAGE = (
+    "You generate concise web search queries for a horizon-scanning analyst.\n\n"
+    "Rules:\n"
+    "- Focus on developments from the last 7-14 days relative to today's date.\n"
+    "- Prefer queries that surface specific events (policy decisions, macro releases, conflicts, regulations, outages).\n"
+    "- Return the requested number of queries, most important first, each <= 12 words.\n"
+    "- No quotes, no markdown, no commentary.\n"
+    "- Return JSON with key 'queries'."
+)
+QUERY_USER_MESSAGE = (
+    "Taxonomy: {taxonomy}\nToday (UTC): {today_iso}\n"
+    "Number of queries: {max_queries}"
+)
+PLAN_SYSTEM_MESSAGE = (
+    "You plan web search queries for a horizon-scanning analyst covering several risk taxonomies at once.\n\n"
+    "Rules:\n"
+    "- Focus on developments from the last 7-14 days relative to today's date.\n"
+    "- Prefer queries that surface specific events (policy decisions, macro releases, conflicts, regulations, outages).\n"
+    "- For each taxonomy return the requested number of queries, most important first, each <= 12 words.\n"
+    "- Taxonomies overlap: when two taxonomies need the same event, use the identical query text for both.\n"
+    "- No quotes, no markdown, no commentary.\n"
+    "- Return JSON with key 'plans': one entry per taxonomy, with 'taxonomy' exactly as given and 'queries'."
+)
+PLAN_USER_MESSAGE = "Today (UTC): {today_iso}\nTaxonomies and number of queries:\n{taxonomy_lines}"
+# Cached plans are keyed by these, so editing a prompt invalidates its plans.
+QUERY_PROMPT_VERSION = prompt_version(QUERY_SYSTEM_MESSAGE, QUERY_USER_MESSAGE)
+PLAN_PROMPT_VERSION = prompt_version(PLAN_SYSTEM_MESSAGE, PLAN_USER_MESSAGE)
+
+
+def _source_domain(source: Any) -> str:
+    domain = source.get("domain") if hasattr(source, "get") else None
+    if domain:
+        return str(domain)
+    return urlsplit(canonicalize_url(str(source.get("url") or ""))).netloc
 
 
 class WebSearchAgent:
     def __init__(self, model: str, llm_factory: Any) -> None:
         self.search_tool = WebSearchExecutionTool()
         self.brief_formatter = TaxonomyBriefFormattingTool()
+        self.plan_tool = QueryPlanTool()
+        self.search_cache = SharedSearchCache()
+        self.plan_cache = QueryPlanCache.from_env()
         self.query_agent = BaseAgent(
             model=model,
             skills=[self.search_tool],
             output_format=WebQueryPlan,
-            system_template=(
-                "You generate concise web search queries for a horizon-scanning analyst.\n\n"
-                "Rules:\n"
-                "- Focus on developments from the last 7-14 days relative to today's date.\n"
-                "- Prefer queries that surface specific events (policy decisions, macro releases, conflicts, regulations, outages).\n"
-                "- Return exactly 5 queries, each <= 12 words.\n"
-                "- No quotes, no markdown, no commentary.\n"
-                "- Return JSON with key 'queries'."
-            ),
+            system_template=QUERY_SYSTEM_MESSAGE,
             static_context={},
             today_provider=_today_long,
             llm_factory=llm_factory,
-            message_builder=_single_user_message_builder(
-                "Taxonomy: {taxonomy}\nToday (UTC): {today_iso}"
-            ),
+            message_builder=_single_user_message_builder(QUERY_USER_MESSAGE),
+        )
+        self.plan_agent = BaseAgent(
+            model=model,
+            skills=[self.search_tool, self.plan_tool],
+            output_format=GlobalQueryPlan,
+            system_template=PLAN_SYSTEM_MESSAGE,
+            static_context={},
+            today_provider=_today_long,
+            llm_factory=llm_factory,
+            message_builder=_single_user_message_builder(PLAN_USER_MESSAGE),
         )
         self.report_agent = BaseAgent(
             model=model,
@@ -64,14 +111,24 @@ class WebSearchAgent:
             f"{taxonomy} supply chain disruptions recent",
         ]
 
-    def _ensure_five_queries(self, taxonomy: str, raw_queries: list[Any]) -> list[str]:
+    def _candidate_queries(
+        self,
+        taxonomy: str,
+        raw_queries: list[Any],
+        max_queries: int,
+    ) -> list[str]:
+        """Model queries in priority order, padded with fallbacks up to the ceiling.
+
+        Fallbacks sit at the end of the list, so they only run when the
+        taxonomy is still yielding new sources after the model's own queries.
+        """
         queries = self.search_tool.run(
             mode="dedupe_queries",
             queries=raw_queries,
-            max_queries=5,
+            max_queries=max_queries,
         )
-        if len(queries) >= 5:
-            return queries[:5]
+        if len(queries) >= max_queries:
+            return queries[:max_queries]
 
         seen = {str(query).strip().lower() for query in queries}
         for candidate in self._fallback_queries(taxonomy):
@@ -80,9 +137,159 @@ class WebSearchAgent:
                 continue
             queries.append(candidate)
             seen.add(key)
-            if len(queries) >= 5:
+            if len(queries) >= max_queries:
                 break
-        return queries[:5]
+        return queries[:max_queries]
+
+    def plan_queries(self, taxonomies: list[str]) -> dict[str, Any]:
+        """Plan every taxonomy's queries in one model call, shared across taxonomies.
+
+        Each taxonomy's list is padded with fallbacks to its budget, then
+        near-identical queries are collapsed onto one text so that workers
+        sharing the returned ``plan_id`` run each unique search once; a list
+        that loses queries to the collapse is padded again from the unused
+        fallbacks. Call ``release_plan`` once the workers have joined.
+        """
+        budgets = {taxonomy: search_budget_for(taxonomy) for taxonomy in taxonomies}
+        today_iso = datetime.now(timezone.utc).isoformat()[:10]
+        max_age_hours = current_configuration().query_plan_max_age_hours
+        raw: dict[str, list[Any]] = {}
+        for taxonomy, budget in budgets.items():
+            cached = self.plan_cache.get(
+                taxonomy, today_iso, PLAN_PROMPT_VERSION, budget.max_queries, max_age_hours
+            )
+            if cached is not None:
+                raw[taxonomy.lower()] = cached
+        missing = [taxonomy for taxonomy in taxonomies if taxonomy.lower() not in raw]
+        if missing:
+            plan_out = self.plan_agent(
+                {},
+                today_iso=today_iso,
+                taxonomy_lines="\n".join(
+                    f"- {taxonomy}: {budgets[taxonomy].max_queries}" for taxonomy in missing
+                ),
+            )
+            planned_raw = {
+                str(plan.get("taxonomy") or "").strip().lower(): list(plan.get("queries") or [])
+                for plan in plan_out.get("plans") or []
+            }
+            for taxonomy in missing:
+                queries = planned_raw.get(taxonomy.lower()) or []
+                raw[taxonomy.lower()] = queries
+                if queries and max_age_hours > 0:
+                    self.plan_cache.put(
+                        taxonomy, today_iso, PLAN_PROMPT_VERSION, queries, budgets[taxonomy].max_queries
+                    )
+        candidates = {
+            taxonomy: self._candidate_queries(
+                taxonomy=taxonomy,
+                raw_queries=raw.get(taxonomy.lower(), []),
+                max_queries=budget.max_queries,
+            )
+            for taxonomy, budget in budgets.items()
+        }
+        planned = self.plan_tool.run(
+            plans=candidates,
+            threshold=current_configuration().query_dedupe_threshold,
+            reserves={
+                taxonomy: [q for q in self._fallback_queries(taxonomy) if q not in queries]
+                for taxonomy, queries in candidates.items()
+            },
+        )
+        return {"plan_id": uuid4().hex, "cached": len(taxonomies) - len(missing), **planned}
+
+    def _generate_queries(self, taxonomy: str, today_iso: str, budget: SearchBudget) -> list[Any]:
+        """One taxonomy's model queries, reused from the plan cache when fresh."""
+        max_age_hours = current_configuration().query_plan_max_age_hours
+        cached = self.plan_cache.get(
+            taxonomy, today_iso, QUERY_PROMPT_VERSION, budget.max_queries, max_age_hours
+        )
+        if cached is not None:
+            return cached
+        query_out = self.query_agent(
+            {},
+            taxonomy=taxonomy,
+            today_iso=today_iso,
+            max_queries=budget.max_queries,
+        )
+        queries = list(query_out.get("queries") or [])
+        if queries and max_age_hours > 0:
+            self.plan_cache.put(taxonomy, today_iso, QUERY_PROMPT_VERSION, queries, budget.max_queries)
+        return queries
+
+    def release_plan(self, plan_id: str) -> int:
+        """Free the shared search results of a plan whose workers have all joined."""
+        return self.search_cache.clear_plan(plan_id) if plan_id else 0
+
+    def _search(self, query: str, budget: SearchBudget, plan_id: str) -> tuple[list[Any], bool]:
+        """Run one search; queries of a shared plan run once across taxonomies."""
+        if not plan_id:
+            return list(self.search_tool.run(query=query, num=budget.results_per_query)), False
+        return self.search_cache.get_or_run(
+            (plan_id, query.strip().lower(), budget.results_per_query),
+            lambda: self.search_tool.run(query=query, num=budget.results_per_query),
+        )
+
+    def _run_adaptive_search(
+        self,
+        taxonomy: str,
+        candidates: list[str],
+        budget: SearchBudget,
+        plan_id: str = "",
+    ) -> tuple[list[str], SourceDedupIndex, dict[str, Any]]:
+        # Queries overlap heavily; keep one record per canonical URL.
+        index = SourceDedupIndex()
+        seen_domains: set[str] = set()
+        executed: list[str] = []
+        novelty: list[float] = []
+        shared = 0
+        dropped = {"stale": 0, "undated": 0}
+        stopped_early = False
+        configuration = current_configuration()
+        now = datetime.now(timezone.utc)
+
+        for position, query in enumerate(candidates):
+            if position >= budget.initial_queries and novelty and novelty[-1] < budget.min_novelty:
+                stopped_early = True
+                break
+            results, reused = self._search(query, budget, plan_id)
+            # Stale results never reach the index, so they cost nothing downstream.
+            results, counts = filter_recent(
+                results,
+                configuration.recency_window_days,
+                now=now,
+                keep_undated=configuration.keep_undated_sources,
+            )
+            for key, count in counts.items():
+                dropped[key] += count
+            shared += int(reused)
+            executed.append(query)
+            new_urls = 0
+            new_domains = 0
+            for source in results:
+                _, is_new = index.add(source, taxonomy=taxonomy)
+                new_urls += int(is_new)
+                domain = _source_domain(source)
+                if domain and domain not in seen_domains:
+                    seen_domains.add(domain)
+                    new_domains += 1
+            if results:
+                novelty.append((new_urls + new_domains) / (2 * len(results)))
+            else:
+                novelty.append(0.0)
+
+        stats = {
+            "queries_run": len(executed),
+            "query_ceiling": budget.max_queries,
+            "unique_sources": len(index),
+            "unique_domains": len(seen_domains),
+            "novelty": [round(value, 3) for value in novelty],
+            "stopped_early": stopped_early,
+            "shared_queries": shared,
+            "dropped_stale": dropped["stale"],
+            "undated": dropped["undated"],
+        }
+        return executed, index, stats
 
     def __call__(self, state: dict[str, Any]) -> dict[str, Any]:
         taxonomy = str(state.get("taxonomy") or "").strip()
@@ -98,18 +305,25 @@ class WebSearchAgent:
                 "generated_at": generated_at,
             }
 
-        query_out = self.query_agent({}, taxonomy=taxonomy, today_iso=today_iso)
-        queries = self._ensure_five_queries(
+        budget = search_budget_for(taxonomy)
+        planned = state.get("queries")
+        if planned is None:
+            planned = self._generate_queries(taxonomy, today_iso, budget)
+        candidates = self._candidate_queries(
             taxonomy=taxonomy,
-            raw_queries=query_out.get("queries") or [],
+            raw_queries=planned,
+            max_queries=budget.max_queries,
         )
+        queries, index, search_stats = self._run_adaptive_search(
+            taxonomy, candidates, budget, str(state.get("plan_id") or "")
+        )
+        sources = index.records()
 
-        sources: list[dict[str, Any]] = []
-        for query in queries:
-            query_results = self.search_tool.run(query=query, num=10)
-            sources.extend(query_results)
-
-        sources_block = self.brief_formatter.run(mode="sources_block", sources=sources)
+        sources_block = self.brief_formatter.run(
+            mode="sources_block",
+            sources=sources,
+            style=source_block_style("web_search_agent"),
+        )
         report_out = self.report_agent(
             {},
             taxonomy=taxonomy,
@@ -129,4 +343,5 @@ class WebSearchAgent:
             "sources": sources,
             "brief_md": brief_md,
             "generated_at": generated_at,
+            "search_stats": search_stats,
         }
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 from agent.agents.add_signposts_agent import AddSignpostsAgent
+from agent.agents.base_agent import BaseAgent
 from agent.agents.broad_scan_agent import BroadScanAgent
 from agent.agents.compare_events_agent import CompareEventsAgent
 from agent.agents.elaborator_agent import ElaboratorAgent
@@ -15,34 +16,42 @@ from agent.agents.summarize_events_agent import SummarizeEventsAgent
 from agent.agents.verify_sources_agent import VerifySourcesAgent
 from agent.agents.web_search_agent import WebSearchAgent
 from agent.agents.workflow_shared import (
-    _default_model_name,
     _provider_llm_factory,
     _single_user_message_builder,
     _today_iso_utc,
     _today_long,
 )
+from models import resolve_model
+
+
+def _assign_model_keys(name: str, agent: Any) -> None:
+    """Key each of an agent's BaseAgents as ``<name>.<attribute>`` for tiering."""
+    for attribute, value in vars(agent).items():
+        if isinstance(value, BaseAgent):
+            value.assign_model_key(f"{name}.{attribute}")
 
 
 def build_workflow_agents() -> dict[str, Any]:
-    model = _default_model_name()
     llm_factory = _provider_llm_factory
-    return {
-        "router_agent": RouterAgent(model=model, llm_factory=llm_factory),
-        "broad_scan_agent": BroadScanAgent(model=model, llm_factory=llm_factory),
-        "web_search_agent": WebSearchAgent(model=model, llm_factory=llm_factory),
-        "verify_sources_agent": VerifySourcesAgent(model=model, llm_factory=llm_factory),
-        "compare_events_agent": CompareEventsAgent(model=model, llm_factory=llm_factory),
-        "summarize_events_agent": SummarizeEventsAgent(
-            model=model,
-            llm_factory=llm_factory,
-        ),
-        "refine_risk_agent": RefineRiskAgent(model=model, llm_factory=llm_factory),
-        "relevance_agent": RelevanceAgent(model=model, llm_factory=llm_factory),
-        "render_report_agent": RenderReportAgent(),
-        "risk_updater_agent": RiskUpdaterAgent(model=model, llm_factory=llm_factory),
-        "elaborator_agent": ElaboratorAgent(model=model, llm_factory=llm_factory),
-        "add_signposts_agent": AddSignpostsAgent(model=model, llm_factory=llm_factory),
+    agent_classes = {
+        "router_agent": RouterAgent,
+        "broad_scan_agent": BroadScanAgent,
+        "web_search_agent": WebSearchAgent,
+        "verify_sources_agent": VerifySourcesAgent,
+        "compare_events_agent": CompareEventsAgent,
+        "summarize_events_agent": SummarizeEventsAgent,
+        "refine_risk_agent": RefineRiskAgent,
+        "relevance_agent": RelevanceAgent,
+        "risk_updater_agent": RiskUpdaterAgent,
+        "elaborator_agent": ElaboratorAgent,
+        "add_signposts_agent": AddSignpostsAgent,
     }
+    agents: dict[str, Any] = {}
+    for name, agent_class in agent_classes.items():
+        agents[name] = agent_class(model=resolve_model(name), llm_factory=llm_factory)
+        _assign_model_keys(name, agents[name])
+    agents["render_report_agent"] = RenderReportAgent()
+    return agents
 
 
 __all__ = [
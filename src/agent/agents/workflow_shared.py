@@ -7,7 +7,7 @@ from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_deepseek import ChatDeepSeek
 from langchain_openai import ChatOpenAI
 
-from models import DEEPSEEK_MODEL, LLM_PROVIDER, OPENAI_MODEL
+from models import provider_for_model
 
 
 def _today_long() -> str:
@@ -19,15 +19,12 @@ def _today_iso_utc() -> str:
 
 
 def _provider_llm_factory(model: str) -> Any:
-    if LLM_PROVIDER == "openai":
+    # Dispatch on the model name: a run may switch provider or tier models.
+    if provider_for_model(model) == "openai":
         return ChatOpenAI(model=model, use_responses_api=True)
     return ChatDeepSeek(model=model)
 
 
-def _default_model_name() -> str:
-    return OPENAI_MODEL if LLM_PROVIDER == "openai" else DEEPSEEK_MODEL
-
-
 def _single_user_message_builder(user_template: str) -> Any:
     def _builder(
         system_prompt: str,
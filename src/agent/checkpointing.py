@@ -0,0 +1,113 @@
+"""Local checkpoint persistence for resumable scans.
+
+Set ``ERF_CHECKPOINT_DB`` to a SQLite file path to compile the top-level graph
+(and, through it, the scan and relevance subgraphs) with a local checkpointer.
+A crashed or timed-out run can then be resumed from its last completed
+superstep instead of repeating web search and verification work::
+
+    python -m agent.checkpointing resume <thread_id> --db .checkpoints/scans.sqlite
+
+LangGraph Server provides its own persistence, so leave the variable unset when
+serving the graph through ``langgraph dev``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+CHECKPOINT_DB_ENV = "ERF_CHECKPOINT_DB"
+
+
+def checkpoint_db_path() -> str | None:
+    """Return the configured checkpoint database path, if any."""
+    path = os.environ.get(CHECKPOINT_DB_ENV, "").strip()
+    return path or None
+
+
+def build_sqlite_checkpointer(db_path: str) -> BaseCheckpointSaver[Any]:
+    """Open (or create) a SQLite checkpoint store at ``db_path``."""
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ImportError(
+            "SQLite checkpointing requires the 'langgraph-checkpoint-sqlite' package. "
+            "Install it with: pip install -e '.[checkpoint]'"
+        ) from exc
+
+    if db_path != ":memory:":
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    # Parallel fan-out workers write from executor threads.
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    return SqliteSaver(conn)
+
+
+def default_checkpointer() -> BaseCheckpointSaver[Any] | None:
+    """Build the checkpointer configured via environment, or ``None``."""
+    path = checkpoint_db_path()
+    return build_sqlite_checkpointer(path) if path else None
+
+
+def thread_config(thread_id: str) -> dict[str, Any]:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def pending_nodes(graph: Any, thread_id: str) -> tuple[str, ...]:
+    """Return the nodes that would run next when resuming ``thread_id``."""
+    snapshot = graph.get_state(thread_config(thread_id))
+    return tuple(snapshot.next or ())
+
+
+def resume_run(graph: Any, thread_id: str) -> dict[str, Any]:
+    """Resume a checkpointed run from its last completed superstep.
+
+    Writes from tasks that finished before the failure (for example the other
+    web-search or relevance branches of a fan-out) are replayed from the
+    checkpoint, so only the failed tail of the run is executed again. Returns
+    the final state, or the stored state if the run had already completed.
+    """
+    config = thread_config(thread_id)
+    snapshot = graph.get_state(config)
+    if not snapshot.next:
+        return dict(snapshot.values or {})
+    return graph.invoke(None, config)
+
+
+def _main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m agent.checkpointing",
+        description="Inspect or resume checkpointed risk scans.",
+    )
+    parser.add_argument("command", choices=["status", "resume"])
+    parser.add_argument("thread_id")
+    parser.add_argument(
+        "--db",
+        default=checkpoint_db_path(),
+        help=f"SQLite checkpoint path (defaults to ${CHECKPOINT_DB_ENV}).",
+    )
+    args = parser.parse_args(argv)
+    if not args.db:
+        parser.error(f"--db is required when {CHECKPOINT_DB_ENV} is not set.")
+
+    from agent.graph import build_graph
+
+    graph = build_graph(checkpointer=build_sqlite_checkpointer(args.db))
+    if args.command == "status":
+        print(json.dumps({"thread_id": args.thread_id, "next": pending_nodes(graph, args.thread_id)}))  # noqa: T201
+        return 0
+
+    final_state = resume_run(graph, args.thread_id)
+    messages = final_state.get("messages") or []
+    if messages:
+        print(getattr(messages[-1], "content", messages[-1]))  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
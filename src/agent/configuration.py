@@ -0,0 +1,208 @@
+"""Per-run configuration read from ``RunnableConfig["configurable"]``."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field, fields, replace
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Mapping
+
+from agent.history import DEFAULT_HISTORY_TURNS
+
+try:  # Python 3.11+
+    import tomllib
+except ImportError:  # pragma: no cover - older interpreters only read JSON files
+    tomllib = None  # type: ignore[assignment]
+
+CONFIG_FILE_ENV = "ERF_CONFIG_FILE"
+ENV_PREFIX = "ERF_"
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def current_configurable() -> dict[str, Any]:
+    """Return the ``configurable`` mapping of the run being executed.
+
+    Outside of a LangGraph/LangChain run (unit tests, scripts) this is empty.
+    """
+    try:
+        from langgraph.config import get_config
+
+        config = get_config()
+    except (ImportError, RuntimeError):
+        return {}
+    return dict((config or {}).get("configurable") or {})
+
+
+@dataclass(frozen=True)
+class Configuration:
+    """Typed view of the run's performance and quality knobs.
+
+    Values are layered: field defaults, then the JSON/TOML file named by
+    ``ERF_CONFIG_FILE``, then ``ERF_<FIELD>`` environment variables, then the
+    run's ``configurable`` mapping. Unknown keys are ignored, so
+    ``configurable`` can also carry LangGraph's own keys (``thread_id``...).
+    """
+
+    # Review loops
+    relevance_max_rounds: int = 3
+    refinement_max_rounds: int = 3
+    enable_refinement: bool = False
+    signpost_max_rounds: int = 1
+    signpost_max_workers: int = 8
+    signpost_batch_size: int = 1
+    pipeline_signposts: bool = False
+    relevance_first_k: int = 0
+    taxonomy_weights: Mapping[str, float] = field(default_factory=dict)
+
+    # Web research
+    search_budget: Mapping[str, Any] = field(default_factory=dict)
+    global_query_plan: bool = True
+    query_dedupe_threshold: float = 0.6
+    query_plan_max_age_hours: float = 12.0
+    stream_web_search: bool = False
+    recency_window_days: float = 30.0
+    keep_undated_sources: bool = True
+    # "verbose" or "compact" (see agent.tools.source_block_encoder), per agent.
+    source_block_layout: str = "verbose"
+    source_block_layouts: Mapping[str, str] = field(default_factory=dict)
+    source_title_chars: int = 120
+    source_snippet_chars: int = 280
+    brief_max_sources: int = 20
+
+    # Register updates and Q&A
+    update_mode: str = "patch"
+    stream_tokens: bool = True
+    risk_similarity_threshold: float = 0.5
+    risk_title_similarity_threshold: float = 0.4
+    qna_top_k: int = 5
+    qna_history_turns: int = DEFAULT_HISTORY_TURNS
+    history_turns: int = DEFAULT_HISTORY_TURNS
+
+    # Routing
+    router_fast_path: bool = True
+    router_min_confidence: float = 0.9
+    router_shadow_rate: float = 0.0
+
+    # Models
+    llm_provider: str = ""
+    agent_model_tiers: Mapping[str, str] = field(default_factory=dict)
+    model_tiers: Mapping[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_mapping(
+        cls, values: Mapping[str, Any] | None, base: Configuration | None = None
+    ) -> Configuration:
+        """Overlay ``values`` on ``base``, coercing each to its field's type."""
+        base = base or cls()
+        updates = {}
+        for f in fields(cls):
+            if values and f.name in values and values[f.name] is not None:
+                updates[f.name] = _coerce(values[f.name], getattr(base, f.name))
+        return replace(base, **updates)
+
+    @classmethod
+    def from_runnable_config(cls, config: Mapping[str, Any] | None = None) -> Configuration:
+        """Resolve the configuration for ``config`` (a ``RunnableConfig``)."""
+        configurable = dict((config or {}).get("configurable") or {})
+        return cls.from_mapping(configurable, base=default_configuration())
+
+
+def _coerce(value: Any, default: Any) -> Any:
+    """Convert ``value`` (possibly an env string) to the type of ``default``."""
+    if isinstance(default, bool):
+        if isinstance(value, str):
+            return value.strip().lower() in _TRUE_VALUES
+        return bool(value)
+    if isinstance(default, int):
+        return int(value)
+    if isinstance(default, float):
+        return float(value)
+    if isinstance(default, Mapping):
+        return dict(json.loads(value) if isinstance(value, str) else value)
+    return str(value)
+
+
+@lru_cache(maxsize=8)
+def _read_config_file(path: str, _mtime: float) -> dict[str, Any]:
+    text = Path(path).read_text(encoding="utf-8")
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError(f"Reading {path} needs Python 3.11+ (tomllib).")
+        return dict(tomllib.loads(text))
+    return dict(json.loads(text))
+
+
+def _file_defaults() -> dict[str, Any]:
+    path = os.environ.get(CONFIG_FILE_ENV)
+    if not path:
+        return {}
+    return _read_config_file(path, Path(path).stat().st_mtime)
+
+
+def _env_defaults() -> dict[str, Any]:
+    names = {f.name for f in fields(Configuration)}
+    return {
+        name: os.environ[key]
+        for name in names
+        if (key := f"{ENV_PREFIX}{name.upper()}") in os.environ
+    }
+
+
+def default_configuration() -> Configuration:
+    """Deployment defaults: field defaults, config file, then environment."""
+    base = Configuration.from_mapping(_file_defaults())
+    return Configuration.from_mapping(_env_defaults(), base=base)
+
+
+def current_configuration() -> Configuration:
+    """Configuration of the run being executed (deployment defaults outside a run)."""
+    return Configuration.from_mapping(current_configurable(), base=default_configuration())
+
+
+@dataclass(frozen=True)
+class SearchBudget:
+    """Adaptive web-search budget for one taxonomy.
+
+    ``initial_queries`` run unconditionally; further queries (up to
+    ``max_queries``) run one at a time while the previous query's novelty,
+    the mean of its new-URL and new-domain fractions, stays at or above
+    ``min_novelty``.
+    """
+
+    initial_queries: int = 3
+    max_queries: int = 5
+    results_per_query: int = 10
+    min_novelty: float = 0.25
+
+    @classmethod
+    def from_mapping(cls, values: Mapping[str, Any] | None, base: SearchBudget | None = None) -> SearchBudget:
+        budget = base or cls()
+        known = {f.name for f in fields(cls)}
+        updates = {key: value for key, value in dict(values or {}).items() if key in known}
+        budget = replace(budget, **updates)
+        max_queries = max(1, int(budget.max_queries))
+        return replace(
+            budget,
+            max_queries=max_queries,
+            initial_queries=min(max(1, int(budget.initial_queries)), max_queries),
+            results_per_query=max(1, int(budget.results_per_query)),
+            min_novelty=float(budget.min_novelty),
+        )
+
+
+def search_budget_for(taxonomy: str, configurable: Mapping[str, Any] | None = None) -> SearchBudget:
+    """Resolve the search budget for ``taxonomy``.
+
+    ``configurable["search_budget"]`` sets run-wide values and may contain a
+    ``per_taxonomy`` mapping of taxonomy name to overrides, e.g.
+    ``{"max_queries": 8, "per_taxonomy": {"Climate": {"max_queries": 2}}}``.
+    """
+    if configurable is None:
+        settings = dict(current_configuration().search_budget)
+    else:
+        settings = dict(configurable.get("search_budget") or {})
+    per_taxonomy = dict(settings.pop("per_taxonomy", None) or {})
+    budget = SearchBudget.from_mapping(settings)
+    return SearchBudget.from_mapping(per_taxonomy.get(taxonomy), base=budget)
@@ -25,50 +25,85 @@ from helper_functions import *
 
 # import nodes
 from nodes.router_node import *
+from nodes.trim_history_node import *
 from nodes.relevance_join_node import *
 from nodes.render_report_node import *
 from nodes.risk_updater_node import *
 from nodes.elaborator_node import *
 
-from agent.scan_subgraph import build_scan_subgraph
+from agent.scan_subgraph import build_scan_subgraph, prepare_scan_state
 from agent.relevance_subgraph import build_relevance_subgraph
+from agent.refinement_subgraph import build_refinement_subgraph
+
+
+from agent.checkpointing import default_checkpointer
 
 
 # building graph
 
-graph_builder = StateGraph(State)
-graph_builder.add_node("router", lambda state: state)  # router returns current state
-graph_builder.add_node("scan_subgraph", build_scan_subgraph())
-graph_builder.add_node("relevance_subgraph", build_relevance_subgraph())
-graph_builder.add_node("relevance_join", lambda state: state)
-graph_builder.add_node("render_report", render_report_node)
-graph_builder.add_node("risk_updater", risk_updater_node)
-graph_builder.add_node("elaborator", elaborator_node)
-
-graph_builder.add_edge(START, "router")
-graph_builder.add_conditional_edges(
-    "router",
-    router_node,
-    {
-        "initiate_web_search": "scan_subgraph",
-        "risk_updater": "risk_updater",
-        "elaborator": "elaborator",
-    }
-)
-
-graph_builder.add_conditional_edges(
-    "scan_subgraph",
-    relevance_router,
-    {"initiate_relevance": "relevance_subgraph", "render_report": "render_report"},
-)
-graph_builder.add_edge("relevance_subgraph", "relevance_join")
-graph_builder.add_conditional_edges(
-    "relevance_join",
-    relevance_join_router,
-    {"render_report": "render_report", "end": END},
-)
-graph_builder.add_edge("render_report", END)
-graph_builder.add_edge("risk_updater", END)
-graph_builder.add_edge("elaborator", END)
-
-graph = graph_builder.compile()
+def build_graph(checkpointer=None):
+    """Compile the top-level workflow graph.
+
+    When a checkpointer is supplied it is shared with the scan and relevance
+    subgraphs, so an interrupted run resumes from its last completed superstep.
+    """
+    graph_builder = StateGraph(State)
+    graph_builder.add_node("trim_history", trim_history_node)
+    graph_builder.add_node("router", lambda _state: {})  # pass-through; routing happens on the edge
+    graph_builder.add_node("prepare_scan", prepare_scan_state)
+    graph_builder.add_node("scan_subgraph", build_scan_subgraph())
+    graph_builder.add_node("relevance_subgraph", build_relevance_subgraph())
+    graph_builder.add_node("refinement_subgraph", build_refinement_subgraph())
+    graph_builder.add_node("relevance_join", lambda _state: {})
+    graph_builder.add_node("render_report", render_report_node)
+    graph_builder.add_node("render_partial_report", render_partial_report_node)
+    graph_builder.add_node("risk_updater", risk_updater_node)
+    graph_builder.add_node("elaborator", elaborator_node)
+
+    graph_builder.add_edge(START, "trim_history")
+    graph_builder.add_edge("trim_history", "router")
+    graph_builder.add_conditional_edges(
+        "router",
+        router_node,
+        {
+            "initiate_web_search": "prepare_scan",
+            "risk_updater": "risk_updater",
+            "elaborator": "elaborator",
+        }
+    )
+
+    # Reset the previous scan's results in the parent state; see prepare_scan_state.
+    graph_builder.add_edge("prepare_scan", "scan_subgraph")
+    graph_builder.add_conditional_edges(
+        "scan_subgraph",
+        relevance_router,
+        {
+            "initiate_relevance": "relevance_subgraph",
+            "initiate_refinement": "refinement_subgraph",
+            "render_report": "render_report",
+        },
+    )
+    # With enable_refinement both subgraphs run in the same superstep; the join
+    # waits until every draft has been assessed and refined.
+    graph_builder.add_edge("relevance_subgraph", "relevance_join")
+    graph_builder.add_edge("refinement_subgraph", "relevance_join")
+    graph_builder.add_conditional_edges(
+        "relevance_join",
+        relevance_join_router,
+        {
+            "render_report": "render_report",
+            # First-K mode: partial register while the remaining drafts run.
+            "render_partial_report": "render_partial_report",
+            "initiate_relevance": "relevance_subgraph",
+            "end": END,
+        },
+    )
+    graph_builder.add_edge("render_report", END)
+    graph_builder.add_edge("render_partial_report", END)
+    graph_builder.add_edge("risk_updater", END)
+    graph_builder.add_edge("elaborator", END)
+
+    return graph_builder.compile(checkpointer=checkpointer)
+
+
+graph = build_graph(checkpointer=default_checkpointer())
@@ -0,0 +1,138 @@
+"""Bounded conversation history for long analyst sessions.
+
+``State.messages`` is append-only through ``add_messages``. Before each turn
+the ``trim_history`` node keeps the last few user turns verbatim, folds older
+turns into a cached rolling summary (``State.conversation_summary``) and
+removes them with ``RemoveMessage``. The latest full register is the only
+copy of a scan's output, so it is never removed, however old its turn. Full
+registers it supersedes are replaced in place by a one-line reference. A
+register listing only some risks (the change-only patch updates of older
+threads) supersedes nothing.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+
+REGISTER_HEADINGS = (
+    "# Risk Register",
+    "# Updated Risk Register",
+    "# Final Risk Register",
+)
+DEFAULT_HISTORY_TURNS = 6
+SUMMARY_MAX_LINES = 12
+
+_RISK_HEADING_RE = re.compile(r"^## Risk \d+:", re.MULTILINE)
+_REGISTER_SIZE_RE = re.compile(r"register now holds (\d+) risk")
+_QUESTION_CHARS = 160
+_ANSWER_CHARS = 120
+
+
+def _text(message: Any) -> str:
+    content = getattr(message, "content", "")
+    return content if isinstance(content, str) else str(content)
+
+
+def _truncate(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+def is_rendered_register(text: str) -> bool:
+    return text.lstrip().startswith(REGISTER_HEADINGS)
+
+
+def is_full_register(text: str) -> bool:
+    """A rendered register listing every risk, not just the changed ones."""
+    if not is_rendered_register(text):
+        return False
+    size = _REGISTER_SIZE_RE.search(text)
+    return size is None or len(_RISK_HEADING_RE.findall(text)) >= int(size.group(1))
+
+
+def _register_label(text: str) -> str:
+    count = len(_RISK_HEADING_RE.findall(text))
+    heading = text.lstrip().splitlines()[0].lstrip("# ").strip()
+    return f"{heading} with {count} risk(s)"
+
+
+def register_reference(text: str, reason: str = "superseded by a later register") -> str:
+    return f"[{_register_label(text)} omitted from history; {reason}.]"
+
+
+def _summary_line(question: str, answers: list[str]) -> str:
+    line = f"- User asked: {_truncate(question, _QUESTION_CHARS)}"
+    reply = next((answer for answer in reversed(answers) if answer.strip()), "")
+    if reply:
+        if is_rendered_register(reply):
+            reply = _register_label(reply)
+        line += f" → {_truncate(reply, _ANSWER_CHARS)}"
+    return line
+
+
+def fold_summary(
+    previous: str, older: list[Any], max_lines: int = SUMMARY_MAX_LINES
+) -> str:
+    """Append one line per folded turn to ``previous``, keeping the last ``max_lines``."""
+    lines = [line for line in (previous or "").splitlines() if line.strip()]
+    question: str | None = None
+    answers: list[str] = []
+    for message in older:
+        if isinstance(message, HumanMessage):
+            if question is not None:
+                lines.append(_summary_line(question, answers))
+            question, answers = _text(message), []
+        elif isinstance(message, AIMessage) and question is not None:
+            answers.append(_text(message))
+    if question is not None:
+        lines.append(_summary_line(question, answers))
+    return "\n".join(lines[-max_lines:])
+
+
+def split_window(messages: list[Any], max_turns: int) -> tuple[list[Any], list[Any]]:
+    """Split ``messages`` into (older, recent), keeping the last ``max_turns`` user turns."""
+    starts = [i for i, m in enumerate(messages) if isinstance(m, HumanMessage)]
+    cut = starts[-max_turns] if max_turns > 0 and len(starts) > max_turns else 0
+    return messages[:cut], messages[cut:]
+
+
+def plan_history_update(
+    messages: list[Any],
+    summary: str = "",
+    max_turns: int = DEFAULT_HISTORY_TURNS,
+) -> dict[str, Any]:
+    """State update that bounds ``messages``; empty when nothing changes.
+
+    Turns beyond the last ``max_turns`` user turns are summarized and removed,
+    except for the latest full register; earlier full registers inside the
+    window are replaced by references. Messages without an id (never stored
+    by ``add_messages``) are left alone.
+    """
+    older, _recent = split_window(messages, max_turns)
+    cut = len(older)
+    registers = [
+        i
+        for i, message in enumerate(messages)
+        if isinstance(message, AIMessage) and is_full_register(_text(message))
+    ]
+    latest = registers[-1] if registers else None
+    updates: list[Any] = [
+        RemoveMessage(id=m.id) for i, m in enumerate(older) if m.id and i != latest
+    ]
+
+    for i in registers[:-1]:
+        message = messages[i]
+        if i >= cut and message.id:
+            updates.append(
+                AIMessage(content=register_reference(_text(message)), id=message.id)
+            )
+
+    if not updates:
+        return {}
+    out: dict[str, Any] = {"messages": updates}
+    if older:
+        out["conversation_summary"] = fold_summary(summary, older)
+    return out
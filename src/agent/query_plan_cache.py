@@ -0,0 +1,183 @@
+"""Cache of web search query plans per taxonomy and day.
+
+Query generation is a model round trip per taxonomy per scan, yet its output
+barely changes within a day. Plans are cached under the taxonomy, the scan's
+UTC date and a hash of the prompt that produced them, and reused for
+``query_plan_max_age_hours`` (see ``agent.configuration``).
+
+Plans live in process memory; set ``ERF_QUERY_PLAN_CACHE`` to a JSON file
+path to share them across processes and manage them from the command line::
+
+    python -m agent.query_plan_cache list
+    python -m agent.query_plan_cache clear --taxonomy "Climate" --date 2026-10-19
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+QUERY_PLAN_CACHE_ENV = "ERF_QUERY_PLAN_CACHE"
+
+
+def prompt_version(*templates: str) -> str:
+    """Short hash of the prompt templates behind a plan; editing them invalidates it."""
+    digest = hashlib.sha256("\x1f".join(templates).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def _key(taxonomy: str, today_iso: str, version: str) -> str:
+    return f"{taxonomy.strip().lower()}|{today_iso}|{version}"
+
+
+class QueryPlanCache:
+    """Query plans keyed by taxonomy, date and prompt version.
+
+    With a ``path`` the cache is persisted as JSON after every write and
+    reloaded when the file changes, so invalidations made from the CLI reach
+    running processes. The least recently used plans are dropped beyond
+    ``max_entries``.
+    """
+
+    def __init__(self, path: str | Path | None = None, max_entries: int = 1024) -> None:
+        self.path = Path(path) if path else None
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._mtime: float | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> QueryPlanCache:
+        return cls(os.environ.get(QUERY_PLAN_CACHE_ENV, "").strip() or None)
+
+    def _refresh(self) -> None:
+        if self.path is None:
+            return
+        mtime = self.path.stat().st_mtime if self.path.exists() else None
+        if mtime == self._mtime:
+            return
+        self._entries = (
+            OrderedDict(json.loads(self.path.read_text(encoding="utf-8")))
+            if mtime is not None
+            else OrderedDict()
+        )
+        self._mtime = mtime
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self._entries, indent=1), encoding="utf-8")
+        tmp.replace(self.path)
+        self._mtime = self.path.stat().st_mtime
+
+    def get(
+        self,
+        taxonomy: str,
+        today_iso: str,
+        version: str,
+        max_queries: int,
+        max_age_hours: float,
+        now: float | None = None,
+    ) -> list[str] | None:
+        """Cached queries, or None when missing, stale or planned for fewer queries."""
+        if max_age_hours <= 0:
+            return None
+        with self._lock:
+            self._refresh()
+            key = _key(taxonomy, today_iso, version)
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+        if not entry or int(entry.get("max_queries") or 0) < max_queries:
+            return None
+        age = (time.time() if now is None else now) - float(entry.get("created_at") or 0)
+        if age > max_age_hours * 3600:
+            return None
+        return list(entry.get("queries") or [])
+
+    def put(
+        self,
+        taxonomy: str,
+        today_iso: str,
+        version: str,
+        queries: list[str],
+        max_queries: int,
+        now: float | None = None,
+    ) -> None:
+        entry = {
+            "taxonomy": taxonomy,
+            "today_iso": today_iso,
+            "prompt_version": version,
+            "max_queries": max_queries,
+            "queries": list(queries),
+            "created_at": time.time() if now is None else now,
+        }
+        with self._lock:
+            self._refresh()
+            key = _key(taxonomy, today_iso, version)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def entries(self) -> list[dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return [dict(entry) for entry in self._entries.values()]
+
+    def invalidate(self, taxonomy: str | None = None, today_iso: str | None = None) -> int:
+        """Drop plans matching the filters (all plans when none given); return the count."""
+        with self._lock:
+            self._refresh()
+            dropped = [
+                key
+                for key, entry in self._entries.items()
+                if (taxonomy is None or entry["taxonomy"].lower() == taxonomy.strip().lower())
+                and (today_iso is None or entry["today_iso"] == today_iso)
+            ]
+            for key in dropped:
+                del self._entries[key]
+            if dropped:
+                self._save()
+        return len(dropped)
+
+
+def _main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or invalidate cached query plans.")
+    parser.add_argument("--path", default=os.environ.get(QUERY_PLAN_CACHE_ENV))
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("list", help="print cached plans")
+    show.add_argument("--taxonomy")
+    clear = sub.add_parser("clear", help="drop cached plans (all, or matching the filters)")
+    clear.add_argument("--taxonomy")
+    clear.add_argument("--date", help="UTC date the plans were made for (YYYY-MM-DD)")
+    args = parser.parse_args(argv)
+    if not args.path:
+        parser.error(f"pass --path or set {QUERY_PLAN_CACHE_ENV}")
+
+    cache = QueryPlanCache(args.path)
+    if args.command == "clear":
+        print(json.dumps({"dropped": cache.invalidate(args.taxonomy, args.date)}))  # noqa: T201
+        return 0
+
+    now = time.time()
+    for entry in sorted(cache.entries(), key=lambda e: (e["today_iso"], e["taxonomy"])):
+        if args.taxonomy and entry["taxonomy"].lower() != args.taxonomy.lower():
+            continue
+        entry["age_hours"] = round((now - float(entry["created_at"])) / 3600, 2)
+        print(json.dumps(entry))  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
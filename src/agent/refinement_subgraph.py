@@ -0,0 +1,22 @@
+from langgraph.graph import StateGraph, START, END
+
+from schemas import RefinementSubgraphOutput, State
+from nodes.initiate_parallel_refinement_node import initiate_parallel_refinement
+from nodes.refine_single_risk_node import refine_single_risk_node
+
+
+def build_refinement_subgraph(checkpointer=None):
+    """Compile the refinement fan-out; see ``build_scan_subgraph`` for ``checkpointer``."""
+    refinement_builder = StateGraph(State, output_schema=RefinementSubgraphOutput)
+    refinement_builder.add_node("initiate_refinement", lambda _state: {})
+    refinement_builder.add_node("refine_single_risk", refine_single_risk_node)
+
+    refinement_builder.add_edge(START, "initiate_refinement")
+    refinement_builder.add_conditional_edges(
+        "initiate_refinement",
+        initiate_parallel_refinement,
+        ["refine_single_risk"],
+    )
+    refinement_builder.add_edge("refine_single_risk", END)
+
+    return refinement_builder.compile(name="refinement_subgraph", checkpointer=checkpointer)
@@ -1,13 +1,14 @@
 from langgraph.graph import StateGraph, START, END
 
-from schemas import State
+from schemas import RelevanceSubgraphOutput, State
 from nodes.initiate_parallel_relevance_node import initiate_parallel_relevance
 from nodes.assess_portfolio_relevance_node import assess_portfolio_relevance_node
 
 
-def build_relevance_subgraph():
-    relevance_builder = StateGraph(State)
-    relevance_builder.add_node("initiate_relevance", lambda state: state)
+def build_relevance_subgraph(checkpointer=None):
+    """Compile the relevance fan-out; see ``build_scan_subgraph`` for ``checkpointer``."""
+    relevance_builder = StateGraph(State, output_schema=RelevanceSubgraphOutput)
+    relevance_builder.add_node("initiate_relevance", lambda _state: {})
     relevance_builder.add_node(
         "assess_portfolio_relevance",
         assess_portfolio_relevance_node,
@@ -21,4 +22,4 @@ def build_relevance_subgraph():
     )
     relevance_builder.add_edge("assess_portfolio_relevance", END)
 
-    return relevance_builder.compile(name="relevance_subgraph")
+    return relevance_builder.compile(name="relevance_subgraph", checkpointer=checkpointer)
@@ -0,0 +1,381 @@
+"""Local fast-path routing in front of the LLM router.
+
+Obvious requests ("run a scan", "update risk 3") are classified by keyword
+rules, then by an optional hashed n-gram logistic-regression model trained
+from logged router decisions. Anything not classified confidently is left to
+``RouterAgent``'s LLM call.
+
+Set ``ERF_ROUTER_LOG`` to a JSONL path to record LLM router decisions, and
+``ERF_ROUTER_MODEL`` to load a model trained from them::
+
+    python -m agent.routing train .router/decisions.jsonl --out .router/model.json
+    python -m agent.routing evaluate .router/decisions.jsonl --model .router/model.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+ROUTES = ("scan", "update", "qna")
+ROUTER_LOG_ENV = "ERF_ROUTER_LOG"
+ROUTER_MODEL_ENV = "ERF_ROUTER_MODEL"
+
+_SCAN_RULES = (
+    re.compile(r"^\s*(?:please\s+)?(?:re-?)?scan\b", re.IGNORECASE),
+    re.compile(
+        r"\b(?:can|could|would|will|please|let's|lets|you|we)\s+(?:you\s+)?(?:re-?)?scan\b",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"\b(?:run|start|perform|kick\s+off|launch)\b(?:\s+\w+){0,3}\s+(?:re-?)?scan\b",
+        re.IGNORECASE,
+    ),
+    re.compile(r"\bdo\s+an?(?:other)?\s+(?:\w+\s+)?scan\b", re.IGNORECASE),
+    re.compile(
+        r"\b(?:generate|create|build|produce|draft)\b(?:\s+\w+){0,3}\s+"
+        r"(?:risk\s+register|risks|emerging\s+risks)\b",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"\b(?:new|fresh|full)\s+(?:risk\s+)?(?:scan|register)\b", re.IGNORECASE
+    ),
+)
+_UPDATE_RULES = (
+    re.compile(
+        r"\b(?:update|refresh|revise|amend|edit|modify|reword|rename|remove|delete|drop)\b"
+        r"(?:\s+\w+){0,3}\s+(?:risks?|register|signposts?|status(?:es)?)\b",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"\b(?:update|revise|edit|remove|delete|drop)\s+(?:risk\s+)?#?\d+\b",
+        re.IGNORECASE,
+    ),
+    re.compile(r"\b(?:update|refresh)\s+(?:it|this|them)\b", re.IGNORECASE),
+)
+# Phrases the router prompt maps to "update" even when phrased as a question.
+_UPDATE_QUESTION_RULES = (
+    re.compile(r"\b(?:what\s+(?:has\s+)?changed|latest\s+changes)\b", re.IGNORECASE),
+)
+_QUESTION_START = re.compile(
+    r"^\s*(?:what|why|how|which|who|when|where|is|are|was|were|does|do|did|"
+    r"can\s+you\s+explain|explain|tell\s+me|describe|summari[sz]e|compare)\b",
+    re.IGNORECASE,
+)
+# Polite or modal openings ("could you merge...", "should we downgrade...",
+# "any updates on...") are usually requests, whatever the punctuation.
+_REQUEST_START = re.compile(
+    r"^\s*(?:can|could|would|will|should|shall|may|might|please|any|let'?s)\b",
+    re.IGNORECASE,
+)
+# Register edits the update rules do not name; a question containing one is
+# left to the LLM router ("how about adding a risk on ...?").
+_EDIT_VERBS = re.compile(
+    r"\b(?:add|adding|merge|merging|combine|split|insert|include|downgrade|upgrade|"
+    r"raise|lower|change|move|reclassify|re-?rate)\b",
+    re.IGNORECASE,
+)
+
+# A scan or update hit is deferred when these appear just before the verb
+# ("don't run a scan"), when the text asks something anywhere, or when
+# another intent is mentioned too ("summarise the register then scan again").
+_NEGATION = re.compile(
+    r"\b(?:don'?t|do\s+not|does\s+not|doesn'?t|not|never|no\s+need|without|instead\s+of)\b",
+    re.IGNORECASE,
+)
+_NEGATION_WINDOW = 6  # words before the matched verb
+_QUESTION_WORD = re.compile(r"\b(?:what|why|how|which|who|when|where)\b", re.IGNORECASE)
+_INTENT_MENTIONS = {
+    "scan": re.compile(r"\b(?:re-?)?scan(?:s|ning)?\b", re.IGNORECASE),
+    "update": re.compile(
+        r"\b(?:update|refresh|revise|amend|edit|modify|rename|remove|delete|drop)\b",
+        re.IGNORECASE,
+    ),
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _rule_hits(rules: Iterable[re.Pattern], text: str) -> list[re.Match]:
+    return [match for rule in rules for match in rule.finditer(text)]
+
+
+def _negated(text: str, match: re.Match) -> bool:
+    before = text[: match.start()].split()[-_NEGATION_WINDOW:]
+    return bool(_NEGATION.search(" ".join(before)))
+
+
+def rule_route(query: str) -> tuple[str | None, float]:
+    """Classify ``query`` by keyword rules; ``(None, 0.0)`` when unsure.
+
+    Scan and update rules only decide plain imperative requests. A hit is
+    deferred when it is negated ("don't run a scan"), when the text asks a
+    question anywhere ("scan results look odd - why is risk 2 high?"), or
+    when more than one intent is mentioned. Questions opening with a
+    question word are Q&A unless they mention a scan or a register edit.
+    Polite or modal requests ("could you merge risks 2 and 3?") are always
+    deferred.
+    """
+    text = (query or "").strip()
+    if not text:
+        return None, 0.0
+    scan_hits = _rule_hits(_SCAN_RULES, text)
+    update_hits = _rule_hits(_UPDATE_RULES, text)
+    if any(_negated(text, match) for match in (*scan_hits, *update_hits)):
+        return None, 0.0
+    mentioned = {route for route, pattern in _INTENT_MENTIONS.items() if pattern.search(text)}
+    if any(rule.search(text) for rule in _UPDATE_QUESTION_RULES):
+        return (None, 0.0) if "scan" in mentioned else ("update", 0.9)
+    question = bool(_QUESTION_START.search(text))
+    if scan_hits or update_hits:
+        asks = question or "?" in text or bool(_QUESTION_WORD.search(text))
+        if asks or len(mentioned | {"scan" if scan_hits else "update"}) > 1:
+            return None, 0.0
+        return ("scan" if scan_hits else "update"), 0.95
+    if _REQUEST_START.search(text) and not text.lower().startswith("can you explain"):
+        return None, 0.0
+    if question and not mentioned and not _EDIT_VERBS.search(text):
+        return "qna", 0.9
+    return None, 0.0
+
+
+def _features(query: str, buckets: int) -> dict[int, float]:
+    tokens = _TOKEN_RE.findall((query or "").lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    counts: dict[int, float] = {}
+    for gram in grams:
+        bucket = zlib.crc32(gram.encode("utf-8")) % buckets
+        counts[bucket] = counts.get(bucket, 0.0) + 1.0
+    if not counts:
+        return counts
+    norm = math.sqrt(sum(value * value for value in counts.values()))
+    return {bucket: value / norm for bucket, value in counts.items()}
+
+
+class HashedNgramRouteModel:
+    """Multinomial logistic regression over hashed word 1-2 grams."""
+
+    def __init__(self, buckets: int = 1 << 16) -> None:
+        self.buckets = buckets
+        self.weights: dict[str, dict[int, float]] = {route: {} for route in ROUTES}
+        self.bias: dict[str, float] = {route: 0.0 for route in ROUTES}
+
+    def _scores(self, features: Mapping[int, float]) -> dict[str, float]:
+        logits = {
+            route: self.bias[route]
+            + sum(
+                self.weights[route].get(bucket, 0.0) * value
+                for bucket, value in features.items()
+            )
+            for route in ROUTES
+        }
+        top = max(logits.values())
+        exp = {route: math.exp(logit - top) for route, logit in logits.items()}
+        total = sum(exp.values())
+        return {route: value / total for route, value in exp.items()}
+
+    def predict(self, query: str) -> tuple[str, float]:
+        scores = self._scores(_features(query, self.buckets))
+        route = max(scores, key=scores.__getitem__)
+        return route, scores[route]
+
+    def fit(
+        self,
+        examples: Iterable[tuple[str, str]],
+        epochs: int = 20,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+        seed: int = 13,
+    ) -> HashedNgramRouteModel:
+        data = [
+            (_features(query, self.buckets), route)
+            for query, route in examples
+            if route in ROUTES
+        ]
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(data)
+            for features, label in data:
+                scores = self._scores(features)
+                for route in ROUTES:
+                    gradient = scores[route] - (1.0 if route == label else 0.0)
+                    weights = self.weights[route]
+                    for bucket, value in features.items():
+                        current = weights.get(bucket, 0.0)
+                        weights[bucket] = current - learning_rate * (
+                            gradient * value + l2 * current
+                        )
+                    self.bias[route] -= learning_rate * gradient
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "buckets": self.buckets,
+            "bias": self.bias,
+            "weights": {
+                route: {
+                    str(bucket): round(value, 6)
+                    for bucket, value in weights.items()
+                    if value
+                }
+                for route, weights in self.weights.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, Any]) -> HashedNgramRouteModel:
+        model = cls(int(payload.get("buckets") or 1 << 16))
+        model.bias.update(
+            {
+                route: float(value)
+                for route, value in dict(payload.get("bias") or {}).items()
+            }
+        )
+        for route, weights in dict(payload.get("weights") or {}).items():
+            if route in model.weights:
+                model.weights[route] = {
+                    int(bucket): float(value) for bucket, value in weights.items()
+                }
+        return model
+
+    def save(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str | Path) -> HashedNgramRouteModel:
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+def classify_route(
+    query: str,
+    model: HashedNgramRouteModel | None = None,
+    min_confidence: float = 0.9,
+) -> dict[str, Any]:
+    """Return ``{"route", "confidence", "source"}``; ``route`` is None to defer.
+
+    Rule and model hits both need ``min_confidence``.
+    """
+    route, confidence = rule_route(query)
+    if route is not None and confidence >= min_confidence:
+        return {"route": route, "confidence": confidence, "source": "rules"}
+    if model is not None and (query or "").strip():
+        route, confidence = model.predict(query)
+        if confidence >= min_confidence:
+            return {
+                "route": route,
+                "confidence": round(confidence, 4),
+                "source": "model",
+            }
+    return {"route": None, "confidence": 0.0, "source": "llm"}
+
+
+class RouterMetrics:
+    """Thread-safe fast-path hit rate and fast-path/LLM agreement counters."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.fast_path = 0
+        self.by_source: dict[str, int] = {}
+        self.compared = 0
+        self.agreed = 0
+
+    def record(
+        self, source: str, fast_route: str | None, llm_route: str | None
+    ) -> None:
+        with self._lock:
+            self.turns += 1
+            self.by_source[source] = self.by_source.get(source, 0) + 1
+            if fast_route is not None:
+                self.fast_path += 1
+            if fast_route is not None and llm_route is not None:
+                self.compared += 1
+                self.agreed += int(fast_route == llm_route)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "fast_path": self.fast_path,
+                "hit_rate": round(self.fast_path / self.turns, 4)
+                if self.turns
+                else 0.0,
+                "by_source": dict(self.by_source),
+                "compared": self.compared,
+                "agreement": round(self.agreed / self.compared, 4)
+                if self.compared
+                else None,
+            }
+
+
+def log_decision(query: str, route: str, source: str, path: str | None = None) -> None:
+    """Append a router decision to ``ERF_ROUTER_LOG`` (no-op when unset)."""
+    path = path or os.environ.get(ROUTER_LOG_ENV, "").strip()
+    if not path or not (query or "").strip():
+        return
+    log_path = Path(path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with log_path.open("a", encoding="utf-8") as handle:
+        handle.write(
+            json.dumps({"query": query, "route": route, "source": source}) + "\n"
+        )
+
+
+def read_decisions(
+    path: str | Path, sources: tuple[str, ...] = ("llm",)
+) -> list[tuple[str, str]]:
+    """Read ``(query, route)`` training pairs from a decision log."""
+    examples: list[tuple[str, str]] = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if record.get("source", "llm") in sources and record.get("route") in ROUTES:
+            examples.append((str(record.get("query") or ""), record["route"]))
+    return examples
+
+
+def _main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Train or evaluate the fast-path route model."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    train = sub.add_parser("train", help="fit a model on logged LLM router decisions")
+    train.add_argument("log")
+    train.add_argument("--out", required=True)
+    train.add_argument("--epochs", type=int, default=20)
+    evaluate = sub.add_parser(
+        "evaluate", help="report fast-path coverage and agreement on a log"
+    )
+    evaluate.add_argument("log")
+    evaluate.add_argument("--model")
+    evaluate.add_argument("--min-confidence", type=float, default=0.9)
+    args = parser.parse_args(argv)
+
+    examples = read_decisions(args.log)
+    if args.command == "train":
+        HashedNgramRouteModel().fit(examples, epochs=args.epochs).save(args.out)
+        print(json.dumps({"examples": len(examples), "model": args.out}))  # noqa: T201
+        return 0
+
+    model = HashedNgramRouteModel.load(args.model) if args.model else None
+    metrics = RouterMetrics()
+    for query, route in examples:
+        decision = classify_route(query, model, args.min_confidence)
+        metrics.record(decision["source"], decision["route"], route)
+    print(json.dumps(metrics.snapshot(), indent=2))  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(_main())
@@ -5,34 +5,53 @@ from nodes.verify_sources_node import verify_sources_node
 from nodes.compare_events_node import compare_events_node
 from nodes.summarize_events_node import summarize_events_node
 from nodes.initiate_parallel_web_search_node import initiate_parallel_web_search
+from nodes.plan_web_search_node import plan_web_search_node
 from nodes.web_search_node import web_search_node
-from nodes.web_search_join_node import web_search_join_router
+from nodes.web_search_join_node import web_search_join_node, web_search_join_router
 
 
-def _prepare_scan_state(state: State):
+def prepare_scan_state(state: State):
+    """Clear the previous scan's results.
+
+    Runs in the parent graph before the scan subgraph as well as inside it:
+    the subgraph's output is merged back through the parent's reducers, so
+    a reset made only inside the subgraph would be appended to the old
+    values of a thread that already ran a scan.
+    """
     return {
-        # Ensure keys exist before parallel fan-out
-        "taxonomy_reports": [],
+        # None resets the appending reducers (taxonomy_reports, source_store,
+        # finalized_risks, refined_risks); the other keys are overwritten.
+        "taxonomy_reports": None,
         "verified_taxonomy_reports": [],
+        "source_store": None,
+        "web_query_plan": {},
         "event_clusters": [],
         "draft_risks": [],
-        "finalized_risks": [],
+        "finalized_risks": None,
+        "refined_risks": None,
         "attempts": state.get("attempts", 0),
     }
 
 
-def build_scan_subgraph():
+def build_scan_subgraph(checkpointer=None):
+    """Compile the scan subgraph.
+
+    ``checkpointer=None`` inherits the parent graph's checkpointer, which is
+    what makes interrupted runs resumable inside the subgraph.
+    """
     scan_builder = StateGraph(State)
-    scan_builder.add_node("initiate_web_search", _prepare_scan_state)
+    scan_builder.add_node("initiate_web_search", prepare_scan_state)
+    scan_builder.add_node("plan_web_search", plan_web_search_node)
     scan_builder.add_node("web_search", web_search_node)
-    scan_builder.add_node("web_search_join", lambda state: state)
+    scan_builder.add_node("web_search_join", web_search_join_node)
     scan_builder.add_node("verify_sources", verify_sources_node)
     scan_builder.add_node("compare_events", compare_events_node)
     scan_builder.add_node("summarize_events", summarize_events_node)
 
     scan_builder.add_edge(START, "initiate_web_search")
+    scan_builder.add_edge("initiate_web_search", "plan_web_search")
     scan_builder.add_conditional_edges(
-        "initiate_web_search",
+        "plan_web_search",
         initiate_parallel_web_search,
         ["web_search"],
     )
@@ -46,4 +65,4 @@ def build_scan_subgraph():
     scan_builder.add_edge("compare_events", "summarize_events")
     scan_builder.add_edge("summarize_events", END)
 
-    return scan_builder.compile(name="scan_subgraph")
+    return scan_builder.compile(name="scan_subgraph", checkpointer=checkpointer)
@@ -0,0 +1,101 @@
+"""Incremental output on LangGraph's ``custom`` stream channel.
+
+Nodes still return the complete markdown in their state update; the chunks
+written here let ``graph.stream(..., stream_mode="custom")`` clients show a
+large register while it is being rendered.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Iterable
+
+
+def _noop_writer(_chunk: Any) -> None:
+    return None
+
+
+def stream_writer() -> Callable[[Any], None]:
+    """Return the current run's stream writer, or a no-op outside a run."""
+    try:
+        from langgraph.config import get_stream_writer
+
+        return get_stream_writer()
+    except (ImportError, RuntimeError):
+        return _noop_writer
+
+
+class MarkdownStream:
+    """Collects markdown chunks and emits each one as it is produced.
+
+    Each chunk is written as ``{"type": "markdown", "stream": <name>,
+    "index": <n>, "chunk": <text>}``; ``text()`` returns the chunks joined
+    with newlines, matching the non-streaming renderers. A chunk with index 0
+    after earlier chunks means the document restarted.
+    """
+
+    def __init__(self, name: str, writer: Callable[[Any], None] | None = None) -> None:
+        self.name = name
+        self._writer = writer or stream_writer()
+        self._chunks: list[str] = []
+
+    def write(self, chunk: str) -> None:
+        self._writer(
+            {
+                "type": "markdown",
+                "stream": self.name,
+                "index": len(self._chunks),
+                "chunk": chunk,
+            }
+        )
+        self._chunks.append(chunk)
+
+    def extend(self, chunks: Iterable[str]) -> MarkdownStream:
+        for chunk in chunks:
+            self.write(chunk)
+        return self
+
+    def sync(self, chunks: Iterable[str]) -> MarkdownStream:
+        """Bring the stream up to date with ``chunks``, writing only new ones.
+
+        When the chunks already written are not a prefix of ``chunks`` (the
+        content changed), the stream restarts and indices begin again at 0.
+        """
+        chunks = list(chunks)
+        written = len(self._chunks)
+        if chunks[:written] != self._chunks:
+            self._chunks = []
+            written = 0
+        return self.extend(chunks[written:])
+
+    def text(self) -> str:
+        return "\n".join(self._chunks)
+
+
+class TextDeltaStream:
+    """Emits the growth of a text field across partial structured outputs.
+
+    Partial-JSON parsing yields the full text seen so far on every chunk;
+    only the new suffix is written, as ``{"type": "token", "stream": <name>,
+    "delta": <text>}``. If a later snapshot does not extend the previous one,
+    the whole snapshot is re-sent with ``"reset": True``.
+    """
+
+    def __init__(self, name: str, writer: Callable[[Any], None] | None = None) -> None:
+        self.name = name
+        self._writer = writer or stream_writer()
+        self._text = ""
+
+    def update(self, text: str) -> None:
+        text = text or ""
+        if text == self._text:
+            return
+        if text.startswith(self._text):
+            event = {"type": "token", "stream": self.name, "delta": text[len(self._text):]}
+        else:
+            event = {"type": "token", "stream": self.name, "delta": text, "reset": True}
+        self._writer(event)
+        self._text = text
+
+    @property
+    def text(self) -> str:
+        return self._text
@@ -6,12 +6,19 @@ from .citation_normalization_tool import CitationNormalizationTool
 from .citation_selection_tool import CitationSelectionTool
 from .compare_input_formatting_tool import CompareInputFormattingTool
 from .conversation_context_tool import ConversationContextTool
+from .draft_priority_tool import DraftPriorityTool
 from .event_evidence_filter_tool import EventEvidenceFilterTool
 from .event_to_risk_source_tool import EventToRiskSourceTool
+from .query_plan_tool import QueryPlanTool
+from .refinement_merge_tool import RefinementMergeTool
 from .risk_deduplication_tool import RiskDeduplicationTool
 from .risk_markdown_render_tool import RiskMarkdownRenderTool
+from .risk_patch_tool import RiskPatchTool
+from .risk_retrieval_tool import RiskRetrievalTool
+from .route_classifier_tool import RouteClassifierTool
 from .signposts import SignpostAssemblyTool
 from .source_reliability_merge_tool import SourceReliabilityMergeTool
+from .source_store_tool import SourceStoreTool
 from .source_verification_formatting_tool import SourceVerificationFormattingTool
 from .taxonomy_brief_formatting_tool import TaxonomyBriefFormattingTool
 from .update_render_tool import UpdateRenderTool
@@ -23,15 +30,22 @@ __all__ = [
     "TaxonomyBriefFormattingTool",
     "SourceVerificationFormattingTool",
     "SourceReliabilityMergeTool",
+    "SourceStoreTool",
     "CompareInputFormattingTool",
     "EventEvidenceFilterTool",
+    "DraftPriorityTool",
     "EventToRiskSourceTool",
     "CitationSelectionTool",
     "CitationNormalizationTool",
+    "QueryPlanTool",
+    "RefinementMergeTool",
     "RiskDeduplicationTool",
     "AuditTrailTool",
     "RiskMarkdownRenderTool",
+    "RiskPatchTool",
+    "RiskRetrievalTool",
     "ConversationContextTool",
+    "RouteClassifierTool",
     "UpdateRenderTool",
     "SignpostAssemblyTool",
 ]
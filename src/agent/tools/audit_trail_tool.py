@@ -1,17 +1,13 @@
 from __future__ import annotations
 
-import re
 from typing import Any
 
 from agent.tools.base import KwargTool
+from agent.tools.citation_engine import count_numbered_steps
 
 
 def _next_step_number(reasoning: str) -> int:
-    count = 0
-    for line in (reasoning or "").splitlines():
-        if re.match(r"^\s*\d+\.\s", line):
-            count += 1
-    return count + 1
+    return count_numbered_steps(reasoning) + 1
 
 
 def _append_step(reasoning: str, title: str, text: str) -> str:
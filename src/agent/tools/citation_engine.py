@@ -0,0 +1,244 @@
+"""Single-pass citation parsing, selection and renumbering.
+
+A risk's narrative and reasoning trace are scanned once into citation tokens
+with character offsets; selection, renumbering and validation (dangling and
+uncited references) all work from that parsed form. All patterns are compiled
+once at import time.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping, NamedTuple
+
+CITATION_PATTERN = re.compile(r"\[(\d+)\]")
+NUMBERED_STEP_PATTERN = re.compile(r"^[ \t\f\v]*\d+\.[ \t\f\v]", re.MULTILINE)
+
+
+def count_numbered_steps(text: str) -> int:
+    return len(NUMBERED_STEP_PATTERN.findall(text or ""))
+
+
+class ParsedText:
+    """Text with the offsets of its ``[n]`` citation markers."""
+
+    __slots__ = ("text", "tokens")
+
+    def __init__(self, text: str, tokens: list[tuple[int, int, int]]) -> None:
+        self.text = text
+        self.tokens = tokens  # (citation index, start, end)
+
+    @classmethod
+    def parse(cls, text: str) -> ParsedText:
+        text = text or ""
+        if "[" not in text:
+            return cls(text, [])
+        return cls(
+            text,
+            [(int(m.group(1)), m.start(), m.end()) for m in CITATION_PATTERN.finditer(text)],
+        )
+
+    def indices(self) -> list[int]:
+        return sorted({index for index, _, _ in self.tokens})
+
+    def renumber(self, mapping: Mapping[int, int], drop: Iterable[int] = ()) -> str:
+        """Rewrite markers through ``mapping`` and remove those in ``drop``.
+
+        Other unmapped markers are left as-is.
+        """
+        if not self.tokens:
+            return self.text
+        drop = set(drop)
+        parts: list[str] = []
+        cursor = 0
+        for index, start, end in self.tokens:
+            if index in drop:
+                parts.append(self.text[cursor:start].rstrip(" "))
+                cursor = end
+                continue
+            new_index = mapping.get(index)
+            if new_index is None or new_index == index:
+                continue
+            parts.append(self.text[cursor:start])
+            parts.append(f"[{new_index}]")
+            cursor = end
+        if not parts:
+            return self.text
+        parts.append(self.text[cursor:])
+        return "".join(parts)
+
+
+class SourceEntry(NamedTuple):
+    index: int
+    text: str
+    explicit: bool  # True when the entry carried its own "n." prefix
+
+
+def _parse_source_entry(entry: Any, position: int) -> SourceEntry:
+    if not isinstance(entry, str):
+        return SourceEntry(position, str(entry).strip(), False)
+    stripped = entry.strip()
+    head, dot, tail = stripped.partition(".")
+    if dot:
+        head = head.strip()
+        tail = tail.strip()
+        if tail and head.isascii() and head.isdigit():
+            return SourceEntry(int(head), tail, True)
+    return SourceEntry(position, stripped, False)
+
+
+def parse_source_entries(sources: Iterable[Any]) -> list[SourceEntry]:
+    """Parse ``"n. text"`` entries; unnumbered entries take their list position."""
+    return [_parse_source_entry(entry, position) for position, entry in enumerate(sources, start=1)]
+
+
+@dataclass(frozen=True)
+class CitationReport:
+    cited: list[int]
+    dangling: list[int]  # cited in text, but no source with that number
+    uncited: list[int]  # listed as a source, never cited
+
+
+class ParsedRisk:
+    """Narrative, reasoning trace and source list of one risk, parsed once."""
+
+    __slots__ = ("risk", "narrative", "reasoning", "_sources")
+
+    def __init__(self, risk: Mapping[str, Any]) -> None:
+        self.risk = risk
+        self.narrative = ParsedText.parse(str(risk.get("narrative") or ""))
+        self.reasoning = ParsedText.parse(str(risk.get("reasoning_trace") or ""))
+        self._sources: list[SourceEntry] | None = None
+
+    @classmethod
+    def from_text(
+        cls,
+        narrative: str,
+        reasoning: str = "",
+        sources: Iterable[Any] = (),
+    ) -> ParsedRisk:
+        return cls({"narrative": narrative, "reasoning_trace": reasoning, "sources": list(sources)})
+
+    @property
+    def sources(self) -> list[SourceEntry]:
+        if self._sources is None:
+            self._sources = parse_source_entries(self.risk.get("sources") or [])
+        return self._sources
+
+    def cited_indices(self) -> list[int]:
+        return sorted(
+            {index for index, _, _ in self.narrative.tokens}
+            | {index for index, _, _ in self.reasoning.tokens}
+        )
+
+    def report(self) -> CitationReport:
+        cited = self.cited_indices()
+        available = {entry.index for entry in self.sources if entry.text}
+        return CitationReport(
+            cited=cited,
+            dangling=[index for index in cited if index not in available],
+            uncited=sorted(available.difference(cited)),
+        )
+
+    def _resolve(
+        self,
+        source_pool: Iterable[Any] | None,
+        source_map: Mapping[int, str] | None,
+    ) -> tuple[list[SourceEntry], list[int]]:
+        indices = self.cited_indices()
+        if not indices:
+            return [], []
+        pool = self.sources if source_pool is None else parse_source_entries(source_pool)
+        by_number = dict(source_map or {})
+        # A source_map is authoritative: its numbers may be sparse, so the
+        # pool's n-th entry is not source [n].
+        positional = not by_number
+        if not by_number:
+            by_number = {entry.index: entry.text for entry in pool if entry.explicit}
+        selected: list[SourceEntry] = []
+        dangling: list[int] = []
+        for index in indices:
+            if index in by_number:
+                selected.append(SourceEntry(index, by_number[index], True))
+            elif positional and 1 <= index <= len(pool):
+                selected.append(SourceEntry(index, pool[index - 1].text, True))
+            else:
+                dangling.append(index)
+        return selected, dangling
+
+    def select(
+        self,
+        source_pool: Iterable[Any] | None = None,
+        source_map: Mapping[int, str] | None = None,
+    ) -> list[str]:
+        """Return ``"n. text"`` entries for the cited indices only.
+
+        With a ``source_map`` only its numbers resolve. Otherwise the lookup
+        order is explicitly numbered entries of the pool, then the pool's n-th
+        entry. The pool defaults to the risk's sources.
+        """
+        selected, _ = self._resolve(source_pool, source_map)
+        return [f"{entry.index}. {entry.text}" for entry in selected]
+
+    def _renumbered(self, entries: list[SourceEntry], drop: Iterable[int] = ()) -> dict[str, Any]:
+        old_to_new = {entry.index: new for new, entry in enumerate(entries, start=1)}
+        drop = list(drop)
+        return {
+            **self.risk,
+            "narrative": self.narrative.renumber(old_to_new, drop),
+            "reasoning_trace": self.reasoning.renumber(old_to_new, drop),
+            "sources": [f"{i}. {e.text}" for i, e in enumerate(entries, start=1) if e.text],
+        }
+
+    def normalized(self) -> dict[str, Any]:
+        """Renumber sources contiguously and rewrite the text citations to match."""
+        if not self.sources:
+            return dict(self.risk)
+        return self._renumbered(self.sources)
+
+    def select_and_normalize(
+        self,
+        source_pool: Iterable[Any] | None = None,
+        source_map: Mapping[int, str] | None = None,
+    ) -> tuple[dict[str, Any], list[int]]:
+        """Keep only cited sources and renumber them, from a single parse.
+
+        Markers no source could be found for are removed from the text (left
+        in place they would cite whichever source takes their number) and
+        returned as the dangling indices.
+        """
+        selected, dangling = self._resolve(source_pool, source_map)
+        return self._renumbered(selected, dangling), dangling
+
+
+def normalize_risk_citations(risk: Mapping[str, Any]) -> dict[str, Any]:
+    return ParsedRisk(risk).normalized()
+
+
+_URL_PATTERN = re.compile(r"https?://[^\s)\]>]+")
+
+
+def _source_key(text: str) -> str:
+    match = _URL_PATTERN.search(text)
+    return match.group(0).rstrip(".,;") if match else " ".join(text.lower().split())
+
+
+def rebase_citations(text: str, old_sources: Iterable[Any], new_sources: Iterable[Any]) -> str:
+    """Point ``[n]`` markers cited against ``old_sources`` at the same source in ``new_sources``.
+
+    Sources are matched by URL (or by text when they carry none); markers
+    whose source is not in ``new_sources`` are dropped.
+    """
+    parsed = ParsedText.parse(text)
+    if not parsed.tokens:
+        return parsed.text
+    new_numbers: dict[str, int] = {}
+    for entry in parse_source_entries(new_sources):
+        new_numbers.setdefault(_source_key(entry.text), entry.index)
+    resolved: dict[int, int] = {}
+    for entry in parse_source_entries(old_sources):
+        new_index = new_numbers.get(_source_key(entry.text))
+        if new_index is not None:
+            resolved[entry.index] = new_index
+    return parsed.renumber(resolved, [index for index in parsed.indices() if index not in resolved])
@@ -3,14 +3,35 @@ from __future__ import annotations
 from typing import Any
 
 from agent.tools.base import KwargTool
+from agent.tools.citation_engine import ParsedRisk
 
 from helper_functions import normalize_citations_and_sources
 
 
+def _dangling_note(dangling: list[int]) -> str:
+    cited = ", ".join(f"[{index}]" for index in dangling)
+    return f"Unresolved citations with no matching source: {cited}."
+
+
 class CitationNormalizationTool(KwargTool):
     name: str = "citation_normalization_tool"
-    description: str = "Normalizes citation numbering and source indexing in a risk object."
+    description: str = (
+        "Normalizes citation numbering and source indexing in a risk object; "
+        "with a source_pool, first keeps only the cited sources."
+    )
 
     def _run(self, **kwargs: Any) -> dict[str, Any]:
         risk = dict(kwargs.get("risk") or {})
-        return normalize_citations_and_sources(risk)
+        if "source_pool" not in kwargs:
+            return normalize_citations_and_sources(risk)
+
+        normalized, dangling = ParsedRisk(risk).select_and_normalize(
+            list(kwargs.get("source_pool") or []),
+            kwargs.get("source_map"),
+        )
+        if dangling and kwargs.get("flag_dangling"):
+            note = _dangling_note(dangling)
+            audit_log = list(normalized.get("audit_log") or [])
+            if note not in audit_log:
+                normalized["audit_log"] = [*audit_log, note]
+        return normalized
@@ -1,34 +1,21 @@
 from __future__ import annotations
 
-import re
 from typing import Any
 
 from agent.tools.base import KwargTool
+from agent.tools.citation_engine import ParsedRisk, ParsedText, parse_source_entries
 
 
 def _citation_indices(text: str) -> list[int]:
-    if not text:
-        return []
-    matches = re.findall(r"\[(\d+)\]", text)
-    indices: list[int] = []
-    for match in matches:
-        if match.isdigit():
-            indices.append(int(match))
-    return sorted(set(indices))
+    return ParsedText.parse(text).indices()
 
 
 def _parse_indexed_sources(sources: list[str]) -> dict[int, str]:
-    indexed: dict[int, str] = {}
-    for entry in sources:
-        if not isinstance(entry, str):
-            continue
-        parts = entry.split(".", 1)
-        if len(parts) != 2:
-            continue
-        idx_part = parts[0].strip()
-        if idx_part.isdigit():
-            indexed[int(idx_part)] = parts[1].strip()
-    return indexed
+    return {
+        entry.index: entry.text
+        for entry in parse_source_entries(source for source in sources if isinstance(source, str))
+        if entry.explicit
+    }
 
 
 class CitationSelectionTool(KwargTool):
@@ -40,37 +27,11 @@ class CitationSelectionTool(KwargTool):
     def _run(self, **kwargs: Any) -> list[str]:
         narrative = str(kwargs.get("narrative") or "")
         reasoning = str(kwargs.get("reasoning") or kwargs.get("reasoning_trace") or "")
-        source_pool = list(kwargs.get("source_pool") or [])
         source_map_input = kwargs.get("source_map") or {}
         source_map = {
             int(key): str(value)
             for key, value in dict(source_map_input).items()
             if str(key).isdigit()
         }
-
-        indices = sorted(set(_citation_indices(narrative) + _citation_indices(reasoning)))
-        if not indices:
-            return []
-
-        fallback_sources: list[str] = []
-        for entry in source_pool:
-            if isinstance(entry, str):
-                if "." in entry and entry.split(".", 1)[0].strip().isdigit():
-                    fallback_sources.append(entry.split(".", 1)[1].strip())
-                else:
-                    fallback_sources.append(entry.strip())
-            else:
-                fallback_sources.append(str(entry))
-
-        if not source_map:
-            source_map = _parse_indexed_sources(
-                [entry for entry in source_pool if isinstance(entry, str)]
-            )
-
-        selected: list[str] = []
-        for idx in indices:
-            if idx in source_map:
-                selected.append(f"{idx}. {source_map[idx]}")
-            elif 1 <= idx <= len(fallback_sources):
-                selected.append(f"{idx}. {fallback_sources[idx - 1]}")
-        return selected
+        parsed = ParsedRisk.from_text(narrative, reasoning)
+        return parsed.select(list(kwargs.get("source_pool") or []), source_map)
@@ -3,6 +3,9 @@ from __future__ import annotations
 from typing import Any
 
 from agent.tools.base import KwargTool
+from agent.tools.source_block_cache import SOURCE_BLOCKS, source_label, source_numbers
+from agent.tools.source_block_encoder import COMPACT_HEADER, EMPTY_BLOCK, SourceBlockStyle
+from agent.tools.source_store_tool import report_sources, source_id
 
 
 class CompareInputFormattingTool(KwargTool):
@@ -11,32 +14,31 @@ class CompareInputFormattingTool(KwargTool):
 
     def _run(self, **kwargs: Any) -> str:
         reports = list(kwargs.get("reports") or [])
+        source_store = kwargs.get("source_store")
+        style = kwargs.get("style") or SourceBlockStyle()
+        cache = kwargs.get("cache") or SOURCE_BLOCKS
+        numbers = dict(kwargs.get("numbers") or source_numbers(reports, source_store))
         lines: list[str] = []
+        # A source surfaced by several taxonomies is listed once, under the
+        # first one, instead of being repeated per taxonomy.
+        seen: set[str] = set()
         for report in reports:
             taxonomy = str(report.get("taxonomy") or "Unknown").strip()
-            sources = report.get("reliable_sources") or report.get("sources") or []
+            sources = []
+            for source in report_sources(report, source_store, reliable=True):
+                key = source_id(source)
+                if key and key in seen:
+                    continue
+                seen.add(key)
+                sources.append(source)
             if not sources:
                 continue
             lines.append(f"Taxonomy: {taxonomy}")
-            for i, source in enumerate(sources, start=1):
-                title = str(source.get("title") or "Untitled").strip()
-                url = str(source.get("url") or "").strip()
-                snippet = str(source.get("snippet") or "").strip()
-                published = str(source.get("published") or "").strip()
-                reliability = str(source.get("reliability") or "").strip()
-                reliability_line = (
-                    f"Reliability: {reliability}" if reliability else "Reliability: Unknown"
-                )
-                lines.append(
-                    "\n".join(
-                        [
-                            f"[{taxonomy}:{i}] {title}",
-                            f"URL: {url}",
-                            f"Published: {published or 'Unknown'}",
-                            reliability_line,
-                            f"Snippet: {snippet or 'No snippet'}",
-                        ]
-                    )
-                )
+            for source in sources:
+                lines.append(cache.fragment(source_label(numbers, source_id(source)), source, style))
             lines.append("")
-        return "\n".join(lines).strip() if lines else "(No sources provided.)"
+        if not lines:
+            return EMPTY_BLOCK
+        if style.layout == "compact":
+            lines.insert(0, COMPACT_HEADER)
+        return "\n".join(lines).strip()
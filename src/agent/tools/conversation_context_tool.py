@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from typing import Any
 
+from langchain_core.messages import AIMessage
+
+from agent.history import fold_summary, is_rendered_register, register_reference, split_window
 from agent.tools.base import KwargTool
 
 from helper_functions import format_conversation, last_human_content
@@ -9,11 +12,33 @@ from helper_functions import format_conversation, last_human_content
 
 class ConversationContextTool(KwargTool):
     name: str = "conversation_context_tool"
-    description: str = "Extracts latest user message and flattened conversation history."
+    description: str = (
+        "Extracts latest user message and flattened conversation history, "
+        "optionally windowed to the last few turns with older ones folded "
+        "into the rolling summary, and with rendered registers replaced by "
+        "one-line references."
+    )
 
     def _run(self, **kwargs: Any) -> dict[str, str]:
         messages = list(kwargs.get("messages") or [])
+        if kwargs.get("mode") == "last_query":
+            return {"last_user_query": last_human_content(messages)}
+        max_turns = kwargs.get("max_turns")
+        older, recent = ([], messages) if max_turns is None else split_window(messages, int(max_turns))
+        register_note = kwargs.get("register_note")
+        if register_note:
+            recent = [
+                AIMessage(content=register_reference(str(m.content), register_note))
+                if isinstance(m, AIMessage) and is_rendered_register(str(m.content))
+                else m
+                for m in recent
+            ]
+        conversation = format_conversation(recent)
+        # ``summary`` is the rolling summary of turns already trimmed from state.
+        summary = fold_summary(str(kwargs.get("summary") or ""), older)
+        if summary:
+            conversation = f"Earlier in this conversation:\n{summary}\n\n{conversation}"
         return {
             "last_user_query": last_human_content(messages),
-            "conversation": format_conversation(messages),
+            "conversation": conversation,
         }
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 from agent.tools.base import KwargTool
+from agent.tools.url_canonicalization import canonicalize_url
 
 
 class EventEvidenceFilterTool(KwargTool):
@@ -11,16 +12,20 @@ class EventEvidenceFilterTool(KwargTool):
 
     def _run(self, **kwargs: Any) -> list[dict[str, Any]]:
         events = list(kwargs.get("events") or [])
-        known_urls = set(kwargs.get("known_urls") or [])
+        known_urls = {canonicalize_url(str(url)) for url in kwargs.get("known_urls") or []}
         cleaned: list[dict[str, Any]] = []
         for event in events:
             if not isinstance(event, dict):
                 continue
-            evidence_urls = [
-                url
-                for url in (event.get("evidence_urls") or [])
-                if isinstance(url, str) and url in known_urls
-            ]
+            evidence_urls: list[str] = []
+            seen: set[str] = set()
+            for url in event.get("evidence_urls") or []:
+                if not isinstance(url, str):
+                    continue
+                key = canonicalize_url(url)
+                if key in known_urls and key not in seen:
+                    seen.add(key)
+                    evidence_urls.append(url)
             cleaned.append(
                 {
                     "title": str(event.get("title") or "").strip(),
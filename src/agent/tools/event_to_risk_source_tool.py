@@ -3,6 +3,11 @@ from __future__ import annotations
 from typing import Any
 
 from agent.tools.base import KwargTool
+from agent.tools.source_block_cache import SOURCE_BLOCKS, source_label, source_numbers
+from agent.tools.source_block_encoder import join_source_block
+from agent.tools.source_dedup_index import SourceDedupIndex
+from agent.tools.source_store_tool import report_sources
+from agent.tools.url_canonicalization import canonicalize_url
 
 
 class EventToRiskSourceTool(KwargTool):
@@ -12,48 +17,45 @@ class EventToRiskSourceTool(KwargTool):
     def _run(self, **kwargs: Any) -> dict[str, Any]:
         reports = list(kwargs.get("reports") or [])
         events = list(kwargs.get("events") or [])
-        lookup: dict[str, dict[str, Any]] = {}
+        source_store = kwargs.get("source_store")
+        index = SourceDedupIndex()
         for report in reports:
-            sources = report.get("reliable_sources") or report.get("sources") or []
-            for source in sources:
-                url = str(source.get("url") or "").strip()
-                if url and url not in lookup:
-                    lookup[url] = source
+            for source in report_sources(report, source_store, reliable=True):
+                index.add(source)
+        lookup = {key: index.get(key) for key in index}
 
+        # Evidence URLs are deduplicated by canonical form; the first spelling
+        # seen is kept so it still matches what the model was shown.
         all_urls: list[str] = []
         seen_urls: set[str] = set()
         for event in events:
             for url in event.get("evidence_urls") or []:
-                if isinstance(url, str) and url and url not in seen_urls:
-                    seen_urls.add(url)
+                if not isinstance(url, str) or not url:
+                    continue
+                key = canonicalize_url(url)
+                if key not in seen_urls:
+                    seen_urls.add(key)
                     all_urls.append(url)
 
-        source_lines: list[str] = []
-        for i, url in enumerate(all_urls, start=1):
-            source = lookup.get(url, {})
-            title = str(source.get("title") or "Untitled").strip()
-            snippet = str(source.get("snippet") or "").strip()
-            published = str(source.get("published") or "").strip()
-            reliability = str(source.get("reliability") or "").strip()
-            reliability_line = (
-                f"Reliability: {reliability}" if reliability else "Reliability: Unknown"
-            )
-            source_lines.append(
-                "\n".join(
-                    [
-                        f"[{i}] {title}",
-                        f"URL: {url}",
-                        f"Published: {published or 'Unknown'}",
-                        reliability_line,
-                        f"Snippet: {snippet or 'No snippet'}",
-                    ]
-                )
-            )
+        # Sources keep the numbers they had in verification and comparison;
+        # source_map resolves the model's [n] citations back to URLs.
+        numbers = dict(kwargs.get("numbers") or source_numbers(reports, source_store))
+        source_map = {
+            int(source_label(numbers, canonicalize_url(url))): url for url in all_urls
+        }
+        cache = kwargs.get("cache") or SOURCE_BLOCKS
+        style = kwargs.get("style")
+        sources_block = join_source_block(
+            [
+                cache.fragment(str(n), index.get(url, {}), style, url=url)
+                for n, url in sorted(source_map.items())
+            ],
+            style,
+        )
 
         return {
             "source_lookup": lookup,
             "all_urls": all_urls,
-            "sources_block": "\n\n".join(source_lines).strip()
-            if source_lines
-            else "(No sources provided.)",
+            "source_map": source_map,
+            "sources_block": sources_block,
         }
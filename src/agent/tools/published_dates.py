@@ -0,0 +1,130 @@
+"""Publication-date parsing and recency filtering for search results.
+
+Search providers report ``published`` in many shapes: ISO 8601, RFC 2822,
+"Oct 17, 2026", "3 days ago", or not at all, in which case the URL often
+carries the date (``/2026/10/17/``). ``parse_published`` turns these into a
+UTC ``datetime`` so stale results can be dropped right after search, before
+they are verified, clustered and cited.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterable, Mapping
+
+_RELATIVE_RE = re.compile(
+    r"\b(\d+|an?|one)\s+(minute|min|hour|hr|day|week|month|year)s?\s+ago\b", re.IGNORECASE
+)
+_RELATIVE_UNITS = {
+    "minute": timedelta(minutes=1),
+    "min": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "hr": timedelta(hours=1),
+    "day": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30),
+    "year": timedelta(days=365),
+}
+_RELATIVE_DAYS = {"just now": 0, "today": 0, "yesterday": 1, "last week": 7}
+_URL_DATE_RES = (
+    re.compile(r"/((?:19|20)\d{2})[/-](\d{1,2})[/-](\d{1,2})(?=[/-]|$|\.)"),
+    re.compile(r"/((?:19|20)\d{2})(\d{2})(\d{2})(?=/)"),
+)
+_TEXT_FORMATS = ("%B %d, %Y", "%b %d, %Y", "%d %B %Y", "%d %b %Y", "%B %d %Y", "%b %d %Y", "%Y/%m/%d")
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _safe_date(year: str, month: str, day: str) -> datetime | None:
+    try:
+        return datetime(int(year), int(month), int(day), tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def date_from_url(url: str) -> datetime | None:
+    """Date embedded in a URL path (``/2026/10/17/``, ``/2026-10-17-...``, ``/20261017/``)."""
+    for pattern in _URL_DATE_RES:
+        match = pattern.search(url or "")
+        if match:
+            return _safe_date(*match.groups())
+    return None
+
+
+def parse_published(text: str, now: datetime | None = None) -> datetime | None:
+    """Parse a ``published`` value into a UTC datetime; None when unrecognised."""
+    text = (text or "").strip()
+    if not text:
+        return None
+    if text[:4].isdigit():
+        try:
+            return _utc(datetime.fromisoformat(text.replace("Z", "+00:00")))
+        except ValueError:
+            pass
+    now = now or datetime.now(timezone.utc)
+    lowered = text.lower()
+    match = _RELATIVE_RE.search(lowered)
+    if match:
+        count = 1 if match.group(1) in ("a", "an", "one") else int(match.group(1))
+        return now - count * _RELATIVE_UNITS[match.group(2)]
+    if lowered in _RELATIVE_DAYS:
+        return now - timedelta(days=_RELATIVE_DAYS[lowered])
+    if ":" in text:
+        try:
+            return _utc(parsedate_to_datetime(text))
+        except (TypeError, ValueError):
+            pass
+    cleaned = text.replace(".", "").replace("Sept ", "Sep ")
+    for fmt in _TEXT_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def source_published_at(source: Mapping[str, Any], now: datetime | None = None) -> datetime | None:
+    """Typed publication time of a search result, falling back to its URL."""
+    published_at = source.get("published_at")
+    if isinstance(published_at, datetime):
+        return published_at
+    return parse_published(str(source.get("published") or ""), now) or date_from_url(
+        str(source.get("url") or "")
+    )
+
+
+def filter_recent(
+    sources: Iterable[Any],
+    window_days: float,
+    now: datetime | None = None,
+    keep_undated: bool = True,
+) -> tuple[list[Any], dict[str, int]]:
+    """Keep results published within ``window_days``; ``window_days <= 0`` keeps all.
+
+    Returns the kept results and counts of ``stale`` and ``undated`` items
+    (undated items are dropped only when ``keep_undated`` is false).
+    """
+    sources = list(sources)
+    counts = {"stale": 0, "undated": 0}
+    if window_days <= 0:
+        return sources, counts
+    now = now or datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=window_days)
+    kept = []
+    for source in sources:
+        published_at = source_published_at(source, now)
+        if published_at is None:
+            counts["undated"] += 1
+            if not keep_undated:
+                continue
+        elif published_at < cutoff:
+            counts["stale"] += 1
+            continue
+        kept.append(source)
+    return kept, counts
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, Mapping
+
+from agent.tools.base import KwargTool
+
+from helper_functions import similarity_terms
+
+# Recency filler that search engines ignore; it should not keep two
+# otherwise identical queries apart.
+_QUERY_NOISE = frozenset(
+    "latest recent new news update today current week month past last".split()
+)
+
+
+def query_terms(query: str) -> frozenset:
+    """Stemmed content terms of a search query, without recency filler."""
+    return frozenset(term for term in similarity_terms(query) if term not in _QUERY_NOISE)
+
+
+def _near_identical(a: frozenset, b: frozenset, threshold: float) -> bool:
+    if not a or not b:
+        return a == b
+    return len(a & b) / len(a | b) >= threshold
+
+
+def dedupe_query_plan(
+    plans: Mapping[str, list[str]],
+    threshold: float = 0.6,
+    reserves: Mapping[str, list[str]] | None = None,
+) -> dict[str, list[str]]:
+    """Rewrite each taxonomy's queries onto one canonical text per query.
+
+    Queries are visited in taxonomy order; a query whose terms overlap an
+    earlier one by at least ``threshold`` (Jaccard) reuses the earlier text,
+    so the search runs once and its results reach every taxonomy that asked.
+    When two of a taxonomy's own queries collapse onto one text, the list is
+    padded back to its original length from ``reserves[taxonomy]``, in order.
+    """
+    canonical: list[tuple[frozenset, str]] = []
+    planned: dict[str, list[str]] = {}
+    for taxonomy, queries in plans.items():
+        texts = [text for text in (str(query).strip() for query in queries) if text]
+        spare = [str(query).strip() for query in (reserves or {}).get(taxonomy) or []]
+        out: list[str] = []
+        for text in [*texts, *filter(None, spare)]:
+            if len(out) >= len(texts):
+                break
+            terms = query_terms(text)
+            match = next(
+                (known for known_terms, known in canonical if _near_identical(terms, known_terms, threshold)),
+                None,
+            )
+            if match is None:
+                canonical.append((terms, text))
+                match = text
+            if match not in out:
+                out.append(match)
+        planned[taxonomy] = out
+    return planned
+
+
+def shared_queries(planned: Mapping[str, list[str]]) -> dict[str, list[str]]:
+    """Queries requested by more than one taxonomy, with their requesters."""
+    requesters: dict[str, list[str]] = {}
+    for taxonomy, queries in planned.items():
+        for query in queries:
+            requesters.setdefault(query, []).append(taxonomy)
+    return {query: names for query, names in requesters.items() if len(names) > 1}
+
+
+class SharedSearchCache:
+    """Single-flight memo of search results, keyed per query plan.
+
+    The first taxonomy worker to request a key runs the search; concurrent
+    and later requesters wait for and reuse its results. Failed searches are
+    not cached. The oldest entries are dropped beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, Future] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_run(self, key: Hashable, search: Callable[[], list[Any]]) -> tuple[list[Any], bool]:
+        """Return ``(results, reused)`` for ``key``, running ``search`` at most once."""
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._entries[key] = future
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        if owner:
+            try:
+                future.set_result(list(search()))
+            except BaseException as exc:
+                with self._lock:
+                    self._entries.pop(key, None)
+                future.set_exception(exc)
+                raise
+        return future.result(), not owner
+
+    def clear_plan(self, plan_id: Hashable) -> int:
+        """Drop the entries of one query plan once its fan-out has joined."""
+        with self._lock:
+            stale = [key for key in self._entries if isinstance(key, tuple) and key[:1] == (plan_id,)]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+
+class QueryPlanTool(KwargTool):
+    name: str = "query_plan_tool"
+    description: str = (
+        "Deduplicates near-identical search queries across taxonomies and "
+        "reports which taxonomies share each query."
+    )
+
+    def _run(self, **kwargs: Any) -> dict[str, Any]:
+        planned = dedupe_query_plan(
+            dict(kwargs.get("plans") or {}),
+            threshold=float(kwargs.get("threshold") or 0.6),
+            reserves=kwargs.get("reserves"),
+        )
+        return {"queries": planned, "shared": shared_queries(planned)}
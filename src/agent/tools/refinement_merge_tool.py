@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from agent.tools.base import KwargTool
+from agent.tools.citation_engine import rebase_citations
+
+from helper_functions import (
+    WEAK_RELEVANCE_NOTE,
+    append_weak_relevance_note,
+    normalize_citations_and_sources,
+)
+
+# Fields owned by the refinement stage; relevance owns the portfolio fields.
+REFINED_FIELDS = ("title", "category", "narrative", "sources")
+_DRAFT_ID_RE = re.compile(r"^D(\d+)$")
+
+
+def draft_risk_id(position: int) -> str:
+    """Id tying a draft's relevance and refinement results together (``D1``...)."""
+    return f"D{position}"
+
+
+def draft_position(risk_id: Any) -> int:
+    """1-based draft position for ids like ``D3``; 0 when not a draft id."""
+    match = _DRAFT_ID_RE.match(str(risk_id or ""))
+    return int(match.group(1)) if match else 0
+
+
+def _draft_order(risk: dict[str, Any]) -> int:
+    return draft_position(risk.get("risk_id"))
+
+
+def merge_refined_risk(assessed: dict[str, Any], refined: dict[str, Any]) -> dict[str, Any]:
+    """Combine one draft's relevance assessment with its governance refinement."""
+    merged = {**assessed, **{key: refined[key] for key in REFINED_FIELDS if key in refined}}
+    if "sources" in refined:
+        # The relevance trace cites the draft's sources; point it at the refined list.
+        merged["reasoning_trace"] = rebase_citations(
+            str(assessed.get("reasoning_trace") or ""),
+            assessed.get("sources") or [],
+            refined["sources"],
+        )
+    if WEAK_RELEVANCE_NOTE.lower() in str(assessed.get("narrative") or "").lower():
+        merged["narrative"] = append_weak_relevance_note(str(merged.get("narrative") or ""))
+    assessed_log = list(assessed.get("audit_log") or [])
+    merged["audit_log"] = assessed_log + [
+        note for note in refined.get("audit_log") or [] if note not in assessed_log
+    ]
+    return normalize_citations_and_sources(merged)
+
+
+class RefinementMergeTool(KwargTool):
+    name: str = "refinement_merge_tool"
+    description: str = (
+        "Merges parallel relevance and refinement results for the same draft "
+        "risk by risk id and restores draft order."
+    )
+
+    def _run(self, **kwargs: Any) -> list[dict[str, Any]]:
+        assessed = sorted(kwargs.get("assessed") or [], key=_draft_order)
+        refined = {
+            risk["risk_id"]: risk for risk in kwargs.get("refined") or [] if risk.get("risk_id")
+        }
+        return [
+            merge_refined_risk(risk, refined[risk["risk_id"]])
+            if risk.get("risk_id") in refined
+            else risk
+            for risk in assessed
+        ]
@@ -2,15 +2,32 @@ from __future__ import annotations
 
 from typing import Any
 
+from agent.configuration import current_configuration
 from agent.tools.base import KwargTool
 
-from helper_functions import dedupe_risks
+from helper_functions import dedupe_risks, near_dedupe_risks
 
 
 class RiskDeduplicationTool(KwargTool):
     name: str = "risk_deduplication_tool"
-    description: str = "Removes duplicate risks using canonicalized fingerprints."
+    description: str = (
+        "Removes exact duplicate risks; with near_duplicates, also merges "
+        "paraphrased near-duplicates within the same category."
+    )
 
     def _run(self, **kwargs: Any) -> list[dict[str, Any]]:
-        risks = list(kwargs.get("risks") or [])
-        return dedupe_risks(risks)
+        risks = dedupe_risks(list(kwargs.get("risks") or []))
+        if not kwargs.get("near_duplicates", False):
+            return risks
+        configuration = current_configuration()
+        threshold = kwargs.get("similarity_threshold")
+        if threshold is None:
+            threshold = configuration.risk_similarity_threshold
+        title_threshold = kwargs.get("title_threshold")
+        if title_threshold is None:
+            title_threshold = configuration.risk_title_similarity_threshold
+        return near_dedupe_risks(
+            risks,
+            threshold=float(threshold),
+            title_threshold=float(title_threshold),
+        )
@@ -2,18 +2,28 @@ from __future__ import annotations
 
 from typing import Any
 
+from agent.streaming import MarkdownStream
 from agent.tools.base import KwargTool
 
-from helper_functions import dedupe_risks, format_all_risks_md
+from helper_functions import dedupe_risks, iter_risk_register_md
 
 
 class RiskMarkdownRenderTool(KwargTool):
     name: str = "risk_markdown_render_tool"
-    description: str = "Renders risk lists as markdown register output."
+    description: str = (
+        "Renders risk lists as markdown register output, streaming one chunk per risk."
+    )
 
     def _run(self, **kwargs: Any) -> str:
         risks = list(kwargs.get("risks") or [])
         dedupe = bool(kwargs.get("dedupe", True))
         if dedupe:
             risks = dedupe_risks(risks)
-        return format_all_risks_md(risks) if risks else ""
+        if not risks:
+            return ""
+        include_signposts = kwargs.get("include_signposts")
+        if include_signposts is None:
+            include_signposts = any(risk.get("signposts") for risk in risks)
+        stream = MarkdownStream(str(kwargs.get("stream_name") or "risk_register"))
+        chunks = iter_risk_register_md(risks, include_signposts=bool(include_signposts))
+        return stream.extend(chunks).text()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Iterator
+
+from agent.streaming import MarkdownStream
+from agent.tools.base import KwargTool
+
+from helper_functions import iter_risk_register_md, normalize_citations_and_sources
+
+PATCHABLE_FIELDS = (
+    "title",
+    "category",
+    "narrative",
+    "portfolio_relevance",
+    "portfolio_relevance_rationale",
+    "sources",
+)
+_RELEVANCE_LEVELS = ("High", "Medium", "Low")
+_RISK_ID_RE = re.compile(r"^\s*(?:risk\s*)?r?\s*#?(\d+)\s*$", re.IGNORECASE)
+
+
+def risk_id(position: int) -> str:
+    return f"R{position}"
+
+
+def parse_risk_id(value: Any) -> int | None:
+    """Return the 1-based register position for ids like ``R3``, ``3`` or ``Risk 3``."""
+    match = _RISK_ID_RE.match(str(value or ""))
+    return int(match.group(1)) if match else None
+
+
+def format_register_block(risks: list[dict[str, Any]]) -> str:
+    """Compact, id-tagged register text for the patch prompt."""
+    if not risks:
+        return "(empty register)"
+    blocks = []
+    for position, risk in enumerate(risks, start=1):
+        categories = risk.get("category") or []
+        if not isinstance(categories, list):
+            categories = [categories]
+        sources = "; ".join(str(entry) for entry in risk.get("sources") or []) or "none"
+        blocks.append(
+            "\n".join(
+                [
+                    f"[{risk_id(position)}] {risk.get('title', '')}",
+                    f"Category: {', '.join(str(c) for c in categories)} | "
+                    f"Relevance: {risk.get('portfolio_relevance', '')}",
+                    f"Rationale: {risk.get('portfolio_relevance_rationale', '')}",
+                    f"Narrative: {str(risk.get('narrative') or '').strip()}",
+                    f"Sources: {sources}",
+                ]
+            )
+        )
+    return "\n\n".join(blocks)
+
+
+def _clean_fields(fields: Any) -> tuple[dict[str, Any], list[str]]:
+    cleaned: dict[str, Any] = {}
+    problems: list[str] = []
+    for key, value in dict(fields or {}).items():
+        if key not in PATCHABLE_FIELDS:
+            problems.append(f"unknown field '{key}'")
+            continue
+        if key == "category":
+            values = value if isinstance(value, list) else [value]
+            categories = [str(item).strip() for item in values if str(item).strip()]
+            if not categories:
+                problems.append("empty category")
+                continue
+            cleaned[key] = categories[:3]
+        elif key == "sources":
+            values = value if isinstance(value, list) else [value]
+            cleaned[key] = [str(item).strip() for item in values if str(item).strip()]
+        elif key == "portfolio_relevance":
+            if value not in _RELEVANCE_LEVELS:
+                problems.append(f"invalid portfolio_relevance {value!r}")
+                continue
+            cleaned[key] = value
+        else:
+            text = str(value or "").strip()
+            if not text:
+                problems.append(f"empty {key}")
+                continue
+            cleaned[key] = text
+    return cleaned, problems
+
+
+def apply_risk_patch(
+    risks: list[dict[str, Any]],
+    operations: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Validate and apply patch operations to a register.
+
+    ``modify`` and ``remove`` address risks by their id in the register as it
+    was sent (``R1`` is the first risk); ``add`` appends. Invalid operations
+    are skipped and reported in ``rejected``. Returns the updated risks, the
+    1-based positions of touched risks in the updated register, the titles of
+    removed risks and the rejection messages.
+    """
+    slots: list[dict[str, Any] | None] = [dict(risk) for risk in risks]
+    touched: set[int] = set()
+    added: list[dict[str, Any]] = []
+    removed: list[str] = []
+    rejected: list[str] = []
+
+    for number, operation in enumerate(operations, start=1):
+        op = str(operation.get("op") or "").strip().lower()
+        reason = str(operation.get("reason") or "").strip()
+        fields, problems = _clean_fields(operation.get("fields"))
+        label = f"operation {number} ({op or 'missing op'})"
+
+        if op == "add":
+            missing = [key for key in ("title", "narrative", "category") if key not in fields]
+            if missing:
+                rejected.append(f"{label}: missing {', '.join(missing)}")
+                continue
+            new_risk = {
+                "portfolio_relevance": "Medium",
+                "portfolio_relevance_rationale": "Relevance not specified; requires review.",
+                "sources": [],
+                **fields,
+                "reasoning_trace": "",
+                "audit_log": [f"Added during register update. {reason}".strip()],
+            }
+            added.append(normalize_citations_and_sources(new_risk))
+            continue
+
+        position = parse_risk_id(operation.get("risk_id"))
+        if op not in ("modify", "remove"):
+            rejected.append(f"{label}: unsupported operation")
+            continue
+        if position is None or not 1 <= position <= len(slots):
+            rejected.append(f"{label}: unknown risk id {operation.get('risk_id')!r}")
+            continue
+        current = slots[position - 1]
+        if current is None:
+            rejected.append(f"{label}: {risk_id(position)} was already removed")
+            continue
+
+        if op == "remove":
+            removed.append(str(current.get("title") or risk_id(position)))
+            slots[position - 1] = None
+            touched.discard(position)
+            continue
+
+        if not fields:
+            detail = "; ".join(problems) or "no fields to change"
+            rejected.append(f"{label}: {detail}")
+            continue
+        changed = [key for key in PATCHABLE_FIELDS if key in fields]
+        updated = {**current, **fields}
+        note = f"Register update modified {', '.join(changed)}."
+        updated["audit_log"] = [
+            *list(current.get("audit_log") or []),
+            f"{note} {reason}".strip(),
+        ]
+        if "sources" in fields or "narrative" in fields:
+            updated = normalize_citations_and_sources(updated)
+        slots[position - 1] = updated
+        touched.add(position)
+
+    updated_risks: list[dict[str, Any]] = []
+    touched_positions: list[int] = []
+    for position, risk in enumerate(slots, start=1):
+        if risk is None:
+            continue
+        updated_risks.append(risk)
+        if position in touched:
+            touched_positions.append(len(updated_risks))
+    for risk in added:
+        updated_risks.append(risk)
+        touched_positions.append(len(updated_risks))
+
+    return {
+        "risks": updated_risks,
+        "touched": touched_positions,
+        "removed": removed,
+        "rejected": rejected,
+    }
+
+
+def iter_patch_md(
+    risks: list[dict[str, Any]],
+    touched: list[int],
+    removed: list[str],
+    change_log: list[str],
+    rejected: list[str] | None = None,
+    preview: bool = False,
+) -> Iterator[str]:
+    """Markdown for a patch update: the full patched register, then what changed.
+
+    ``preview`` stops after the register; it is streamed while the patch
+    operations are still being generated.
+    """
+    yield from iter_risk_register_md(risks, heading="# Updated Risk Register\n")
+    if preview:
+        return
+    if removed:
+        yield "**Removed**"
+        for title in removed:
+            yield f"- {title}"
+    yield "\n# Change Log"
+    changed = ", ".join(f"Risk {position}" for position in touched) or "none"
+    yield (
+        f"_Changed or added: {changed}; {len(removed)} removed; "
+        f"register now holds {len(risks)} risk(s)._"
+    )
+    for bullet in change_log:
+        yield f"- {bullet}"
+    for message in rejected or []:
+        yield f"- Rejected patch {message}"
+
+
+class RiskPatchTool(KwargTool):
+    name: str = "risk_patch_tool"
+    description: str = (
+        "Formats an id-tagged register for patch updates, validates and applies "
+        "add/modify/remove operations, and renders the patched register."
+    )
+
+    def _run(self, **kwargs: Any) -> Any:
+        mode = str(kwargs.get("mode") or "apply")
+        risks = list(kwargs.get("risks") or [])
+        if mode == "register_block":
+            return format_register_block(risks)
+        if mode == "render":
+            stream = kwargs.get("stream")
+            if not isinstance(stream, MarkdownStream):
+                stream = MarkdownStream(str(kwargs.get("stream_name") or "updated_register"))
+            chunks = iter_patch_md(
+                risks,
+                list(kwargs.get("touched") or []),
+                list(kwargs.get("removed") or []),
+                list(kwargs.get("change_log") or []),
+                list(kwargs.get("rejected") or []),
+                preview=bool(kwargs.get("preview")),
+            )
+            return stream.sync(chunks).text().strip()
+        return apply_risk_patch(risks, list(kwargs.get("operations") or []))
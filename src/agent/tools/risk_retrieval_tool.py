@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import hashlib
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any
+
+from agent.tools.base import KwargTool
+
+from helper_functions import similarity_terms
+
+_RISK_REFERENCE_RE = re.compile(
+    r"\brisks?\s*#?\s*(\d+(?:\s*(?:,|&|/|-|–|\band\b|\bor\b|\bto\b|\bthrough\b)\s*#?\s*\d+)*)",
+    re.IGNORECASE,
+)
+_REFERENCE_RANGE_RE = re.compile(r"(\d+)\s*(?:-|–|\bto\b|\bthrough\b)\s*#?\s*(\d+)", re.IGNORECASE)
+_MAX_REFERENCE_RANGE = 20
+
+
+def _signpost_text(risk: dict[str, Any]) -> str:
+    return " ".join(
+        str(signpost.get("description") or "")
+        if isinstance(signpost, dict)
+        else str(signpost)
+        for signpost in risk.get("signposts") or []
+    )
+
+
+def risk_fingerprint(risk: dict[str, Any]) -> str:
+    text = "\x1f".join(
+        [
+            str(risk.get("title") or ""),
+            str(risk.get("narrative") or ""),
+            _signpost_text(risk),
+        ]
+    )
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _risk_terms(risk: dict[str, Any]) -> list[str]:
+    title = similarity_terms(str(risk.get("title") or ""))
+    # Titles are short and carry the topic; count them twice.
+    return [
+        *title,
+        *title,
+        *similarity_terms(str(risk.get("narrative") or "")),
+        *similarity_terms(_signpost_text(risk)),
+    ]
+
+
+def referenced_positions(query: str) -> list[int]:
+    """1-based risk numbers the query names explicitly ("risk 3", "risks 2 and 3", "risks 4-6")."""
+    numbers: list[int] = []
+    for group in _RISK_REFERENCE_RE.findall(query or ""):
+        spans = [(int(low), int(high)) for low, high in _REFERENCE_RANGE_RE.findall(group)]
+        remainder = _REFERENCE_RANGE_RE.sub(" ", group)
+        spans += [(int(number), int(number)) for number in re.findall(r"\d+", remainder)]
+        for low, high in sorted(spans):
+            if low > high or high - low > _MAX_REFERENCE_RANGE:
+                high = low
+            numbers.extend(range(low, high + 1))
+    return list(dict.fromkeys(numbers))
+
+
+class RiskIndex:
+    """BM25 index over risk title, narrative and signposts.
+
+    ``sync`` diffs the register against the indexed documents by content
+    fingerprint, so only added or edited risks are tokenized again.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._lengths: dict[str, int] = {}
+        self._postings: dict[str, dict[str, int]] = {}
+        self._doc_terms: dict[str, Counter[str]] = {}
+        self._total_length = 0
+        self._positions: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def _add(self, fingerprint: str, risk: dict[str, Any]) -> None:
+        terms = Counter(_risk_terms(risk))
+        self._doc_terms[fingerprint] = terms
+        self._lengths[fingerprint] = sum(terms.values())
+        self._total_length += self._lengths[fingerprint]
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[fingerprint] = count
+
+    def _remove(self, fingerprint: str) -> None:
+        for term in self._doc_terms.pop(fingerprint):
+            postings = self._postings[term]
+            postings.pop(fingerprint, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(fingerprint)
+
+    def sync(self, risks: list[dict[str, Any]]) -> dict[str, int]:
+        with self._lock:
+            return self._sync(risks)
+
+    def _sync(self, risks: list[dict[str, Any]]) -> dict[str, int]:
+        positions: dict[str, list[int]] = {}
+        for position, risk in enumerate(risks):
+            positions.setdefault(risk_fingerprint(risk), []).append(position)
+        stale = [
+            fingerprint for fingerprint in self._lengths if fingerprint not in positions
+        ]
+        for fingerprint in stale:
+            self._remove(fingerprint)
+        added = 0
+        for fingerprint, at in positions.items():
+            if fingerprint not in self._lengths:
+                self._add(fingerprint, risks[at[0]])
+                added += 1
+        self._positions = positions
+        return {"added": added, "removed": len(stale), "indexed": len(self._lengths)}
+
+    def _search(self, query: str, k: int) -> list[int]:
+        if not self._lengths or k <= 0:
+            return []
+        doc_count = len(self._lengths)
+        avg_length = self._total_length / doc_count or 1.0
+        scores: dict[str, float] = {}
+        for term in set(similarity_terms(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(
+                1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for fingerprint, tf in postings.items():
+                norm = self.k1 * (
+                    1 - self.b + self.b * self._lengths[fingerprint] / avg_length
+                )
+                scores[fingerprint] = scores.get(fingerprint, 0.0) + idf * tf * (
+                    self.k1 + 1
+                ) / (tf + norm)
+        ranked = sorted(
+            scores, key=lambda fingerprint: (-scores[fingerprint], fingerprint)
+        )
+        results: list[int] = []
+        for fingerprint in ranked:
+            results.extend(self._positions.get(fingerprint, []))
+            if len(results) >= k:
+                break
+        return results[:k]
+
+    def search(self, query: str, k: int = 5) -> list[int]:
+        """Return 0-based register positions of the top ``k`` risks for ``query``."""
+        with self._lock:
+            return self._search(query, k)
+
+    def sync_and_search(
+        self, risks: list[dict[str, Any]], query: str, k: int = 5
+    ) -> list[int]:
+        with self._lock:
+            self._sync(risks)
+            return self._search(query, k)
+
+
+class RiskRetrievalTool(KwargTool):
+    name: str = "risk_retrieval_tool"
+    description: str = (
+        "Selects the risks most relevant to a question with BM25 over title, "
+        "narrative and signposts, plus any risks the question names by number."
+    )
+
+    def _run(self, **kwargs: Any) -> list[tuple[int, dict[str, Any]]]:
+        risks = list(kwargs.get("risks") or [])
+        query = str(kwargs.get("query") or "")
+        k = int(kwargs.get("k", 5))
+        index = kwargs.get("index")
+        if not isinstance(index, RiskIndex):
+            index = RiskIndex()
+
+        # Risks named explicitly come first, then BM25 hits; a question with no
+        # matching terms ("summarise the register") falls back to register order.
+        positions = list(
+            dict.fromkeys(
+                number - 1
+                for number in referenced_positions(query)
+                if 1 <= number <= len(risks)
+            )
+        )
+        hits = index.sync_and_search(risks, query, k + len(positions))
+        for position in hits or range(len(risks)):
+            if len(positions) >= k:
+                break
+            if position not in positions:
+                positions.append(position)
+        return [(position + 1, risks[position]) for position in positions]
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+from typing import Any
+
+from agent.routing import ROUTER_MODEL_ENV, HashedNgramRouteModel, classify_route
+from agent.tools.base import KwargTool
+
+
+@lru_cache(maxsize=4)
+def _load_model(path: str) -> HashedNgramRouteModel | None:
+    try:
+        return HashedNgramRouteModel.load(path)
+    except (OSError, ValueError):
+        return None
+
+
+class RouteClassifierTool(KwargTool):
+    name: str = "route_classifier_tool"
+    description: str = (
+        "Classifies obvious scan/update/qna requests locally with keyword rules and an "
+        "optional hashed n-gram model; returns route None to defer to the LLM router."
+    )
+
+    def _run(self, **kwargs: Any) -> dict[str, Any]:
+        model = kwargs.get("model")
+        if model is None:
+            path = str(
+                kwargs.get("model_path") or os.environ.get(ROUTER_MODEL_ENV, "")
+            ).strip()
+            model = _load_model(path) if path else None
+        return classify_route(
+            str(kwargs.get("query") or ""),
+            model=model,
+            min_confidence=float(kwargs.get("min_confidence", 0.9)),
+        )
@@ -0,0 +1,111 @@
+"""Memoized source fragments shared by verification, comparison and drafting.
+
+Each scan stage lists the same canonical sources for the model. Sources are
+numbered once per scan, in ``source_store`` order, so a source keeps its
+``[n]`` label from verification through event comparison to event-to-risk
+drafting. Each ``(label, source, style)`` is encoded once into a fragment,
+and blocks are assembled from the cached fragments. Unchanged sources
+therefore yield byte-identical text in every prompt, which keeps provider
+prefix caches warm.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Mapping
+
+from agent.tools.source_block_encoder import (
+    SourceBlockStyle,
+    encode_source,
+    join_source_block,
+)
+from agent.tools.source_store_tool import source_id
+
+# Fields the encoder reads; a fragment is reused only while they are unchanged.
+_ENCODED_FIELDS = ("title", "published", "reliability", "snippet", "domain")
+
+
+def source_numbers(
+    reports: Iterable[Mapping[str, Any]],
+    source_store: Mapping[str, Any] | None = None,
+) -> dict[str, int]:
+    """1-based number per source id: store order first, then inline report sources."""
+    numbers = {sid: n for n, sid in enumerate(source_store or {}, start=1)}
+    for report in reports:
+        if "source_ids" in report:
+            continue  # store-backed: already numbered
+        for source in [*(report.get("sources") or []), *(report.get("reliable_sources") or [])]:
+            sid = source_id(source)
+            if sid and sid not in numbers:
+                numbers[sid] = len(numbers) + 1
+    return numbers
+
+
+def source_label(numbers: dict[str, int], sid: str) -> str:
+    """The number of ``sid``, assigning the next free one to an unnumbered source."""
+    if sid not in numbers:
+        numbers[sid] = max(numbers.values(), default=0) + 1
+    return str(numbers[sid])
+
+
+class SourceBlockCache:
+    """Bounded memo of encoded source fragments, keyed by what they render.
+
+    The key covers the label, style, URL spelling and encoded fields, so a
+    source whose reliability was added by verification gets a new fragment
+    while untouched sources are served from the memo. The oldest fragments
+    are dropped beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        self.max_entries = max_entries
+        self._fragments: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def fragment(
+        self,
+        label: str,
+        source: Mapping[str, Any],
+        style: SourceBlockStyle | None = None,
+        reliability: bool = True,
+        url: str | None = None,
+    ) -> str:
+        style = style or SourceBlockStyle()
+        url = str(source.get("url") or "").strip() if url is None else url
+        key = (
+            label,
+            style,
+            reliability,
+            url,
+            *(str(source.get(field) or "") for field in _ENCODED_FIELDS),
+        )
+        with self._lock:
+            cached = self._fragments.get(key)
+            if cached is not None:
+                self._fragments.move_to_end(key)
+                return cached
+        text = encode_source(label, source, style, reliability, url)
+        with self._lock:
+            self._fragments[key] = text
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+        return text
+
+    def block(
+        self,
+        entries: Iterable[tuple[str, Mapping[str, Any]]],
+        style: SourceBlockStyle | None = None,
+        reliability: bool = True,
+    ) -> str:
+        """A block of ``(label, source)`` entries built from cached fragments."""
+        return join_source_block(
+            [self.fragment(label, source, style, reliability) for label, source in entries], style
+        )
+
+
+# Shared by the formatting tools of every scan stage (and every run).
+SOURCE_BLOCKS = SourceBlockCache()
@@ -0,0 +1,156 @@
+"""Shared encoder for the source blocks sent to the scan prompts.
+
+Verification, event comparison, event-to-risk drafting and the taxonomy
+briefs all list search results for the model. The ``verbose`` layout is the
+historical labelled block per source. The ``compact`` layout writes one
+pipe-separated row per source, strips whitespace and boilerplate (site-name
+title suffixes, date prefixes, "Read more" tails), truncates titles and
+snippets to per-field budgets, and omits unknown values instead of printing
+"Unknown" / "No snippet". URLs are never shortened: models copy them back.
+
+The layout is chosen per agent via ``source_block_layouts`` (falling back to
+``source_block_layout``) in the run configuration.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+from agent.configuration import current_configuration
+from agent.tools.source_record import _domain
+
+LAYOUTS = ("verbose", "compact")
+EMPTY_BLOCK = "(No sources provided.)"
+COMPACT_HEADER = (
+    "One source per line: [id] published reliability(H/M/L) | title | url | snippet"
+)
+
+_RELIABILITY_CODES = {"High": "H", "Medium": "M", "Low": "L"}
+_SNIPPET_DATE_PREFIX_RE = re.compile(
+    r"^(?:[A-Z][a-z]{2,8}\.? \d{1,2}, \d{4}|\d{1,2} [A-Z][a-z]{2,8} \d{4}|\d{4}-\d{2}-\d{2}|"
+    r"\d+ (?:minutes?|hours?|days?|weeks?) ago)\s*[-—–·:|]\s*"
+)
+_SNIPPET_TAIL_RE = re.compile(
+    r"\s*(?:\.{3}|…|\[\.{3}\]|Read more\.?|Continue reading\.?|Click here[^.]*\.?)\s*$",
+    re.IGNORECASE,
+)
+_TITLE_SUFFIX_RE = re.compile(r"\s+[|\-–—]\s+([^|\-–—]{2,40})$")
+_ALNUM_RE = re.compile(r"[^a-z0-9]")
+
+
+@dataclass(frozen=True)
+class SourceBlockStyle:
+    """Layout and per-field character budgets of a source block."""
+
+    layout: str = "verbose"
+    title_chars: int = 120
+    snippet_chars: int = 280
+
+
+def source_block_style(agent: str) -> SourceBlockStyle:
+    """The run's source-block style for ``agent`` (a registry name)."""
+    configuration = current_configuration()
+    layout = configuration.source_block_layouts.get(agent, configuration.source_block_layout)
+    return SourceBlockStyle(
+        layout=layout if layout in LAYOUTS else "verbose",
+        title_chars=configuration.source_title_chars,
+        snippet_chars=configuration.source_snippet_chars,
+    )
+
+
+def _squash(text: Any) -> str:
+    return " ".join(str(text or "").split())
+
+
+def truncate(text: str, limit: int) -> str:
+    """Cut ``text`` to ``limit`` characters at a word boundary, marking the cut."""
+    if limit <= 0 or len(text) <= limit:
+        return text
+    cut = text[: limit - 1]
+    if " " in cut[limit // 2 :]:
+        cut = cut[: cut.rindex(" ")]
+    return cut.rstrip(" ,;:-") + "…"
+
+
+def clean_title(title: Any, domain: str = "") -> str:
+    """Whitespace-normalized title without a trailing site name (" | Reuters")."""
+    title = _squash(title)
+    match = _TITLE_SUFFIX_RE.search(title)
+    if match and domain:
+        site = _ALNUM_RE.sub("", match.group(1).lower())
+        if site and site in _ALNUM_RE.sub("", domain.lower()):
+            title = title[: match.start()]
+    return title
+
+
+def clean_snippet(snippet: Any) -> str:
+    """Whitespace-normalized snippet without date prefixes and "Read more" tails."""
+    snippet = _SNIPPET_DATE_PREFIX_RE.sub("", _squash(snippet))
+    return _SNIPPET_TAIL_RE.sub("", snippet)
+
+
+def _verbose_entry(label: str, source: Mapping[str, Any], url: str, reliability: bool) -> str:
+    lines = [
+        f"[{label}] {str(source.get('title') or 'Untitled').strip()}",
+        f"URL: {url}",
+        f"Published: {str(source.get('published') or '').strip() or 'Unknown'}",
+    ]
+    if reliability:
+        lines.append(f"Reliability: {str(source.get('reliability') or '').strip() or 'Unknown'}")
+    lines.append(f"Snippet: {str(source.get('snippet') or '').strip() or 'No snippet'}")
+    return "\n".join(lines)
+
+
+def _compact_entry(
+    label: str, source: Mapping[str, Any], url: str, reliability: bool, style: SourceBlockStyle
+) -> str:
+    head = [f"[{label}]"]
+    published = _squash(source.get("published"))
+    if published:
+        head.append(published)
+    if reliability:
+        code = _RELIABILITY_CODES.get(str(source.get("reliability") or "").strip())
+        if code:
+            head.append(code)
+    domain = str(source.get("domain") or "") or _domain(url)
+    title = truncate(clean_title(source.get("title"), domain), style.title_chars)
+    snippet = truncate(clean_snippet(source.get("snippet")), style.snippet_chars)
+    return " | ".join(part for part in (" ".join(head), title, url, snippet) if part)
+
+
+def encode_source(
+    label: str,
+    source: Mapping[str, Any],
+    style: SourceBlockStyle | None = None,
+    reliability: bool = True,
+    url: str | None = None,
+) -> str:
+    """One source entry; ``url`` overrides the source's own (e.g. the cited spelling)."""
+    style = style or SourceBlockStyle()
+    url = str(source.get("url") or "").strip() if url is None else url
+    if style.layout == "compact":
+        return _compact_entry(label, source, url, reliability, style)
+    return _verbose_entry(label, source, url, reliability)
+
+
+def encode_source_block(
+    entries: Iterable[tuple[str, Mapping[str, Any]]],
+    style: SourceBlockStyle | None = None,
+    reliability: bool = True,
+) -> str:
+    """A block of ``(label, source)`` entries, or EMPTY_BLOCK when there are none."""
+    style = style or SourceBlockStyle()
+    return join_source_block(
+        [encode_source(label, source, style, reliability) for label, source in entries], style
+    )
+
+
+def join_source_block(fragments: list[str], style: SourceBlockStyle | None = None) -> str:
+    """Join encoded source entries into a block, or EMPTY_BLOCK when there are none."""
+    if not fragments:
+        return EMPTY_BLOCK
+    if (style or SourceBlockStyle()).layout == "compact":
+        return "\n".join([COMPACT_HEADER, *fragments])
+    return "\n\n".join(fragments)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, Mapping
+
+from agent.tools.url_canonicalization import canonicalize_url
+
+
+class SourceDedupIndex:
+    """Run-wide index of unique sources keyed by canonical URL.
+
+    Keeps the first record seen for each canonical URL plus the set of
+    taxonomies that surfaced it, so the same article reached through tracking
+    links, AMP pages or other queries is verified and formatted once.
+    """
+
+    def __init__(self) -> None:
+        self._records: dict[str, Any] = {}
+        self._taxonomies: dict[str, list[str]] = {}
+
+    @classmethod
+    def from_store(cls, store: Mapping[str, Mapping[str, Any]] | None) -> SourceDedupIndex:
+        index = cls()
+        for source in (store or {}).values():
+            index.add(source, taxonomies=source.get("taxonomies") or ())
+        return index
+
+    def add(
+        self,
+        source: Any,
+        taxonomy: str | None = None,
+        taxonomies: Iterable[str] = (),
+    ) -> tuple[str, bool]:
+        """Register a source; return its canonical id and whether it was new."""
+        key = canonicalize_url(str(source.get("url") or ""))
+        if not key:
+            return "", False
+        is_new = key not in self._records
+        if is_new:
+            self._records[key] = source
+            self._taxonomies[key] = []
+        members = self._taxonomies[key]
+        for name in (*taxonomies, *((taxonomy,) if taxonomy else ())):
+            if name and name not in members:
+                members.append(name)
+        return key, is_new
+
+    def get(self, url: str, default: Any = None) -> Any:
+        return self._records.get(canonicalize_url(url), default)
+
+    def taxonomies(self, url: str) -> list[str]:
+        return list(self._taxonomies.get(canonicalize_url(url), ()))
+
+    def __contains__(self, url: object) -> bool:
+        return isinstance(url, str) and canonicalize_url(url) in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def records(self) -> list[Any]:
+        return list(self._records.values())
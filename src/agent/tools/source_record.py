@@ -0,0 +1,144 @@
+"""Compact in-memory representation of web search sources.
+
+Wide scans produce thousands of search results that are normalized, merged
+with reliability labels and formatted several times before they reach state.
+``SourceRecord`` keeps one slotted object per result (with interned URL and
+domain strings) and ``ReliableSourceView`` layers reliability fields on top of
+an existing record or mapping without copying it. Both expose read-only
+mapping access (``get``, ``[]``, ``keys``) so formatting code can treat them
+like the ``WebSearchResult`` dicts they replace; call ``to_dict()`` (or
+``dict(record)``) at graph boundaries.
+"""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from typing import Any, Iterator, Mapping
+from urllib.parse import urlsplit
+
+from schemas import WebSearchResult
+
+_BASE_FIELDS = ("title", "url", "snippet", "published")
+_RELIABILITY_FIELDS = ("reliability", "reliability_rationale", "source_type")
+# Readable through ``get`` but not part of the serialized result.
+_DERIVED_FIELDS = ("domain", "published_at")
+
+
+def _domain(url: str) -> str:
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+    return sys.intern(host[4:] if host.startswith("www.") else host)
+
+
+class _ReadOnlyMapping:
+    __slots__ = ()
+    _fields: tuple[str, ...] = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self._fields or key in _DERIVED_FIELDS else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields
+
+    def keys(self) -> tuple[str, ...]:
+        return self._fields
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def to_dict(self) -> WebSearchResult:
+        return {key: getattr(self, key) for key in self._fields}  # type: ignore[return-value]
+
+
+class SourceRecord(_ReadOnlyMapping):
+    __slots__ = ("title", "url", "snippet", "published", "domain", "published_at")
+    _fields = _BASE_FIELDS
+
+    def __init__(
+        self,
+        title: str,
+        url: str,
+        snippet: str = "",
+        published: str = "",
+        published_at: datetime | None = None,
+    ) -> None:
+        self.title = title
+        self.url = sys.intern(url)
+        self.snippet = snippet
+        self.published = published
+        self.domain = _domain(url)
+        self.published_at = published_at
+
+    @classmethod
+    def from_mapping(cls, source: Mapping[str, Any] | SourceRecord) -> SourceRecord:
+        if isinstance(source, SourceRecord):
+            return source
+        return cls(
+            title=str(source.get("title") or ""),
+            url=str(source.get("url") or ""),
+            snippet=str(source.get("snippet") or ""),
+            published=str(source.get("published") or ""),
+        )
+
+    def with_reliability(
+        self,
+        reliability: str,
+        rationale: str = "",
+        source_type: str = "Unknown",
+    ) -> ReliableSourceView:
+        return ReliableSourceView(self, reliability, rationale, source_type)
+
+    def __repr__(self) -> str:
+        return f"SourceRecord(url={self.url!r}, title={self.title!r})"
+
+
+class ReliableSourceView(_ReadOnlyMapping):
+    """Reliability labels over a shared base source (record or plain mapping)."""
+
+    __slots__ = ("base", "reliability", "reliability_rationale", "source_type")
+    _fields = _BASE_FIELDS + _RELIABILITY_FIELDS
+
+    def __init__(
+        self,
+        base: Mapping[str, Any] | SourceRecord,
+        reliability: str,
+        reliability_rationale: str = "",
+        source_type: str = "Unknown",
+    ) -> None:
+        self.base = base
+        self.reliability = reliability
+        self.reliability_rationale = reliability_rationale
+        self.source_type = source_type
+
+    def __getattr__(self, key: str) -> Any:
+        # Only reached for base and derived fields; slots cover the rest.
+        if key in _BASE_FIELDS or key in _DERIVED_FIELDS:
+            base = object.__getattribute__(self, "base")
+            if isinstance(base, SourceRecord):
+                return getattr(base, key)
+            if key == "domain":
+                return _domain(str(base.get("url") or ""))
+            return base.get(key, None if key == "published_at" else "")
+        raise AttributeError(key)
+
+    def __repr__(self) -> str:
+        return f"ReliableSourceView(url={self.url!r}, reliability={self.reliability!r})"
+
+
+def as_source_dict(source: Mapping[str, Any] | _ReadOnlyMapping) -> dict[str, Any]:
+    """Convert a record, view or mapping into a plain ``WebSearchResult`` dict."""
+    if isinstance(source, _ReadOnlyMapping):
+        return dict(source.to_dict())
+    return dict(source)
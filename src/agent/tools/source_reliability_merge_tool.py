@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Any
 
 from agent.tools.base import KwargTool
+from agent.tools.source_record import ReliableSourceView
+from agent.tools.url_canonicalization import canonicalize_url
 
 
 class SourceReliabilityMergeTool(KwargTool):
@@ -14,32 +16,32 @@ class SourceReliabilityMergeTool(KwargTool):
         sources = list(kwargs.get("sources") or report.get("sources") or [])
         assessments = list(kwargs.get("assessments") or [])
         by_url = {
-            str(assessment.get("url") or "").strip(): assessment
+            canonicalize_url(str(assessment.get("url") or "")): assessment
             for assessment in assessments
             if str(assessment.get("url") or "").strip()
         }
 
-        updated_sources: list[dict[str, Any]] = []
+        # Views share the underlying source instead of copying it per label.
+        updated_sources: list[ReliableSourceView] = []
         for source in sources:
-            url = str(source.get("url") or "").strip()
-            assessment = by_url.get(url)
+            assessment = by_url.get(canonicalize_url(str(source.get("url") or "")))
             if assessment:
                 updated_sources.append(
-                    {
-                        **source,
-                        "reliability": assessment.get("reliability", "Unknown"),
-                        "reliability_rationale": assessment.get("rationale", ""),
-                        "source_type": assessment.get("source_type", "Unknown"),
-                    }
+                    ReliableSourceView(
+                        source,
+                        reliability=assessment.get("reliability", "Unknown"),
+                        reliability_rationale=assessment.get("rationale", ""),
+                        source_type=assessment.get("source_type", "Unknown"),
+                    )
                 )
             else:
                 updated_sources.append(
-                    {
-                        **source,
-                        "reliability": "Unknown",
-                        "reliability_rationale": "No assessment returned.",
-                        "source_type": "Unknown",
-                    }
+                    ReliableSourceView(
+                        source,
+                        reliability="Unknown",
+                        reliability_rationale="No assessment returned.",
+                        source_type="Unknown",
+                    )
                 )
 
         reliable_sources = [
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Mapping
+
+from agent.tools.base import KwargTool
+from agent.tools.source_record import as_source_dict
+from agent.tools.url_canonicalization import canonicalize_url
+
+
+def source_id(source: Mapping[str, Any]) -> str:
+    return canonicalize_url(str(source.get("url") or ""))
+
+
+def compact_report(
+    report: Mapping[str, Any],
+) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Split a report with inline sources into an id-only report and store entries."""
+    compact = {
+        key: value
+        for key, value in report.items()
+        if key not in ("sources", "reliable_sources")
+    }
+    entries: dict[str, dict[str, Any]] = {}
+    if "sources" not in report:
+        # Already compact: nothing to move into the store.
+        return compact, entries
+    taxonomy = str(report.get("taxonomy") or "").strip()
+    source_ids: list[str] = []
+    for source in report.get("sources") or []:
+        sid = source_id(source)
+        if not sid or sid in entries:
+            continue
+        source_ids.append(sid)
+        entry = as_source_dict(source)
+        if taxonomy:
+            entry["taxonomies"] = [taxonomy]
+        entries[sid] = entry
+    compact["source_ids"] = source_ids
+
+    if "reliable_sources" in report:
+        reliable_ids = list(
+            dict.fromkeys(
+                sid for sid in (source_id(s) for s in report.get("reliable_sources") or []) if sid
+            )
+        )
+        if reliable_ids != source_ids:
+            compact["reliable_source_ids"] = reliable_ids
+    return compact, entries
+
+
+def compact_reports(
+    reports: Iterable[Mapping[str, Any]],
+) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
+    compacted: list[dict[str, Any]] = []
+    store: dict[str, dict[str, Any]] = {}
+    for report in reports:
+        compact, entries = compact_report(report)
+        compacted.append(compact)
+        store.update(entries)
+    return compacted, store
+
+
+def report_sources(
+    report: Mapping[str, Any],
+    store: Mapping[str, Mapping[str, Any]] | None,
+    *,
+    reliable: bool = False,
+) -> list[Mapping[str, Any]]:
+    """Resolve a report's sources from the store, falling back to inline lists."""
+    if "source_ids" not in report:
+        if reliable:
+            return list(report.get("reliable_sources") or report.get("sources") or [])
+        return list(report.get("sources") or [])
+
+    store = store or {}
+    ids = report.get("source_ids") or []
+    if reliable and report.get("reliable_source_ids"):
+        ids = report["reliable_source_ids"]
+    return [store[sid] for sid in ids if sid in store]
+
+
+class SourceStoreTool(KwargTool):
+    name: str = "source_store_tool"
+    description: str = (
+        "Moves report sources into the shared url-keyed source store and resolves them back."
+    )
+
+    def _run(self, **kwargs: Any) -> Any:
+        mode = str(kwargs.get("mode") or "resolve")
+        if mode == "compact_reports":
+            reports, store = compact_reports(kwargs.get("reports") or [])
+            return {"reports": reports, "source_store": store}
+        return report_sources(
+            kwargs.get("report") or {},
+            kwargs.get("source_store"),
+            reliable=bool(kwargs.get("reliable", False)),
+        )
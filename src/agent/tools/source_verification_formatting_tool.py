@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Any
 
 from agent.tools.base import KwargTool
+from agent.tools.source_block_cache import SOURCE_BLOCKS, source_label
+from agent.tools.source_store_tool import source_id
 
 
 class SourceVerificationFormattingTool(KwargTool):
@@ -11,22 +13,14 @@ class SourceVerificationFormattingTool(KwargTool):
 
     def _run(self, **kwargs: Any) -> str:
         sources = list(kwargs.get("sources") or [])
-        if not sources:
-            return "(No sources provided.)"
-        lines: list[str] = []
-        for i, source in enumerate(sources, start=1):
-            title = str(source.get("title") or "Untitled").strip()
-            url = str(source.get("url") or "").strip()
-            snippet = str(source.get("snippet") or "").strip()
-            published = str(source.get("published") or "").strip()
-            lines.append(
-                "\n".join(
-                    [
-                        f"[{i}] {title}",
-                        f"URL: {url}",
-                        f"Published: {published or 'Unknown'}",
-                        f"Snippet: {snippet or 'No snippet'}",
-                    ]
-                ).strip()
-            )
-        return "\n\n".join(lines)
+        # With the scan's source numbers each source keeps its label across
+        # stages; without them sources are numbered by position.
+        numbers = kwargs.get("numbers")
+        if numbers is None:
+            labels = [str(i) for i in range(1, len(sources) + 1)]
+        else:
+            numbers = dict(numbers)
+            labels = [source_label(numbers, source_id(source)) for source in sources]
+        return (kwargs.get("cache") or SOURCE_BLOCKS).block(
+            zip(labels, sources), kwargs.get("style"), reliability=False
+        )
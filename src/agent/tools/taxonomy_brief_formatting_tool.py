@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Any
 
 from agent.tools.base import KwargTool
+from agent.tools.source_block_encoder import encode_source_block
 
 
 class TaxonomyBriefFormattingTool(KwargTool):
@@ -29,6 +30,13 @@ class TaxonomyBriefFormattingTool(KwargTool):
         sources = list(kwargs.get("sources") or [])
         if not sources:
             return "(No results returned.)"
+        style = kwargs.get("style")
+        if style is not None and style.layout == "compact":
+            return encode_source_block(
+                ((str(i), source) for i, source in enumerate(sources, start=1)),
+                style,
+                reliability=False,
+            )
         lines: list[str] = []
         for i, source in enumerate(sources, start=1):
             published = (
@@ -1,20 +1,37 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterator
 
+from agent.streaming import MarkdownStream
 from agent.tools.base import KwargTool
 
-from helper_functions import format_all_risks_md
+from helper_functions import iter_risk_register_md
+
+
+def iter_update_md(risks: list[dict[str, Any]], change_log: list[str] | None) -> Iterator[str]:
+    yield "# Updated Risk Register\n"
+    yield from iter_risk_register_md(risks)
+    if change_log is None:
+        return
+    yield "\n# Change Log"
+    for bullet in change_log:
+        yield f"- {bullet}"
 
 
 class UpdateRenderTool(KwargTool):
     name: str = "update_render_tool"
-    description: str = "Formats updated risk register plus change log into markdown."
+    description: str = (
+        "Formats updated risk register plus change log into markdown, "
+        "streaming one chunk per risk."
+    )
 
     def _run(self, **kwargs: Any) -> str:
         risks = list(kwargs.get("risks") or [])
-        change_log = list(kwargs.get("change_log") or [])
-        lines: list[str] = ["# Updated Risk Register", "", format_all_risks_md(risks), "", "# Change Log"]
-        for bullet in change_log:
-            lines.append(f"- {bullet}")
-        return "\n".join(lines).strip()
+        # "preview" renders the risks streamed so far, without the change log.
+        change_log = (
+            None if kwargs.get("mode") == "preview" else list(kwargs.get("change_log") or [])
+        )
+        stream = kwargs.get("stream")
+        if not isinstance(stream, MarkdownStream):
+            stream = MarkdownStream(str(kwargs.get("stream_name") or "updated_register"))
+        return stream.sync(iter_update_md(risks, change_log)).text().strip()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+_TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "yclid",
+        "igshid",
+        "mc_cid",
+        "mc_eid",
+        "_hsenc",
+        "_hsmi",
+        "cmpid",
+        "smid",
+        "ref",
+        "ref_src",
+        "ref_url",
+        "referrer",
+        "src",
+        "amp",
+        "outputtype",
+        "guccounter",
+        "guce_referrer",
+        "guce_referrer_sig",
+        "ito",
+        "mod",
+        "taid",
+        "sr_share",
+    }
+)
+_TRACKING_PREFIXES = ("utm_", "at_", "pk_", "hsa_", "oly_")
+_HOST_PREFIXES = ("www.", "amp.", "m.")
+_AMP_SUFFIX = re.compile(r"(?:/amp|\.amp)(?:\.html?)?$", re.IGNORECASE)
+_DUPLICATE_SLASHES = re.compile(r"/{2,}")
+
+
+def _is_tracking_param(key: str) -> bool:
+    key = key.lower()
+    return key in _TRACKING_PARAMS or key.startswith(_TRACKING_PREFIXES)
+
+
+@lru_cache(maxsize=8192)
+def canonicalize_url(url: str) -> str:
+    """
+    Map equivalent article URLs to one canonical form.
+
+    Unifies http/https, ``www.``/``m.``/``amp.`` hosts, default ports, AMP
+    path variants, trailing slashes, fragments and tracking query parameters
+    (utm_*, fbclid, gclid, ...). Remaining query parameters are sorted.
+    Strings that are not http(s) URLs are returned stripped but otherwise
+    unchanged.
+    """
+    text = (url or "").strip()
+    if not text:
+        return ""
+    if "://" not in text and text.lower().startswith("www."):
+        text = f"https://{text}"
+    try:
+        parts = urlsplit(text)
+        port = parts.port
+    except ValueError:
+        return text
+    if parts.scheme.lower() not in ("http", "https") or not parts.hostname:
+        return text
+
+    host = parts.hostname.lower()
+    for prefix in _HOST_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = _DUPLICATE_SLASHES.sub("/", parts.path or "")
+    if path.lower().startswith("/amp/"):
+        path = path[4:]
+    path = _AMP_SUFFIX.sub("", path).rstrip("/")
+
+    query_pairs = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ]
+    query = urlencode(sorted(query_pairs))
+    return f"https://{host}{path}" + (f"?{query}" if query else "")
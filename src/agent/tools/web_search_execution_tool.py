@@ -1,29 +1,108 @@
 from __future__ import annotations
 
+from datetime import datetime, timezone
 from typing import Any
 
+from agent.configuration import current_configuration
 from agent.tools.base import KwargTool
+from agent.tools.published_dates import date_from_url, parse_published
+from agent.tools.source_record import SourceRecord
+from agent.tools.url_canonicalization import canonicalize_url
 
 from models import get_web_search_llm
 
 
-def _find_sources(obj: Any) -> list[dict[str, Any]]:
-    if isinstance(obj, list):
-        out: list[dict[str, Any]] = []
-        for item in obj:
-            out.extend(_find_sources(item))
-        return out
+_CITATION_TYPES = frozenset({"url_citation", "citation"})
+
+
+def _message_parts(obj: Any) -> list[Any]:
+    """Blocks of a message, chunk or raw payload in response order.
 
+    v0 messages keep the search calls in ``additional_kwargs["tool_outputs"]``;
+    they ran before the text that cites them, so they come first.
+    """
+    if isinstance(obj, list):
+        return obj
     if isinstance(obj, dict):
-        out: list[dict[str, Any]] = []
-        sources = obj.get("sources")
-        if isinstance(sources, list) and all(isinstance(source, dict) for source in sources):
-            out.extend(sources)
-        for value in obj.values():
-            out.extend(_find_sources(value))
-        return out
+        return [obj]
+    tool_outputs = (getattr(obj, "additional_kwargs", None) or {}).get("tool_outputs")
+    parts = list(tool_outputs) if isinstance(tool_outputs, list) else []
+    content = getattr(obj, "content", None)
+    if isinstance(content, list):
+        parts.extend(content)
+    return parts
+
+
+def _schema_sources(obj: Any) -> list[dict[str, Any]]:
+    """Sources at the places the Responses API puts them.
+
+    Reads ``web_search_call.action.sources`` and ``url_citation`` annotations
+    of text blocks, for whole messages (``responses/v1`` content or v0
+    ``tool_outputs``), raw output items and lists of streamed chunks. Repeat
+    URLs are merged so a citation's title fills in a bare search source.
+    """
+    found: dict[str, dict[str, Any]] = {}
 
-    return []
+    def _add(source: Any) -> None:
+        if not isinstance(source, dict):
+            return
+        url = source.get("url") or source.get("link")
+        if not url:
+            return
+        existing = found.get(url)
+        if existing is None:
+            found[url] = dict(source)
+        else:
+            for key, value in source.items():
+                if value and not existing.get(key):
+                    existing[key] = value
+
+    stack = list(reversed(obj)) if isinstance(obj, list) else [obj]
+    while stack:
+        item = stack.pop()
+        if not isinstance(item, dict):
+            # A message or chunk: queue its blocks in order.
+            stack.extend(reversed(_message_parts(item)))
+            continue
+        kind = item.get("type")
+        if kind == "web_search_call":
+            for source in (item.get("action") or {}).get("sources") or ():
+                _add(source)
+        elif kind == "message":
+            stack.extend(reversed(item.get("content") or []))
+        else:
+            for annotation in item.get("annotations") or ():
+                if isinstance(annotation, dict) and annotation.get("type") in _CITATION_TYPES:
+                    _add(annotation)
+            sources = item.get("sources")
+            if isinstance(sources, list):
+                for source in sources:
+                    _add(source)
+    return list(found.values())
+
+
+def _walk_sources(obj: Any) -> list[dict[str, Any]]:
+    """Generic fallback: every ``sources`` list of dicts anywhere in ``obj``."""
+    out: list[dict[str, Any]] = []
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            sources = item.get("sources")
+            if isinstance(sources, list) and all(isinstance(source, dict) for source in sources):
+                out.extend(sources)
+            stack.extend(reversed(list(item.values())))
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+        elif hasattr(item, "content"):
+            stack.append(getattr(item, "additional_kwargs", None) or {})
+            stack.append(item.content)
+    return out
+
+
+def _find_sources(obj: Any) -> list[dict[str, Any]]:
+    """Source dicts in a search response: a message, its content, or streamed chunks."""
+    return _schema_sources(obj) or _walk_sources(obj)
 
 
 class WebSearchExecutionTool(KwargTool):
@@ -49,21 +128,7 @@ class WebSearchExecutionTool(KwargTool):
             return deduped[:max_queries]
 
         if mode == "extract_sources":
-            message = kwargs.get("message")
-            payload: Any = []
-            if hasattr(message, "content"):
-                payload = message.content
-            elif isinstance(message, dict):
-                payload = message
-            elif hasattr(message, "response_metadata") and getattr(
-                message, "response_metadata"
-            ):
-                payload = message.response_metadata
-            elif hasattr(message, "additional_kwargs") and getattr(
-                message, "additional_kwargs"
-            ):
-                payload = message.additional_kwargs
-            raw_sources = _find_sources(payload)
+            raw_sources = _find_sources(kwargs.get("message") or [])
             return self._normalize_sources(raw_sources, limit=int(kwargs.get("limit") or 20))
 
         query = str(kwargs.get("query") or "").strip()
@@ -71,12 +136,19 @@ class WebSearchExecutionTool(KwargTool):
             return []
         num = int(kwargs.get("num") or 10)
         client = kwargs.get("search_client") or get_web_search_llm()
-        # Force non-streaming here to avoid chunk-shape mismatches in tool paths.
+        stream = kwargs.get("stream")
+        if stream is None:
+            stream = current_configuration().stream_web_search
+        if stream and hasattr(client, "stream"):
+            # Sources are read from the chunks as they arrive; no aggregation.
+            raw_sources = _find_sources(list(client.stream(query)))
+            return self._normalize_sources(raw_sources, limit=num)
+        # Otherwise force non-streaming, which some clients only honour as a kwarg.
         try:
             message = client.invoke(query, stream=False)
         except TypeError:
             message = client.invoke(query)
-        raw_sources = _find_sources(getattr(message, "content", message))
+        raw_sources = _find_sources(message)
         return self._normalize_sources(raw_sources, limit=num)
 
     @staticmethod
@@ -84,31 +156,37 @@ class WebSearchExecutionTool(KwargTool):
         raw_sources: list[dict[str, Any]],
         *,
         limit: int,
-    ) -> list[dict[str, str]]:
-        normalized: list[dict[str, str]] = []
+    ) -> list[SourceRecord]:
+        normalized: list[SourceRecord] = []
         seen_urls: set[str] = set()
+        now = datetime.now(timezone.utc)
         for source in raw_sources:
             url = str(source.get("url") or source.get("link") or "").strip()
-            if not url or url in seen_urls:
+            key = canonicalize_url(url)
+            if not key or key in seen_urls:
                 continue
-            seen_urls.add(url)
+            seen_urls.add(key)
+            published = str(
+                source.get("published")
+                or source.get("date")
+                or source.get("published_date")
+                or ""
+            ).strip()
+            published_at = parse_published(published, now) or date_from_url(url)
             normalized.append(
-                {
-                    "title": str(source.get("title") or source.get("name") or "").strip(),
-                    "url": url,
-                    "snippet": str(
+                SourceRecord(
+                    title=str(source.get("title") or source.get("name") or "").strip(),
+                    url=url,
+                    snippet=str(
                         source.get("snippet")
                         or source.get("description")
                         or source.get("text")
                         or ""
                     ).strip(),
-                    "published": str(
-                        source.get("published")
-                        or source.get("date")
-                        or source.get("published_date")
-                        or ""
-                    ).strip(),
-                }
+                    # Relative phrases ("2 days ago") go stale; keep the date.
+                    published=published_at.date().isoformat() if published_at else published,
+                    published_at=published_at,
+                )
             )
             if len(normalized) >= limit:
                 break
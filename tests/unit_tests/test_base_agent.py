@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from copy import deepcopy
+from typing import TypedDict
 
 import pytest
 
 from agent.agents.base_agent import BaseAgent
+from agent.configuration import Configuration
+from schemas import ElaboratorOutput
 
 
 class _FakeExecutor:
@@ -86,3 +89,102 @@ def test_base_agent_raises_when_template_keys_missing_from_static_context():
             llm_factory=_fake_llm_factory,
         )
     assert "missing_key" in str(exc.value)
+
+
+class _StreamingExecutor(_FakeExecutor):
+    def __init__(self, partials, final) -> None:
+        super().__init__()
+        self.partials = partials
+        self.final = final
+
+    def stream(self, messages):
+        self.last_messages = messages
+        yield from self.partials
+
+    def invoke(self, messages):
+        self.last_messages = messages
+        return self.final
+
+
+def _streaming_agent(executor, output_format=ElaboratorOutput) -> BaseAgent:
+    llm = _FakeLLM()
+    llm.executor = executor
+    return BaseAgent(
+        model="fake-model",
+        skills=[],
+        output_format=output_format,
+        system_template="Today is {today}.",
+        static_context={},
+        today_provider=lambda: "January 01, 2026",
+        llm_factory=lambda _model: llm,
+    )
+
+
+def test_base_agent_invoke_streaming_forwards_partials_and_returns_final():
+    partials = [{"answer": "Rates"}, {"answer": "Rates rise"}, {"answer": "Rates rise."}]
+    agent = _streaming_agent(_StreamingExecutor(partials, final={"answer": "unused"}))
+    seen = []
+    out = agent.invoke_streaming({}, seen.append)
+    assert seen == partials
+    assert out == {"answer": "Rates rise."}
+
+
+def test_base_agent_invoke_streaming_falls_back_when_final_is_invalid(monkeypatch, caplog):
+    import importlib
+
+    events = []
+    monkeypatch.setattr(
+        importlib.import_module("agent.agents.base_agent"), "stream_writer", lambda: events.append
+    )
+    agent = _streaming_agent(_StreamingExecutor([{}], final={"answer": "validated"}))
+    seen = []
+    assert agent.invoke_streaming({}, seen.append) == {"answer": "validated"}
+    assert seen == [{}, {"answer": "validated"}]  # the re-invoked result replaces the stream
+    assert events == [{"type": "structured_output_retry", "agent": "fake-model"}]
+    assert "failed validation" in caplog.text
+
+
+class _ListOutput(TypedDict):
+    items: list
+
+
+def test_base_agent_invoke_streaming_repairs_json_encoded_fields_without_reinvoking():
+    executor = _StreamingExecutor([{"items": '[{"id": 1}]'}], final={"items": ["unused"]})
+    agent = _streaming_agent(executor, output_format=_ListOutput)
+    seen = []
+    assert agent.invoke_streaming({}, seen.append) == {"items": [{"id": 1}]}
+    assert seen[-1] == {"items": [{"id": 1}]}
+
+
+def test_base_agent_resolves_model_tier_per_run_and_caches_executors(monkeypatch):
+    import importlib
+
+    base_module = importlib.import_module("agent.agents.base_agent")
+    built = []
+
+    def _factory(model):
+        built.append(model)
+        return _FakeLLM()
+
+    agent = BaseAgent(
+        model="balanced-model",
+        skills=[],
+        output_format=dict,
+        system_template="Today is {today}.",
+        static_context={},
+        today_provider=lambda: "January 01, 2026",
+        llm_factory=_factory,
+    )
+    monkeypatch.setattr("models.tier_model", lambda tier, overrides=None, provider=None: (overrides or {}).get(tier, f"{tier}-model"))
+    agent.assign_model_key("router_agent")
+    assert agent.model == "fast-model"
+
+    run_config = Configuration(
+        agent_model_tiers={"router_agent": "strong"}, model_tiers={"strong": "big-model"}
+    )
+    monkeypatch.setattr(base_module, "current_configuration", lambda: run_config)
+    agent({})
+    agent({})
+    monkeypatch.setattr(base_module, "current_configuration", Configuration)
+    agent({})
+    assert built == ["balanced-model", "big-model", "fast-model"]
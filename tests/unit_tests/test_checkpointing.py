@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import operator
+from typing import Annotated, TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from agent.checkpointing import build_sqlite_checkpointer, pending_nodes, resume_run
+from agent.graph import build_graph
+
+
+class _State(TypedDict, total=False):
+    log: Annotated[list, operator.add]
+
+
+def test_resume_run_reexecutes_only_the_failed_tail(tmp_path):
+    calls: list[str] = []
+    fail = {"on": True}
+
+    def search(_state):
+        calls.append("search")
+        return {"log": ["search"]}
+
+    def summarize(_state):
+        calls.append("summarize")
+        if fail["on"]:
+            raise RuntimeError("timeout")
+        return {"log": ["summarize"]}
+
+    builder = StateGraph(_State)
+    builder.add_node("search", search)
+    builder.add_node("summarize", summarize)
+    builder.add_edge(START, "search")
+    builder.add_edge("search", "summarize")
+    builder.add_edge("summarize", END)
+    graph = builder.compile(
+        checkpointer=build_sqlite_checkpointer(str(tmp_path / "runs.sqlite"))
+    )
+
+    try:
+        graph.invoke({"log": []}, {"configurable": {"thread_id": "t1"}})
+    except RuntimeError:
+        pass
+    assert pending_nodes(graph, "t1") == ("summarize",)
+
+    fail["on"] = False
+    final_state = resume_run(graph, "t1")
+    assert final_state["log"] == ["search", "summarize"]
+    assert calls == ["search", "summarize", "summarize"]
+    assert pending_nodes(graph, "t1") == ()
+
+
+def test_build_graph_accepts_checkpointer(tmp_path):
+    saver = build_sqlite_checkpointer(str(tmp_path / "graph.sqlite"))
+    assert build_graph(checkpointer=saver).checkpointer is saver
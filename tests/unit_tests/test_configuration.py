@@ -1,9 +1,44 @@
+import json
+
 from langgraph.pregel import Pregel
 
+from agent.configuration import Configuration, current_configuration
 from agent.graph import graph
+from models import resolve_model
 
 
 def test_placeholder() -> None:
     # TODO: You can add actual unit tests
     # for your graph and other logic here.
     assert isinstance(graph, Pregel)
+
+
+def test_configuration_layers_file_env_and_run_config(tmp_path, monkeypatch) -> None:
+    config_file = tmp_path / "erf.json"
+    config_file.write_text(
+        json.dumps({"relevance_max_rounds": 2, "qna_top_k": 8, "brief_max_sources": 5})
+    )
+    monkeypatch.setenv("ERF_CONFIG_FILE", str(config_file))
+    monkeypatch.setenv("ERF_QNA_TOP_K", "4")
+    monkeypatch.setenv("ERF_STREAM_TOKENS", "false")
+    monkeypatch.setenv("ERF_TAXONOMY_WEIGHTS", '{"Climate": 2}')
+
+    assert current_configuration() == Configuration(
+        relevance_max_rounds=2,
+        qna_top_k=4,
+        brief_max_sources=5,
+        stream_tokens=False,
+        taxonomy_weights={"Climate": 2},
+    )
+
+    run = Configuration.from_runnable_config(
+        {"configurable": {"thread_id": "t1", "relevance_max_rounds": "1", "qna_top_k": None}}
+    )
+    assert run.relevance_max_rounds == 1
+    assert run.qna_top_k == 4
+    assert run.refinement_max_rounds == 3
+
+
+def test_run_provider_selects_that_providers_tier_models() -> None:
+    assert resolve_model("router_agent", {"llm_provider": "openai"}) == "gpt-4.1-nano"
+    assert resolve_model("router_agent", {"llm_provider": "deepseek"}) == "deepseek-chat"
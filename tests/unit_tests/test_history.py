@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph.message import add_messages
+
+from agent.history import fold_summary, plan_history_update
+from helper_functions import format_risk_md
+
+
+def _register(heading: str, count: int) -> str:
+    risks = [{"title": f"Risk {n}", "category": ["Geo"], "narrative": "n"} for n in range(count)]
+    return heading + "\n" + "\n".join(format_risk_md(r, i) for i, r in enumerate(risks, start=1))
+
+
+def _session(turns: int) -> list:
+    messages = []
+    for turn in range(1, turns + 1):
+        messages += [HumanMessage(content=f"question {turn}"), AIMessage(content=f"answer {turn}")]
+    messages.append(HumanMessage(content="latest question"))
+    return add_messages([], messages)
+
+
+def test_plan_history_update_keeps_window_and_folds_older_turns():
+    messages = _session(5)
+    update = plan_history_update(messages, "- User asked: question 0", max_turns=2)
+
+    kept = add_messages(messages, update["messages"])
+    assert [m.content for m in kept] == ["question 5", "answer 5", "latest question"]
+    summary = update["conversation_summary"].splitlines()
+    assert summary[0] == "- User asked: question 0"
+    assert summary[-1] == "- User asked: question 4 → answer 4"
+
+    assert plan_history_update(kept, update["conversation_summary"], max_turns=2) == {}
+
+
+def test_plan_history_update_replaces_superseded_registers_with_references():
+    messages = add_messages(
+        [],
+        [
+            HumanMessage(content="scan"),
+            AIMessage(content=_register("# Risk Register\n", 3)),
+            HumanMessage(content="update risk 2"),
+            AIMessage(content=_register("# Updated Risk Register\n", 3)),
+        ],
+    )
+    kept = add_messages(messages, plan_history_update(messages, max_turns=6)["messages"])
+    assert kept[1].content == (
+        "[Risk Register with 3 risk(s) omitted from history; superseded by a later register.]"
+    )
+    assert kept[3].content.startswith("# Updated Risk Register")
+
+
+def test_fold_summary_is_bounded():
+    summary = ""
+    for turn in range(30):
+        summary = fold_summary(summary, [HumanMessage(content=f"q{turn}")], max_lines=5)
+    assert summary.splitlines() == [f"- User asked: q{turn}" for turn in range(25, 30)]
+
+
+def test_plan_history_update_keeps_latest_full_register_beyond_the_window():
+    register = _register("# Risk Register\n", 2)
+    diff = (
+        "# Updated Risk Register\n\n_1 risk(s) changed or added, 0 removed, 1 unchanged; "
+        "register now holds 2 risk(s)._\n" + format_risk_md({"title": "Risk 1", "category": [], "narrative": "m"}, 2)
+    )
+    messages = [HumanMessage(content="scan"), AIMessage(content=register)]
+    messages += [HumanMessage(content="update risk 2"), AIMessage(content=diff)]
+    for turn in range(6):
+        messages += [HumanMessage(content=f"question {turn}"), AIMessage(content=f"answer {turn}")]
+    messages = add_messages([], messages)
+
+    kept = add_messages(messages, plan_history_update(messages, max_turns=6)["messages"])
+    assert kept[0].content == register
+    assert kept[1].content == "question 0"
+    assert len([m for m in kept if m.content.startswith("#")]) == 1
+
+    window = add_messages([], messages[:4])
+    assert plan_history_update(window, max_turns=6) == {}  # a change-only register supersedes nothing
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from langchain_core.messages import AIMessage
 
+from agent.configuration import Configuration
 from nodes.add_signposts_all_risks_node import add_signposts_all_risks_node
 from nodes.assess_portfolio_relevance_node import assess_portfolio_relevance_node
 from nodes.broad_scan_node import broad_scan_node
@@ -66,8 +67,8 @@ def test_refine_relevance_render_contracts(monkeypatch):
         "nodes.refine_single_risk_node.refine_risk_agent",
         lambda _risk: {"title": "R", "category": [], "narrative": ""},
     )
-    refined = refine_single_risk_node({"risk_candidate": {"title": "r"}})
-    assert "finalized_risks" in refined
+    refined = refine_single_risk_node({"risk_candidate": {"title": "r"}, "risk_id": "D1"})
+    assert refined["refined_risks"][0]["risk_id"] == "D1"
 
     monkeypatch.setattr(
         "nodes.assess_portfolio_relevance_node.relevance_agent",
@@ -76,10 +77,18 @@ def test_refine_relevance_render_contracts(monkeypatch):
     assessed = assess_portfolio_relevance_node({"risk_candidate": {"title": "r"}})
     assert "finalized_risks" in assessed
 
-    monkeypatch.setattr("nodes.render_report_node.render_report_agent", lambda _state: "markdown")
-    rendered = render_report_node({"finalized_risks": []})
+    class _Renderer:
+        def final_risks(self, state):
+            return list(state["finalized_risks"])
+
+        def render(self, risks):
+            return f"markdown for {len(risks)} risk(s)"
+
+    monkeypatch.setattr("nodes.render_report_node.render_report_agent", _Renderer())
+    rendered = render_report_node({"finalized_risks": [{"title": "R"}]})
     assert isinstance(rendered["messages"][0], AIMessage)
-    assert rendered["messages"][0].content == "markdown"
+    assert rendered["messages"][0].content == "markdown for 1 risk(s)"
+    assert rendered["risk"] == {"risks": [{"title": "R"}]}
 
 
 def test_updater_elaborator_signpost_node_contracts(monkeypatch):
@@ -104,3 +113,205 @@ def test_updater_elaborator_signpost_node_contracts(monkeypatch):
     signpost_out = add_signposts_all_risks_node({"risk": {"risks": []}})
     assert signpost_out["risk"] == {"risks": []}
     assert signpost_out["messages"][0].content == "signposted"
+
+
+def _patch_scan(monkeypatch, drafts):
+    monkeypatch.setattr("nodes.router_node.router_agent", lambda _state: "initiate_web_search")
+    monkeypatch.setattr("nodes.plan_web_search_node.current_configuration", lambda: Configuration(global_query_plan=False))
+    monkeypatch.setattr(
+        "nodes.web_search_node.web_search_agent",
+        lambda state: {"taxonomy": state["taxonomy"], "queries": [], "sources": [], "brief_md": "", "generated_at": "now"},
+    )
+    monkeypatch.setattr("nodes.verify_sources_node.verify_sources_agent", lambda _state: [])
+    monkeypatch.setattr("nodes.compare_events_node.compare_events_agent", lambda _state: [])
+    monkeypatch.setattr("nodes.summarize_events_node.summarize_events_agent", lambda _state: drafts)
+    monkeypatch.setattr(
+        "nodes.assess_portfolio_relevance_node.relevance_agent",
+        lambda risk: {**risk, "portfolio_relevance": "High", "audit_log": ["Relevance validated."]},
+    )
+
+
+def test_scan_runs_refinement_alongside_relevance_and_merges_by_risk_id(monkeypatch):
+    from langchain_core.messages import HumanMessage
+
+    from agent.graph import build_graph
+
+    drafts = [
+        {"title": "Taiwan strait blockade", "category": ["Geo"], "narrative": "Naval standoff escalates.", "sources": []},
+        {"title": "Sovereign debt stress", "category": ["Macro"], "narrative": "Bond yields surge.", "sources": []},
+    ]
+    _patch_scan(monkeypatch, drafts)
+    monkeypatch.setattr(
+        "nodes.refine_single_risk_node.refine_risk_agent",
+        lambda risk: {**risk, "narrative": risk["narrative"] + " Refined.", "audit_log": ["Refined."]},
+    )
+
+    out = build_graph().invoke(
+        {"messages": [HumanMessage(content="run a scan")]},
+        {"configurable": {"enable_refinement": True}},
+    )
+    assert sorted(risk["risk_id"] for risk in out["refined_risks"]) == ["D1", "D2"]
+    report = out["messages"][-1].content
+    assert [risk["title"] for risk in out["risk"]["risks"]] == ["Taiwan strait blockade", "Sovereign debt stress"]
+    assert report.count("Refined.") == 4  # narrative and governance history
+    assert report.count("Relevance validated.") == 2
+    assert report.index("Taiwan strait blockade") < report.index("Sovereign debt stress")
+
+
+def test_relevance_worker_signposts_each_risk_in_pipeline_mode(monkeypatch):
+    import importlib
+
+    node_module = importlib.import_module("nodes.assess_portfolio_relevance_node")
+    events = []
+    monkeypatch.setattr(
+        node_module, "current_configuration", lambda: Configuration(pipeline_signposts=True)
+    )
+    monkeypatch.setattr(node_module, "stream_writer", lambda: events.append)
+    monkeypatch.setattr(node_module, "relevance_agent", lambda risk: {**risk, "portfolio_relevance": "High"})
+
+    class _Signposter:
+        def signpost(self, risk, users_query=""):
+            return {**risk, "signposts": [{"description": f"Watch {users_query}", "status": "Rising"}]}
+
+    monkeypatch.setattr(node_module, "add_signposts_agent", _Signposter())
+    out = assess_portfolio_relevance_node(
+        {"risk_candidate": {"title": "R", "category": [], "narrative": ""}, "risk_id": "D2", "user_query": "rates"}
+    )
+    risk = out["finalized_risks"][0]
+    assert risk["signposts"][0]["description"] == "Watch rates"
+    assert events[0]["stream"] == "signposted_risk"
+    assert events[0]["risk_id"] == "D2"
+    assert events[0]["draft"] == 2
+    assert events[0]["chunk"].startswith("## Draft 2: R")
+    assert "Watch rates" in events[0]["chunk"]
+
+    from agent.tools.risk_markdown_render_tool import RiskMarkdownRenderTool
+
+    assert "Watch rates" in RiskMarkdownRenderTool().run(risks=[risk], dedupe=False)
+
+
+def test_pipelined_signposts_follow_refinement_and_stream_final_indices(monkeypatch):
+    import importlib
+
+    from langchain_core.messages import HumanMessage
+
+    assess_module = importlib.import_module("nodes.assess_portfolio_relevance_node")
+    render_module = importlib.import_module("nodes.render_report_node")
+    signposted = []
+
+    class _Signposter:
+        def signpost(self, risk, users_query=""):
+            signposted.append(risk["narrative"])
+            return {**risk, "signposts": [{"description": "Watch", "status": "Rising"}]}
+
+        def __call__(self, state):
+            risks = [self.signpost(risk) for risk in state["risk"]["risks"]]
+            return {"risk": {"risks": risks}, "message": ""}
+
+    events = []
+    refining = lambda: Configuration(pipeline_signposts=True, enable_refinement=True)  # noqa: E731
+    for module in (assess_module, render_module):
+        monkeypatch.setattr(module, "add_signposts_agent", _Signposter())
+        monkeypatch.setattr(module, "stream_writer", lambda: events.append)
+        monkeypatch.setattr(module, "current_configuration", refining)
+    monkeypatch.setattr(assess_module, "relevance_agent", lambda risk: dict(risk))
+
+    drafts = [{"title": "Dup", "narrative": "draft"}, {"title": "Tariffs", "narrative": "draft"}]
+    assessed = [
+        assess_portfolio_relevance_node({"risk_candidate": risk, "risk_id": f"D{n}"})["finalized_risks"][0]
+        for n, risk in enumerate([drafts[0], drafts[0], drafts[1]], start=1)
+    ]
+    assert signposted == [] and events == []  # the narrative may still change
+
+    state = {
+        "finalized_risks": assessed,
+        "refined_risks": [{**risk, "narrative": "refined"} for risk in assessed],
+        "messages": [HumanMessage(content="scan")],
+    }
+    out = render_report_node(state)
+    assert signposted == ["refined", "refined"]  # one per risk left after dedupe
+    assert all(risk["signposts"] for risk in out["risk"]["risks"])
+
+    monkeypatch.setattr(
+        render_module, "current_configuration", lambda: Configuration(pipeline_signposts=True)
+    )
+    render_report_node({"finalized_risks": assessed})
+    assert [(event["risk_id"], event["index"]) for event in events if event["type"] == "register_index"] == [
+        ("D1", 1),
+        ("D3", 2),
+    ]
+
+
+def test_relevance_fan_out_is_prioritized_and_first_k_renders_partial_register(monkeypatch):
+    from langchain_core.messages import HumanMessage
+
+    from agent.graph import build_graph
+
+    drafts = [
+        {"title": "Thin evidence drift", "category": ["Climate"], "narrative": "Little coverage.", "sources": []},
+        {
+            "title": "Well sourced bank run",
+            "category": ["Financial"],
+            "narrative": "Deposit flight accelerates.",
+            "sources": ["1. https://a.example/x", "2. https://b.example/y", "3. https://c.example/z"],
+        },
+        {"title": "Shipping lane closure", "category": ["Trade"], "narrative": "Canal traffic halts.", "sources": ["1. https://d.example/q"]},
+    ]
+    _patch_scan(monkeypatch, drafts)
+
+    stream = build_graph().stream(
+        {"messages": [HumanMessage(content="run a scan")]},
+        {"configurable": {"relevance_first_k": 1}},
+        stream_mode=["custom", "values"],
+    )
+    partial, final = [], None
+    for mode, event in stream:
+        if mode == "custom" and event.get("stream") == "partial_register":
+            partial.append(event["chunk"])
+        elif mode == "values":
+            final = event
+
+    assert "Well sourced bank run" in "\n".join(partial)
+    assert "Thin evidence drift" not in "\n".join(partial)
+    assert sorted(risk["risk_id"] for risk in final["finalized_risks"]) == ["D1", "D2", "D3"]
+    report = final["messages"][-1].content
+    assert report.index("Thin evidence drift") < report.index("Shipping lane closure")
+
+
+def test_second_scan_on_same_thread_starts_from_a_clean_slate(monkeypatch):
+    from langchain_core.messages import HumanMessage
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    from agent.graph import build_graph
+
+    scan = {}
+
+    def search(state):
+        source = {"url": f"https://{scan['name'].lower()}.example/{state['taxonomy']}", "title": "T"}
+        return {"taxonomy": state["taxonomy"], "queries": [], "sources": [source], "brief_md": "", "generated_at": "now"}
+
+    def summarize(_state):
+        return [
+            {"title": f"{scan['name']} {topic}", "category": ["Geo"], "narrative": topic, "sources": []}
+            for topic in ("tariff shock", "bank run")
+        ]
+
+    _patch_scan(monkeypatch, [])
+    monkeypatch.setattr("nodes.web_search_node.web_search_agent", search)
+    monkeypatch.setattr("nodes.summarize_events_node.summarize_events_agent", summarize)
+
+    graph = build_graph(checkpointer=InMemorySaver())
+    config = {"configurable": {"thread_id": "t"}}
+    outs = []
+    for name in ("Scan1", "Scan2"):
+        scan["name"] = name
+        outs.append(graph.invoke({"messages": [HumanMessage(content="run a scan")]}, config))
+
+    first, second = outs
+    report = second["messages"][-1].content
+    assert "Scan2 tariff shock" in report and "Scan2 bank run" in report
+    assert "Scan1" not in report
+    assert len(second["taxonomy_reports"]) == len(first["taxonomy_reports"])
+    assert len(second["source_store"]) == len(first["source_store"])
+    assert all("scan2" in url for url in second["source_store"])
+    assert sorted(risk["risk_id"] for risk in second["finalized_risks"]) == ["D1", "D2"]
@@ -23,7 +23,7 @@ from prompts.signpost_prompts import (
     SIGNPOST_GENERATOR_SYSTEM_MESSAGE,
     SIGNPOST_GENERATOR_USER_MESSAGE,
 )
-from prompts.update_prompts import RISK_UPDATER_SYSTEM_MESSAGE
+from prompts.update_prompts import RISK_PATCH_SYSTEM_MESSAGE, RISK_UPDATER_SYSTEM_MESSAGE
 
 
 def test_router_templates_format():
@@ -90,6 +90,14 @@ def test_relevance_update_and_signpost_templates_format():
         SOURCE_GUIDE="sources",
         today="February 06, 2026",
     )
+    patch_prompt = RISK_PATCH_SYSTEM_MESSAGE.format(
+        taxonomy=["Geopolitical"],
+        PORTFOLIO_ALLOCATION="portfolio",
+        SOURCE_GUIDE="sources",
+        today="February 06, 2026",
+    )
+    assert "PATCH OPERATIONS" in patch_prompt
+    assert "The FULL updated risk register" not in patch_prompt
     assert SIGNPOST_GENERATOR_SYSTEM_MESSAGE.format(
         taxonomy=["Geopolitical"],
         PORTFOLIO_ALLOCATION="portfolio",
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from langchain_core.messages import HumanMessage
+
+from agent.agents.router_agent import RouterAgent
+from agent.routing import HashedNgramRouteModel, RouterMetrics, classify_route, rule_route
+from agent.tools.conversation_context_tool import ConversationContextTool
+from agent.tools.route_classifier_tool import RouteClassifierTool
+
+
+def test_rule_route_handles_obvious_requests_and_defers_ambiguous_ones():
+    assert rule_route("Run a scan")[0] == "scan"
+    assert rule_route("update risk 3")[0] == "update"
+    assert rule_route("What changed since last week?")[0] == "update"
+    assert rule_route("What does risk 4 mean for equities?")[0] == "qna"
+    assert rule_route("Why did you remove risk 2?")[0] is None
+    assert rule_route("hello")[0] is None
+
+
+def test_rule_route_defers_polite_requests_and_respects_min_confidence():
+    for request in (
+        "Can you add a risk about Taiwan export controls?",
+        "Should we downgrade risk 4 to Low?",
+        "Could you merge risks 2 and 3?",
+        "Any updates on the Red Sea situation?",
+        "How about adding a risk on water scarcity?",
+        "Red Sea shipping?",
+    ):
+        assert rule_route(request) == (None, 0.0), request
+    assert rule_route("Can you explain risk 2?")[0] == "qna"
+
+
+def test_rule_route_defers_negated_mixed_and_questioning_requests():
+    for request in (
+        "Don't run a new scan, just explain risk 2",
+        "I do not want you to update the register, just summarise it",
+        "Scan results look odd - why is risk 2 high?",
+        "Summarize the register then scan again",
+        "No need to update risk 3, what drives it?",
+        "Run a scan and update the register",
+    ):
+        assert rule_route(request) == (None, 0.0), request
+        assert classify_route(request, min_confidence=0.9)["source"] == "llm", request
+    assert rule_route("Run a new scan") == ("scan", 0.95)
+    assert rule_route("Remove risk 4") == ("update", 0.95)
+
+    assert classify_route("What does risk 4 mean for equities?", min_confidence=0.9)["source"] == "rules"
+    deferred = classify_route("What does risk 4 mean for equities?", min_confidence=0.95)
+    assert deferred == {"route": None, "confidence": 0.0, "source": "llm"}
+
+
+def test_hashed_ngram_model_learns_logged_decisions_and_round_trips():
+    examples = [
+        ("add a risk on chip export controls", "update"),
+        ("add a new risk about water scarcity", "update"),
+        ("insert a risk on shipping lanes", "update"),
+        ("horizon sweep please", "scan"),
+        ("sweep the horizon for emerging threats", "scan"),
+        ("give me the big picture on credit", "qna"),
+        ("give me context on the oil risk", "qna"),
+    ]
+    model = HashedNgramRouteModel(buckets=1 << 12).fit(examples, epochs=60)
+    restored = HashedNgramRouteModel.from_dict(model.to_dict())
+    assert restored.predict("add a risk on AI chips")[0] == "update"
+    decision = classify_route("add a risk on AI chips", restored, min_confidence=0.5)
+    assert decision["source"] == "model"
+    assert decision["route"] == "update"
+
+
+def test_router_agent_fast_path_skips_llm_and_tracks_metrics():
+    class _LLMRouter:
+        calls = 0
+
+        def __call__(self, _state, **_context):
+            self.calls += 1
+            return {"user_query_type": "qna"}
+
+    agent = RouterAgent.__new__(RouterAgent)
+    agent.conversation_tool = ConversationContextTool()
+    agent.classifier = RouteClassifierTool()
+    agent.metrics = RouterMetrics()
+    agent.base_agent = _LLMRouter()
+
+    assert agent({"messages": [HumanMessage(content="run a scan")]}) == "initiate_web_search"
+    assert agent.base_agent.calls == 0
+    assert agent({"messages": [HumanMessage(content="hello")]}) == "elaborator"
+    assert agent.base_agent.calls == 1
+
+    snapshot = agent.metrics.snapshot()
+    assert snapshot["turns"] == 2
+    assert snapshot["hit_rate"] == 0.5
+    assert snapshot["by_source"] == {"rules": 1, "llm": 1}
@@ -45,3 +45,47 @@ def test_event_to_risk_source_tool_builds_source_pool_and_block():
     )
     assert out["all_urls"] == ["u2", "u1"]
     assert "[1]" in out["sources_block"]
+
+
+def test_source_blocks_share_numbers_and_fragments_across_stages():
+    from agent.tools.citation_normalization_tool import CitationNormalizationTool
+    from agent.tools.source_block_cache import SourceBlockCache, source_numbers
+    from agent.tools.source_verification_formatting_tool import SourceVerificationFormattingTool
+
+    store = {
+        f"https://example.com/{name}": {"url": f"https://example.com/{name}", "title": name, "reliability": "High"}
+        for name in ("a", "b", "c")
+    }
+    reports = [
+        {"taxonomy": "Geo", "source_ids": ["https://example.com/b", "https://example.com/a"]},
+        {"taxonomy": "Trade", "source_ids": ["https://example.com/c", "https://example.com/a"]},
+    ]
+    numbers = source_numbers(reports, store)
+    cache = SourceBlockCache()
+
+    verify_block = SourceVerificationFormattingTool().run(
+        sources=[store["https://example.com/c"]], numbers=numbers, cache=cache
+    )
+    assert verify_block.startswith("[3] c\n")
+
+    compare_block = CompareInputFormattingTool().run(reports=reports, source_store=store, cache=cache)
+    assert "[2] b" in compare_block and "[1] a" in compare_block and "[3] c" in compare_block
+    fragments = len(cache)
+
+    out = EventToRiskSourceTool().run(
+        reports=reports,
+        events=[{"evidence_urls": ["https://example.com/c", "https://example.com/a"]}],
+        source_store=store,
+        cache=cache,
+    )
+    assert out["source_map"] == {1: "https://example.com/a", 3: "https://example.com/c"}
+    assert out["sources_block"].startswith("[1] a\n") and "\n\n[3] c\n" in out["sources_block"]
+    assert len(cache) == fragments  # compare's fragments were reused verbatim
+
+    risk = CitationNormalizationTool().run(
+        risk={"narrative": "Tariffs rise [3].", "sources": []},
+        source_pool=out["all_urls"],
+        source_map=out["source_map"],
+    )
+    assert risk["sources"] == ["1. https://example.com/c"]
+    assert risk["narrative"] == "Tariffs rise [1]."
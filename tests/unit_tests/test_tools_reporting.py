@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import pytest
 from langchain_core.messages import AIMessage, HumanMessage
 
+from agent.configuration import Configuration
 from agent.tools.reporting import (
     ConversationContextTool,
     RiskMarkdownRenderTool,
@@ -48,3 +50,204 @@ def test_update_render_tool_formats_change_log():
     )
     assert "# Updated Risk Register" in out
     assert "- Updated title" in out
+
+
+def test_risk_markdown_render_tool_streams_one_chunk_per_risk():
+    from typing import TypedDict
+
+    from langgraph.graph import END, START, StateGraph
+
+    from helper_functions import format_all_risks_md
+
+    risks = [
+        {"title": f"Risk {n}", "category": ["Geopolitical"], "narrative": f"N{n}", "sources": []}
+        for n in range(3)
+    ]
+
+    class _State(TypedDict, total=False):
+        md: str
+
+    builder = StateGraph(_State)
+    builder.add_node(
+        "render",
+        lambda _state: {"md": RiskMarkdownRenderTool().run(risks=risks, dedupe=False)},
+    )
+    builder.add_edge(START, "render")
+    builder.add_edge("render", END)
+    graph = builder.compile()
+
+    chunks = [event["chunk"] for event in graph.stream({}, stream_mode="custom")]
+    assert len(chunks) == 4
+    assert chunks[1].startswith("## Risk 1: Risk 0")
+    assert "\n".join(chunks) == format_all_risks_md(risks)
+    assert graph.invoke({})["md"] == format_all_risks_md(risks)
+
+
+def test_risk_updater_streams_completed_risks_and_matches_full_render(monkeypatch):
+    import importlib
+
+    from agent.agents.risk_updater_agent import RiskUpdaterAgent
+
+    updater_module = importlib.import_module("agent.agents.risk_updater_agent")
+    monkeypatch.setattr(
+        updater_module,
+        "current_configuration",
+        lambda: Configuration(update_mode="full"),
+    )
+    risks = [
+        {"title": f"Risk {n}", "category": ["Geopolitical"], "narrative": f"N{n}", "sources": []}
+        for n in range(3)
+    ]
+
+    class _StreamingBase:
+        def invoke_streaming(self, _state, on_partial, **_context):
+            for end in range(1, len(risks) + 1):
+                on_partial({"risks": risks[:end]})
+            return {"risks": risks, "change_log": ["Added risks"]}
+
+    agent = RiskUpdaterAgent.__new__(RiskUpdaterAgent)
+    agent.context_tool = ConversationContextTool()
+    agent.render_tool = UpdateRenderTool()
+    agent.base_agent = _StreamingBase()
+
+    out = agent({"messages": [HumanMessage(content="add risks")]})
+    assert out["risk"] == {"risks": risks}
+    assert out["message"] == UpdateRenderTool().run(risks=risks, change_log=["Added risks"])
+
+
+def test_risk_patch_tool_applies_operations_and_renders_full_register():
+    from agent.tools.risk_patch_tool import RiskPatchTool
+
+    risks = [
+        {
+            "title": f"Risk {n}",
+            "category": ["Geopolitical"],
+            "narrative": f"N{n} [1]",
+            "portfolio_relevance": "Medium",
+            "portfolio_relevance_rationale": "R",
+            "sources": ["1. https://a"],
+            "audit_log": ["Drafted."],
+        }
+        for n in range(1, 5)
+    ]
+    tool = RiskPatchTool()
+    result = tool.run(
+        mode="apply",
+        risks=risks,
+        operations=[
+            {
+                "op": "modify",
+                "risk_id": "R2",
+                "fields": {"narrative": "New [2]", "sources": ["2. https://b"]},
+                "reason": "News.",
+            },
+            {"op": "remove", "risk_id": "R3", "fields": {}, "reason": "Stale."},
+            {
+                "op": "add",
+                "risk_id": "",
+                "fields": {"title": "Risk 5", "category": ["Climate"], "narrative": "N5"},
+                "reason": "New.",
+            },
+            {"op": "modify", "risk_id": "R9", "fields": {"title": "X"}, "reason": ""},
+            {"op": "modify", "risk_id": "R1", "fields": {"portfolio_relevance": "Severe"}, "reason": ""},
+        ],
+    )
+    assert [risk["title"] for risk in result["risks"]] == ["Risk 1", "Risk 2", "Risk 4", "Risk 5"]
+    assert result["touched"] == [2, 4]
+    assert result["removed"] == ["Risk 3"]
+    assert len(result["rejected"]) == 2
+    modified = result["risks"][1]
+    assert modified["narrative"] == "New [1]"
+    assert modified["sources"] == ["1. https://b"]
+    assert modified["audit_log"][0] == "Drafted."
+    assert result["risks"][0] == risks[0]
+
+    md = tool.run(mode="render", change_log=["Refreshed Risk 2"], **result)
+    assert "## Risk 2: Risk 2" in md
+    assert "## Risk 4: Risk 5" in md
+    assert md.startswith("# Updated Risk Register\n\n## Risk 1: Risk 1")
+    assert "_Changed or added: Risk 2, Risk 4; 1 removed; register now holds 4 risk(s)._" in md
+    assert "- Risk 3" in md
+    assert "- Refreshed Risk 2" in md
+
+
+def test_risk_updater_streams_patch_updates_by_default(monkeypatch):
+    from agent.agents.risk_updater_agent import RiskUpdaterAgent
+    from agent.tools.risk_patch_tool import RiskPatchTool
+
+    events = []
+    monkeypatch.setattr("agent.streaming.stream_writer", lambda: events.append)
+    risks = [
+        {"title": f"Risk {n}", "category": ["Geopolitical"], "narrative": f"N{n}", "sources": []}
+        for n in range(1, 4)
+    ]
+    operations = [
+        {"op": "modify", "risk_id": "R1", "fields": {"title": "Risk 1b"}, "reason": ""},
+        {"op": "remove", "risk_id": "R3", "fields": {}, "reason": ""},
+    ]
+
+    class _StreamingPatch:
+        def invoke_streaming(self, _state, on_partial, **_context):
+            for end in range(1, len(operations) + 1):
+                on_partial({"operations": operations[:end]})
+            return {"operations": operations, "change_log": ["Retitled Risk 1"]}
+
+    agent = RiskUpdaterAgent.__new__(RiskUpdaterAgent)
+    agent.context_tool = ConversationContextTool()
+    agent.patch_tool = RiskPatchTool()
+    agent.patch_agent = _StreamingPatch()
+
+    out = agent({"messages": [HumanMessage(content="retitle risk 1")], "risk": {"risks": risks}})
+    assert [risk["title"] for risk in out["risk"]["risks"]] == ["Risk 1b", "Risk 2"]
+    assert "## Risk 2: Risk 2" in out["message"]
+    chunks = [event for event in events if event.get("stream") == "updated_register"]
+    assert "## Risk 1: Risk 1b" in chunks[1]["chunk"]  # previewed before the patch completed
+    last_start = max(i for i, event in enumerate(chunks) if event["index"] == 0)
+    assert "\n".join(event["chunk"] for event in chunks[last_start:]).strip() == out["message"]
+
+
+def test_add_signposts_runs_risks_concurrently_and_keeps_register_order(monkeypatch):
+    import importlib
+    import threading
+    import time
+
+    from agent.agents.add_signposts_agent import AddSignpostsAgent
+    from agent.tools.signposts import SignpostAssemblyTool
+
+    signposts_module = importlib.import_module("agent.agents.add_signposts_agent")
+    monkeypatch.setattr(
+        signposts_module,
+        "current_configuration",
+        lambda: Configuration(signpost_max_workers=4, signpost_batch_size=2),
+    )
+    risks = [{"title": f"Risk {n}", "category": ["Geopolitical"], "narrative": "N"} for n in range(4)]
+    pack = {"signposts": [{"description": "Spreads widen", "status": "Rising"}]}
+    batch_calls = []
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def _evaluate(_state, risk, **_context):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        # Earlier risks finish last, so any reordering would show up.
+        time.sleep(0.02 * (4 - int(risk["title"].split()[1])))
+        with lock:
+            active[0] -= 1
+        return {"satisfied_with_signposts": True, "feedback": ""}
+
+    def _batch(_state, risks, **_context):
+        batch_calls.append(risks)
+        return {"packs": [{"risk_index": 1, "signposts": pack["signposts"]}, {"risk_index": 2, "signposts": pack["signposts"]}]}
+
+    agent = AddSignpostsAgent.__new__(AddSignpostsAgent)
+    agent.context_tool = ConversationContextTool()
+    agent.assembly_tool = SignpostAssemblyTool()
+    agent.batch_generator = _batch
+    agent.generator = lambda *_args, **_kwargs: pytest.fail("batched risks need no single generator call")
+    agent.evaluator = _evaluate
+
+    out = agent({"risk": {"risks": risks}, "messages": [HumanMessage(content="add signposts")]})
+    assert [risk["title"] for risk in out["risk"]["risks"]] == [risk["title"] for risk in risks]
+    assert len(batch_calls) == 2
+    assert peak[0] > 1
+    assert out["message"].index("Risk 0") < out["message"].index("Risk 3")
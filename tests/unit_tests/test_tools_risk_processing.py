@@ -6,6 +6,7 @@ from agent.tools.risk_processing import (
     CitationSelectionTool,
     RiskDeduplicationTool,
 )
+from agent.tools.refinement_merge_tool import merge_refined_risk
 
 
 def test_citation_selection_tool_selects_cited_entries():
@@ -34,6 +35,40 @@ def test_citation_normalization_tool_reindexes_sources_and_text():
     assert "[1]" in normalized["narrative"]
 
 
+def test_citation_normalization_tool_selects_from_pool_and_flags_dangling():
+    tool = CitationNormalizationTool()
+    normalized = tool.run(
+        risk={
+            "title": "R",
+            "narrative": "See [3] and [9].",
+            "reasoning_trace": "1. **Step**: Uses [3].",
+            "audit_log": [],
+        },
+        source_pool=["1. https://a", "3. https://c", "4. https://d"],
+        flag_dangling=True,
+    )
+    assert normalized["sources"] == ["1. https://c"]
+    assert normalized["narrative"] == "See [1] and."
+    assert normalized["reasoning_trace"] == "1. **Step**: Uses [1]."
+    assert normalized["audit_log"] == [
+        "Unresolved citations with no matching source: [9]."
+    ]
+
+
+def test_citation_normalization_tool_does_not_fall_back_to_positions_with_source_map():
+    normalized = CitationNormalizationTool().run(
+        risk={"title": "R", "narrative": "See [1], [2] and [3].", "audit_log": []},
+        source_pool=["https://c", "https://a"],
+        source_map={1: "https://a", 3: "https://c"},
+        flag_dangling=True,
+    )
+    assert normalized["sources"] == ["1. https://a", "2. https://c"]
+    assert normalized["narrative"] == "See [1], and [2]."
+    assert normalized["audit_log"] == [
+        "Unresolved citations with no matching source: [2]."
+    ]
+
+
 def test_risk_deduplication_tool_removes_duplicates():
     tool = RiskDeduplicationTool()
     risks = [
@@ -49,3 +84,63 @@ def test_audit_trail_tool_applies_defaults_and_appends_note():
     risk = tool.run(risk={"title": "R"}, append_note="checked")
     assert risk["audit_log"][-1] == "checked"
     assert risk["reasoning_trace"]
+
+
+def test_risk_deduplication_tool_merges_paraphrased_duplicates_within_category():
+    tool = RiskDeduplicationTool()
+    risks = [
+        {
+            "title": "US tariff escalation on Chinese semiconductors",
+            "category": ["Trade"],
+            "narrative": "Washington announced new tariffs on Chinese chips [1], raising supply chain costs for technology firms.",
+            "sources": ["1. https://a"],
+            "audit_log": [],
+        },
+        {
+            "title": "Escalating US tariffs on Chinese semiconductor imports",
+            "category": ["Trade", "Technological"],
+            "narrative": "New US tariffs on Chinese semiconductors [1] raise supply chain costs for technology firms.",
+            "sources": ["1. https://b"],
+            "audit_log": [],
+        },
+        {
+            "title": "US tariff escalation on Chinese semiconductors",
+            "category": ["Climate"],
+            "narrative": "Washington announced new tariffs on Chinese chips [1], raising supply chain costs for technology firms.",
+            "sources": [],
+        },
+    ]
+    assert len(tool.run(risks=risks)) == 3  # exact dedupe only by default
+    deduped = tool.run(risks=risks, near_duplicates=True)
+    assert len(deduped) == 2  # the Climate copy sits in a different block
+    merged = deduped[0]
+    assert merged["sources"] == ["1. https://a", "2. https://b"]
+    assert merged["category"] == ["Trade", "Technological"]
+    assert "near-duplicate" in merged["audit_log"][-1]
+    assert merged["reasoning_trace"].endswith("reports the same risk [2].")
+    assert CitationSelectionTool().run(
+        narrative=merged["narrative"],
+        reasoning_trace=merged["reasoning_trace"],
+        source_pool=merged["sources"],
+    ) == ["1. https://a", "2. https://b"]
+
+    assert len(tool.run(risks=risks, near_duplicates=True, similarity_threshold=0.95)) == 3
+
+
+def test_merge_refined_risk_renumbers_relevance_trace_against_refined_sources():
+    assessed = {
+        "risk_id": "D1",
+        "narrative": "Draft [1] [2].",
+        "reasoning_trace": "1. Portfolio Relevance: credit exposure [2]; shipping [1].",
+        "sources": ["1. Shipping https://a.example/x", "2. Credit https://b.example/y"],
+        "portfolio_relevance": "High",
+    }
+    refined = {
+        "risk_id": "D1",
+        "narrative": "Refined [1] [2].",
+        "sources": ["1. Credit https://b.example/y", "2. Rates https://c.example/z"],
+    }
+    merged = merge_refined_risk(assessed, refined)
+    assert merged["sources"] == ["1. Credit https://b.example/y", "2. Rates https://c.example/z"]
+    assert merged["reasoning_trace"] == "1. Portfolio Relevance: credit exposure [1]; shipping."
+    assert merged["portfolio_relevance"] == "High"
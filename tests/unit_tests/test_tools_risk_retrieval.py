@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agent.agents.elaborator_agent import ElaboratorAgent
+from agent.configuration import Configuration
+from agent.tools.conversation_context_tool import ConversationContextTool
+from agent.tools.risk_retrieval_tool import RiskIndex, RiskRetrievalTool, referenced_positions
+from helper_functions import iter_risk_md
+
+
+def _risk(title: str, narrative: str, signposts=None) -> dict:
+    return {"title": title, "narrative": narrative, "signposts": signposts or []}
+
+
+def _register() -> list[dict]:
+    return [
+        _risk("Sovereign debt stress", "Rising yields strain fiscal positions in Europe."),
+        _risk("Oil supply shock", "Conflict disrupts crude shipments through key straits."),
+        _risk("Bank liquidity squeeze", "Deposit flight pressures regional lenders."),
+        _risk(
+            "AI-driven labour disruption",
+            "Automation reshapes employment.",
+            [{"description": "Unemployment claims spike in services"}],
+        ),
+    ]
+
+
+def test_risk_index_syncs_incrementally_and_ranks_by_relevance():
+    index = RiskIndex()
+    risks = _register()
+    assert index.sync(risks) == {"added": 4, "removed": 0, "indexed": 4}
+    assert index.sync(risks) == {"added": 0, "removed": 0, "indexed": 4}
+
+    risks[1] = {**risks[1], "narrative": "Tanker attacks push crude prices higher."}
+    assert index.sync(risks) == {"added": 1, "removed": 1, "indexed": 4}
+
+    assert index.search("what happens if crude prices spike?", k=1) == [1]
+    assert index.search("unemployment claims", k=1) == [3]
+
+
+def test_risk_retrieval_tool_puts_named_risks_first_and_falls_back_to_order():
+    tool = RiskRetrievalTool()
+    risks = _register()
+    selected = tool.run(risks=risks, query="How does risk 3 interact with yields?", k=2)
+    assert [position for position, _ in selected] == [3, 1]
+
+    fallback = tool.run(risks=risks, query="summarise everything", k=2)
+    assert [position for position, _ in fallback] == [1, 2]
+
+
+def test_referenced_positions_parses_number_lists_and_ranges():
+    assert referenced_positions("Could you compare risks 2 and 3?") == [2, 3]
+    assert referenced_positions("risks 4, 1 & 2") == [1, 2, 4]
+    assert referenced_positions("risk #2 or #5, then risk 1") == [2, 5, 1]
+    assert referenced_positions("risks 3-5") == [3, 4, 5]
+    assert referenced_positions("risk 2 in 2026") == [2]
+    assert referenced_positions("what changed?") == []
+
+
+def test_conversation_context_tool_windows_history_with_summary():
+    messages = []
+    for turn in range(1, 6):
+        messages += [HumanMessage(content=f"question {turn}"), AIMessage(content=f"answer {turn}")]
+    messages.append(HumanMessage(content="question 6"))
+
+    out = ConversationContextTool().run(
+        messages=messages, max_turns=2, summary="- User asked: question 0 → answer 0"
+    )
+    assert out["last_user_query"] == "question 6"
+    assert out["conversation"].startswith("Earlier in this conversation:\n- User asked: question 0")
+    assert "- User asked: question 4 → answer 4" in out["conversation"]
+    assert "User: question 4\n" not in out["conversation"]
+    assert "User: question 5" in out["conversation"]
+    assert "Assistant: answer 5" in out["conversation"]
+
+
+def _rendered_register(count: int) -> str:
+    blocks = [
+        "\n".join(iter_risk_md(_risk(f"Risk number {n}", "Narrative text. " * 40), n))
+        for n in range(1, count + 1)
+    ]
+    return "\n".join(["# Risk Register\n", *blocks])
+
+
+def test_elaborator_prompt_stays_bounded_as_the_register_grows(monkeypatch):
+    import importlib
+
+    elaborator_module = importlib.import_module("agent.agents.elaborator_agent")
+    monkeypatch.setattr(
+        elaborator_module, "current_configuration", lambda: Configuration(stream_tokens=False)
+    )
+
+    def prompt_chars(count: int) -> int:
+        prompts = []
+        agent = ElaboratorAgent.__new__(ElaboratorAgent)
+        agent.context_tool = ConversationContextTool()
+        agent.retrieval_tool = RiskRetrievalTool()
+        agent.risk_index = RiskIndex()
+        agent.base_agent = lambda _state, **context: prompts.append(context) or {"answer": "ok"}
+        risks = [_risk(f"Risk number {n}", "Narrative text. " * 40) for n in range(1, count + 1)]
+        agent(
+            {
+                "messages": [
+                    HumanMessage(content="run a scan"),
+                    AIMessage(content=_rendered_register(count)),
+                    HumanMessage(content="What does risk 2 mean?"),
+                ],
+                "risk": {"risks": risks},
+            }
+        )
+        assert f"Risk Register with {count} risk(s) omitted" in prompts[0]["conversation"]
+        return sum(len(str(value)) for value in prompts[0].values())
+
+    small, large = prompt_chars(10), prompt_chars(50)
+    assert large - small < 100  # only the risk counts in the header and reference differ
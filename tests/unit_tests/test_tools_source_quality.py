@@ -36,3 +36,66 @@ def test_source_reliability_merge_tool_applies_assessments_and_fallbacks():
     assert merged["sources"][0]["reliability"] == "High"
     assert merged["sources"][1]["reliability"] == "Unknown"
     assert merged["verification_notes"].startswith("Reliable sources:")
+
+
+def test_reliability_views_share_the_underlying_source_record():
+    from agent.tools.source_record import SourceRecord
+
+    record = SourceRecord(title="A", url="https://www.example.com/a", snippet="S")
+    merged = SourceReliabilityMergeTool().run(
+        report={"taxonomy": "Geopolitical"},
+        sources=[record],
+        assessments=[{"url": "https://www.example.com/a", "reliability": "High"}],
+    )
+    view = merged["sources"][0]
+    assert view.base is record
+    assert view.get("domain") == "example.com"
+    assert dict(view) == {
+        "title": "A",
+        "url": "https://www.example.com/a",
+        "snippet": "S",
+        "published": "",
+        "reliability": "High",
+        "reliability_rationale": "",
+        "source_type": "Unknown",
+    }
+
+
+def test_compact_source_blocks_strip_boilerplate_and_truncate(monkeypatch):
+    from agent.configuration import Configuration
+    from agent.tools import source_block_encoder
+    from agent.tools.event_pipeline import EventToRiskSourceTool
+
+    monkeypatch.setattr(
+        source_block_encoder,
+        "current_configuration",
+        lambda: Configuration(source_block_layouts={"verify_sources_agent": "compact"}, source_snippet_chars=40),
+    )
+    compact = source_block_encoder.source_block_style("verify_sources_agent")
+    assert compact.layout == "compact"
+    assert source_block_encoder.source_block_style("compare_events_agent").layout == "verbose"
+
+    sources = [
+        {
+            "title": "Fed holds rates steady  | Reuters",
+            "url": "https://www.reuters.com/markets/fed",
+            "snippet": "Oct 17, 2026 — The Federal Reserve left its policy rate unchanged on Friday as inflation cooled. Read more",
+            "published": "2026-10-17",
+            "reliability": "High",
+        },
+        {"title": "Untitled post", "url": "https://blog.example.com/p", "snippet": "", "published": ""},
+    ]
+    out = SourceVerificationFormattingTool().run(sources=sources, style=compact)
+    assert out.splitlines() == [
+        source_block_encoder.COMPACT_HEADER,
+        "[1] 2026-10-17 | Fed holds rates steady | https://www.reuters.com/markets/fed | The Federal Reserve left its policy…",
+        "[2] | Untitled post | https://blog.example.com/p",
+    ]
+
+    block = EventToRiskSourceTool().run(
+        reports=[{"taxonomy": "Macro", "reliable_sources": sources[:1]}],
+        events=[{"evidence_urls": ["https://www.reuters.com/markets/fed"]}],
+        style=compact,
+    )["sources_block"]
+    assert "[1] 2026-10-17 H | Fed holds rates steady |" in block
+    assert "Unknown" not in block and "No snippet" not in block
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from agent.tools.event_pipeline import CompareInputFormattingTool
+from agent.tools.source_store_tool import compact_report, report_sources
+from schemas import merge_source_store
+
+
+def test_compact_report_moves_sources_into_store_and_omits_duplicate_reliable_list():
+    sources = [
+        {"title": "A", "url": "https://example.com/a", "reliability": "High"},
+        {"title": "B", "url": "https://example.com/b", "reliability": "Medium"},
+    ]
+    compact, entries = compact_report(
+        {"taxonomy": "Geo", "sources": sources, "reliable_sources": list(sources)}
+    )
+    assert "sources" not in compact and "reliable_sources" not in compact
+    assert compact["source_ids"] == ["https://example.com/a", "https://example.com/b"]
+    assert "reliable_source_ids" not in compact
+    assert report_sources(compact, entries, reliable=True)[1]["title"] == "B"
+
+
+def test_merge_source_store_merges_fields_and_resets_on_none():
+    left = {"u": {"url": "u", "title": "T"}}
+    merged = merge_source_store(left, {"u": {"url": "u", "reliability": "High"}})
+    assert merged["u"] == {"url": "u", "title": "T", "reliability": "High"}
+    assert left["u"] == {"url": "u", "title": "T"}
+    assert merge_source_store(merged, None) == {}
+
+
+def test_formatting_tool_resolves_reliable_source_ids_from_store():
+    store = {
+        "u1": {"url": "u1", "title": "Kept", "reliability": "High"},
+        "u2": {"url": "u2", "title": "Dropped", "reliability": "Low"},
+    }
+    report = {"taxonomy": "Geo", "source_ids": ["u1", "u2"], "reliable_source_ids": ["u1"]}
+    out = CompareInputFormattingTool().run(reports=[report], source_store=store)
+    assert "Kept" in out
+    assert "Dropped" not in out
+
+
+def test_canonicalize_url_unifies_tracking_amp_scheme_and_trailing_slash_variants():
+    from agent.tools.url_canonicalization import canonicalize_url
+
+    variants = [
+        "https://www.reuters.com/world/story-123/",
+        "http://reuters.com/world/story-123?utm_source=x&utm_medium=y",
+        "https://amp.reuters.com/world/story-123/amp#section",
+        "HTTPS://www.Reuters.com:443/world/story-123?fbclid=abc",
+    ]
+    assert {canonicalize_url(url) for url in variants} == {"https://reuters.com/world/story-123"}
+    assert canonicalize_url("https://example.com/a?b=2&a=1") == "https://example.com/a?a=1&b=2"
+
+
+def test_compact_reports_key_store_by_canonical_url_and_union_taxonomies():
+    from agent.tools.source_dedup_index import SourceDedupIndex
+
+    _, geo = compact_report(
+        {"taxonomy": "Geopolitical", "sources": [{"url": "https://www.x.com/a/", "title": "A"}]}
+    )
+    _, trade = compact_report(
+        {"taxonomy": "Trade", "sources": [{"url": "http://x.com/a?utm_source=t", "title": "A"}]}
+    )
+    store = merge_source_store(geo, trade)
+    assert list(store) == ["https://x.com/a"]
+    assert store["https://x.com/a"]["taxonomies"] == ["Geopolitical", "Trade"]
+
+    index = SourceDedupIndex.from_store(store)
+    assert "https://www.x.com/a?gclid=1" in index
+    assert index.taxonomies("https://x.com/a") == ["Geopolitical", "Trade"]
@@ -120,3 +120,116 @@ def test_taxonomy_brief_formatting_tool_formats_and_normalizes_brief():
         today_iso="2026-02-06",
     )
     assert "## Geopolitical (as of 2026-02-06)" in normalized
+
+
+def test_query_plan_tool_collapses_near_identical_queries_across_taxonomies():
+    from agent.tools.query_plan_tool import QueryPlanTool
+
+    out = QueryPlanTool().run(
+        plans={
+            "Geopolitical": ["Russia Ukraine ceasefire talks latest", "China Taiwan tensions"],
+            "Military conflict": ["Ukraine Russia ceasefire talks this week", "Sahel insurgency attacks"],
+            "Trade": ["US tariffs on China imports", "new US tariff on Chinese imports"],
+        },
+        threshold=0.6,
+    )
+    assert out["queries"] == {
+        "Geopolitical": ["Russia Ukraine ceasefire talks latest", "China Taiwan tensions"],
+        "Military conflict": ["Russia Ukraine ceasefire talks latest", "Sahel insurgency attacks"],
+        "Trade": ["US tariffs on China imports"],
+    }
+    assert out["shared"] == {
+        "Russia Ukraine ceasefire talks latest": ["Geopolitical", "Military conflict"]
+    }
+
+
+def test_query_plan_tool_pads_collapsed_taxonomies_from_reserves():
+    from agent.tools.query_plan_tool import QueryPlanTool, SharedSearchCache
+
+    out = QueryPlanTool().run(
+        plans={"Trade": ["US tariffs on China imports", "new US tariff on Chinese imports", "EU steel quotas"]},
+        reserves={"Trade": ["latest EU steel quotas", "Trade policy changes last week", "Trade market impact"]},
+        threshold=0.6,
+    )
+    assert out["queries"] == {
+        "Trade": ["US tariffs on China imports", "EU steel quotas", "Trade policy changes last week"]
+    }
+
+    cache = SharedSearchCache()
+    for key in [("plan-a", "q1", 5), ("plan-a", "q2", 5), ("plan-b", "q1", 5)]:
+        cache.get_or_run(key, lambda: ["result"])
+    assert cache.clear_plan("plan-a") == 2
+    assert len(cache._entries) == 1
+
+
+def test_web_search_execution_tool_reads_responses_api_and_streamed_shapes():
+    search_call = {
+        "type": "web_search_call",
+        "action": {
+            "type": "search",
+            "sources": [{"type": "url", "url": "https://a.example.com/x"}, {"type": "url", "url": "https://b.example.com/y"}],
+        },
+    }
+    text_block = {
+        "type": "text",
+        "text": "Summary",
+        "annotations": [
+            {"type": "url_citation", "url": "https://a.example.com/x", "title": "A story"},
+            {"type": "url_citation", "url": "https://c.example.com/z", "title": "C story"},
+        ],
+    }
+    expected = [("A story", "https://a.example.com/x"), ("", "https://b.example.com/y"), ("C story", "https://c.example.com/z")]
+
+    class _StreamingClient:
+        def stream(self, _query):
+            yield SimpleNamespace(content=[], additional_kwargs={"tool_outputs": [{**search_call, "index": 0}]})
+            yield SimpleNamespace(content=[{**text_block, "index": 1}], additional_kwargs={})
+
+    tool = WebSearchExecutionTool()
+    for message in (
+        SimpleNamespace(content=[search_call, text_block]),  # responses/v1
+        SimpleNamespace(content=[text_block], additional_kwargs={"tool_outputs": [search_call]}),  # v0
+    ):
+        out = tool.run(mode="extract_sources", message=message)
+        assert [(s["title"], s["url"]) for s in out] == expected
+    streamed = tool.run(query="q", search_client=_StreamingClient(), stream=True)
+    assert [(s["title"], s["url"]) for s in streamed] == expected
+
+
+def test_published_dates_are_parsed_and_stale_results_dropped():
+    from datetime import datetime, timezone
+
+    from agent.tools.published_dates import filter_recent, parse_published
+
+    now = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+    cases = {
+        "2026-10-17": "2026-10-17",
+        "2026-10-17T08:30:00Z": "2026-10-17",
+        "Sat, 17 Oct 2026 08:30:00 GMT": "2026-10-17",
+        "Oct. 17, 2026": "2026-10-17",
+        "17 October 2026": "2026-10-17",
+        "2 days ago": "2026-10-17",
+        "yesterday": "2026-10-18",
+    }
+    for text, expected in cases.items():
+        assert parse_published(text, now).date().isoformat() == expected, text
+    assert parse_published("recently", now) is None
+
+    sources = [
+        {"url": "https://a.example.com/x", "published": "3 days ago"},
+        {"url": "https://b.example.com/2026/03/02/old-story", "published": ""},
+        {"url": "https://c.example.com/y", "published": "March 1, 2026"},
+        {"url": "https://d.example.com/z", "published": ""},
+    ]
+    kept, counts = filter_recent(sources, window_days=30, now=now)
+    assert [s["url"] for s in kept] == ["https://a.example.com/x", "https://d.example.com/z"]
+    assert counts == {"stale": 2, "undated": 1}
+    kept, _ = filter_recent(sources, window_days=30, now=now, keep_undated=False)
+    assert len(kept) == 1
+
+    records = WebSearchExecutionTool().run(
+        mode="extract_sources",
+        message=SimpleNamespace(content=[{"sources": [{"url": "https://e.example.com/2026/10/18/story"}]}]),
+    )
+    assert records[0]["published"] == "2026-10-18"
+    assert records[0].get("published_at") == datetime(2026, 10, 18, tzinfo=timezone.utc)
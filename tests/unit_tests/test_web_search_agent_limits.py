@@ -3,10 +3,13 @@ from __future__ import annotations
 import os
 from typing import Any
 
+import pytest
+
 os.environ.setdefault("DEEPSEEK_API_KEY", "test")
 os.environ.setdefault("OPENAI_API_KEY", "test")
 
 from agent.agents.web_search_agent import WebSearchAgent
+from agent.query_plan_cache import QueryPlanCache
 
 
 class _StubSearchTool:
@@ -68,6 +71,7 @@ def test_web_search_agent_executes_five_queries_with_ten_results_each() -> None:
     brief_formatter = _StubBriefFormatter()
 
     agent.search_tool = search_tool
+    agent.plan_cache = QueryPlanCache()
     agent.brief_formatter = brief_formatter
     agent.query_agent = lambda _state, **_kwargs: {  # type: ignore[assignment]
         "queries": ["one", "two", "three"]
@@ -82,3 +86,137 @@ def test_web_search_agent_executes_five_queries_with_ten_results_each() -> None:
     assert all(int(call.get("num") or 0) == 10 for call in search_calls)
     assert len(out["sources"]) == 50
     assert brief_formatter.sources_block_counts[-1] == 50
+
+
+class _RepeatingSearchTool(_StubSearchTool):
+    """Every query returns the same handful of URLs (a quiet taxonomy)."""
+
+    def run(self, **kwargs: Any) -> Any:
+        if kwargs.get("mode"):
+            return super().run(**kwargs)
+        self.calls.append(kwargs)
+        return [
+            {"title": f"r{i}", "url": f"https://news{i}.example.com/a", "snippet": "", "published": ""}
+            for i in range(3)
+        ]
+
+
+def test_web_search_agent_stops_early_when_queries_stop_yielding_new_sources() -> None:
+    agent = WebSearchAgent.__new__(WebSearchAgent)
+    search_tool = _RepeatingSearchTool()
+    agent.search_tool = search_tool
+    agent.plan_cache = QueryPlanCache()
+    agent.brief_formatter = _StubBriefFormatter()
+    agent.query_agent = lambda _state, **_kwargs: {  # type: ignore[assignment]
+        "queries": ["one", "two", "three", "four", "five"]
+    }
+    agent.report_agent = lambda _state, **_kwargs: {"brief_md": "brief"}  # type: ignore[assignment]
+
+    out = agent({"taxonomy": "Climate"})
+
+    assert out["queries"] == ["one", "two", "three"]
+    assert out["search_stats"]["stopped_early"] is True
+    assert len(out["sources"]) == 3
+
+
+def test_planned_taxonomies_share_each_unique_search() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from agent.tools.query_plan_tool import QueryPlanTool, SharedSearchCache
+
+    agent = WebSearchAgent.__new__(WebSearchAgent)
+    search_tool = _StubSearchTool()
+    agent.search_tool = search_tool
+    agent.plan_cache = QueryPlanCache()
+    agent.brief_formatter = _StubBriefFormatter()
+    agent.plan_tool = QueryPlanTool()
+    agent.search_cache = SharedSearchCache()
+    agent.plan_agent = lambda _state, **_kwargs: {  # type: ignore[assignment]
+        "plans": [
+            {"taxonomy": "geopolitical", "queries": ["Taiwan strait drills", "Red Sea shipping attacks"]},
+            {"taxonomy": "Military conflict", "queries": ["latest Taiwan Strait drills", "Sahel coup"]},
+        ]
+    }
+    agent.query_agent = lambda _state, **_kwargs: pytest.fail("planned workers skip query generation")  # type: ignore[assignment]
+    agent.report_agent = lambda _state, **_kwargs: {"brief_md": "brief"}  # type: ignore[assignment]
+
+    plan = agent.plan_queries(["Geopolitical", "Military conflict"])
+    assert plan["shared"] == {"Taiwan strait drills": ["Geopolitical", "Military conflict"]}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        reports = list(
+            pool.map(
+                agent,
+                [
+                    {"taxonomy": taxonomy, "queries": queries, "plan_id": plan["plan_id"]}
+                    for taxonomy, queries in plan["queries"].items()
+                ],
+            )
+        )
+
+    searched = [call["query"] for call in search_tool.calls if "query" in call]
+    assert searched.count("Taiwan strait drills") == 1
+    assert len(searched) == len(set(searched))
+    assert sum(report["search_stats"]["shared_queries"] for report in reports) == 1
+    shared_url = "https://example.com/Taiwan-strait-drills/0"
+    assert all(shared_url in {s["url"] for s in report["sources"]} for report in reports)
+
+    assert agent.release_plan(plan["plan_id"]) == len(searched)
+    assert agent.release_plan(plan["plan_id"]) == 0
+
+
+def test_query_plans_are_reused_within_the_staleness_window(tmp_path) -> None:
+    import time
+
+    from agent.agents.web_search_agent import QUERY_PROMPT_VERSION
+    from agent.configuration import SearchBudget
+
+    cache_path = tmp_path / "plans.json"
+    agent = WebSearchAgent.__new__(WebSearchAgent)
+    agent.plan_cache = QueryPlanCache(cache_path)
+    calls = []
+    agent.query_agent = lambda _state, **kwargs: calls.append(kwargs) or {"queries": ["a", "b"]}  # type: ignore[assignment]
+
+    budget = SearchBudget()
+    assert agent._generate_queries("Climate", "2026-10-19", budget) == ["a", "b"]
+    assert agent._generate_queries("Climate", "2026-10-19", budget) == ["a", "b"]
+    assert len(calls) == 1
+    agent._generate_queries("Climate", "2026-10-20", budget)
+    agent._generate_queries("Climate", "2026-10-19", SearchBudget(max_queries=8))
+    assert len(calls) == 3
+
+    other_process = QueryPlanCache(cache_path)
+    assert other_process.get("climate", "2026-10-19", QUERY_PROMPT_VERSION, 5, max_age_hours=12) == ["a", "b"]
+    assert other_process.get(
+        "Climate", "2026-10-19", QUERY_PROMPT_VERSION, 5, max_age_hours=12, now=time.time() + 13 * 3600
+    ) is None
+    assert other_process.get("Climate", "2026-10-19", "older-prompt", 5, max_age_hours=12) is None
+
+    from agent.query_plan_cache import _main
+
+    assert _main(["--path", str(cache_path), "clear", "--date", "2026-10-19"]) == 0
+    agent._generate_queries("Climate", "2026-10-19", budget)
+    assert len(calls) == 4
+
+
+def test_query_plan_cache_evicts_least_recently_used_plans() -> None:
+    cache = QueryPlanCache(max_entries=2)
+    for taxonomy in ("Climate", "Trade"):
+        cache.put(taxonomy, "2026-10-19", "v1", [taxonomy], 5)
+    assert cache.get("Climate", "2026-10-19", "v1", 5, max_age_hours=12) == ["Climate"]
+    cache.put("Cyber", "2026-10-19", "v1", ["Cyber"], 5)
+    assert sorted(entry["taxonomy"] for entry in cache.entries()) == ["Climate", "Cyber"]
+
+
+def test_search_budget_applies_run_wide_and_per_taxonomy_overrides() -> None:
+    from agent.configuration import search_budget_for
+
+    configurable = {
+        "search_budget": {
+            "max_queries": 8,
+            "results_per_query": 5,
+            "per_taxonomy": {"Climate": {"max_queries": 2}},
+        }
+    }
+    assert search_budget_for("Trade", configurable).max_queries == 8
+    climate = search_budget_for("Climate", configurable)
+    assert (climate.max_queries, climate.initial_queries, climate.results_per_query) == (2, 2, 5)